@@ -0,0 +1,56 @@
+"""
+Benchmark router branch analysis in workflow_utils on large workflows.
+
+Times get_branch_paths and find_branch_merge_point for every router of
+generated workflows of increasing size, with one shared adjacency index per
+workflow. The equivalence with the previous implementation is covered by
+tests/test_branch_analysis.py.
+
+Usage:
+    python benchmarks/bench_branch_analysis.py [--sizes 100 200 400] [--repeat 3]
+"""
+import argparse
+import time
+
+from workflow_generator import generate_workflow
+
+from dspy_forge.utils.workflow_utils import (
+    WorkflowAdjacency,
+    find_branch_merge_point,
+    get_branch_paths,
+    identify_router_nodes,
+)
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>6} {'routers':>8} {'ms':>10}")
+    for size in args.sizes:
+        workflow = generate_workflow(size, seed=args.seed)
+        routers = identify_router_nodes(workflow)
+
+        def analyze():
+            adjacency = WorkflowAdjacency(workflow)
+            for router_id in routers:
+                get_branch_paths(workflow, router_id, adjacency)
+                find_branch_merge_point(workflow, router_id, adjacency)
+
+        print(f"{len(workflow.nodes):>6} {len(routers):>8} {best_ms(analyze, args.repeat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
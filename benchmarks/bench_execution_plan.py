@@ -0,0 +1,96 @@
+"""
+Benchmark per-request scheduling overhead of CompoundProgram on large workflows.
+
+Builds layered DAGs of Merge nodes (no LM calls), so the measured time is the
+cost of planning, input resolution and scheduling rather than model latency.
+
+Usage:
+    python benchmarks/bench_execution_plan.py [--sizes 50 200 1000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import time
+
+from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.core.execution_plan import ExecutionPlan
+from dspy_forge.models.workflow import Workflow
+from dspy_forge.services.execution_service import ExecutionContext
+from dspy_forge.services.validation_service import validation_service
+
+
+def build_layered_workflow(num_nodes: int, width: int = 10) -> Workflow:
+    """Start node -> layers of `width` Merge nodes, each fed by two nodes of the previous layer -> end node"""
+    position = {"x": 0, "y": 0}
+    fields = [{"name": "question", "type": "str", "required": True}]
+    nodes = [
+        {"id": "start", "type": "signature_field", "position": position,
+         "data": {"fields": fields, "is_start": True}},
+    ]
+    edges = []
+
+    previous_layer = ["start"]
+    created = 0
+    while created < num_nodes - 2:
+        layer = []
+        for i in range(min(width, num_nodes - 2 - created)):
+            node_id = f"merge-{created}"
+            nodes.append({"id": node_id, "type": "logic", "position": position, "data": {"logic_type": "Merge"}})
+            for source in {previous_layer[i % len(previous_layer)], previous_layer[(i + 1) % len(previous_layer)]}:
+                edges.append({"id": f"edge-{source}-{node_id}", "source": source, "target": node_id})
+            layer.append(node_id)
+            created += 1
+        previous_layer = layer
+
+    nodes.append({"id": "end", "type": "signature_field", "position": position,
+                  "data": {"fields": fields, "is_end": True}})
+    for source in previous_layer:
+        edges.append({"id": f"edge-{source}-end", "source": source, "target": "end"})
+
+    return Workflow(id=f"bench-{num_nodes}", name=f"bench-{num_nodes}", nodes=nodes, edges=edges)
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>6} {'edges':>6} {'plan ms':>9} {'validate ms':>12} {'build ms':>9} {'aforward ms':>12} {'forward ms':>11}")
+    for size in args.sizes:
+        workflow = build_layered_workflow(size)
+        inputs = {"question": "benchmark"}
+
+        def validate():
+            validation_service.clear_cache()
+            validation_service.validate_workflow(workflow)
+
+        def run_async():
+            program = CompoundProgram(workflow, ExecutionContext(workflow, inputs))
+            asyncio.run(program.aforward(**inputs))
+
+        def run_sync():
+            program = CompoundProgram(workflow, ExecutionContext(workflow, inputs))
+            program(**inputs)
+
+        plan_ms = timed(lambda: ExecutionPlan(workflow), args.repeat)
+        validate_ms = timed(validate, args.repeat)
+        build_ms = timed(lambda: CompoundProgram(workflow, ExecutionContext(workflow, inputs)), args.repeat)
+        aforward_ms = timed(run_async, args.repeat) - build_ms
+        forward_ms = timed(run_sync, args.repeat) - build_ms
+
+        print(f"{size:>6} {len(workflow.edges):>6} {plan_ms:>9.2f} {validate_ms:>12.2f} {build_ms:>9.2f} "
+              f"{aforward_ms:>12.2f} {forward_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
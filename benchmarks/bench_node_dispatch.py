@@ -0,0 +1,116 @@
+"""
+Microbenchmark of per-node dispatch overhead with a stub LM.
+
+Runs a chain of Predict/ChainOfThought modules against StubLM (no network), and
+separately times output extraction for a Prediction result using the
+precomputed per-node attributes versus rebuilding the node template, which is
+what every node did before output attributes were precomputed.
+
+Usage:
+    python benchmarks/bench_node_dispatch.py [--modules 10] [--iterations 200]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+import dspy
+
+from stub_lm import patch_create_lm
+
+from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.core.execution_context import ExecutionContext, bind_execution_context
+from dspy_forge.core.templates import TemplateFactory
+from dspy_forge.models.workflow import Workflow
+
+
+def build_module_chain(num_modules: int) -> Workflow:
+    """start -> (module -> signature)* -> end, alternating Predict and ChainOfThought"""
+    position = {"x": 0, "y": 0}
+
+    def signature(node_id, field, **flags):
+        return {"id": node_id, "type": "signature_field", "position": position,
+                "data": {"fields": [{"name": field, "type": "str", "required": True}], **flags}}
+
+    nodes = [signature("start", "question", is_start=True)]
+    edges = []
+    previous = "start"
+    for i in range(num_modules):
+        module_id = f"module-{i}"
+        output_id = "end" if i == num_modules - 1 else f"sig-{i}"
+        module_type = "ChainOfThought" if i % 2 else "Predict"
+        nodes.append({"id": module_id, "type": "module", "position": position,
+                      "data": {"module_type": module_type, "model": "databricks/stub", "instruction": f"Step {i}"}})
+        field = "answer" if output_id == "end" else f"field_{i}"
+        nodes.append(signature(output_id, field, **({"is_end": True} if output_id == "end" else {})))
+        edges.append({"id": f"edge-{previous}-{module_id}", "source": previous, "target": module_id})
+        edges.append({"id": f"edge-{module_id}-{output_id}", "source": module_id, "target": output_id})
+        previous = output_id
+
+    return Workflow(id="bench-dispatch", name="bench-dispatch", nodes=nodes, edges=edges)
+
+
+def legacy_extract(program: CompoundProgram, result: dspy.Prediction, node) -> dict:
+    """Output extraction as it was done before output attributes were precomputed"""
+    outputs = {}
+    template = TemplateFactory.create_template(node, program.workflow)
+    for field_name in template._template._get_connected_fields(is_input=False):
+        if hasattr(result, field_name):
+            outputs[field_name] = getattr(result, field_name)
+    if hasattr(result, 'rationale'):
+        outputs['rationale'] = result.rationale
+    for attr in ['context', 'passages', 'query', 'sql_query', 'query_description', 'conversation_id']:
+        if hasattr(result, attr) and attr not in outputs:
+            outputs[attr] = getattr(result, attr)
+    return outputs
+
+
+def per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.getLogger("dspy").setLevel(logging.ERROR)
+    stub = patch_create_lm()
+    workflow = build_module_chain(args.modules)
+    program = CompoundProgram(workflow)
+    inputs = {"question": "benchmark"}
+
+    # Output extraction for a single module node
+    node = program.plan.get_node("module-0")
+    result = dspy.Prediction(field_0="value", reasoning="because")
+    assert program._extract_outputs_from_call(result, node) == legacy_extract(program, result, node)
+    precomputed_us = per_call_us(lambda: program._extract_outputs_from_call(result, node), args.iterations * 10)
+    legacy_us = per_call_us(lambda: legacy_extract(program, result, node), args.iterations * 10)
+
+    # End-to-end dispatch through the stub LM
+    async def run_once():
+        with bind_execution_context(ExecutionContext(workflow, inputs)):
+            await program.aforward(**inputs)
+
+    async def run_all():
+        await run_once()  # warm up
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            await run_once()
+        return (time.perf_counter() - start) / args.iterations
+
+    per_run = asyncio.run(run_all())
+    nodes_per_run = len(workflow.nodes)
+
+    print(f"workflow: {args.modules} modules, {nodes_per_run} nodes, {stub.calls} stub LM calls")
+    print(f"output extraction (precomputed): {precomputed_us:8.2f} us/node")
+    print(f"output extraction (rebuild):     {legacy_us:8.2f} us/node")
+    print(f"aforward:                        {per_run * 1e3:8.2f} ms/run, {per_run / nodes_per_run * 1e6:8.2f} us/node")
+
+
+if __name__ == "__main__":
+    main()
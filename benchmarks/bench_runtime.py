@@ -0,0 +1,217 @@
+"""
+Offline benchmark suite for the workflow runtime.
+
+Runs representative workflows (linear module chain, router fan-out,
+FieldSelector chain, RAG) against StubLM and stub retrievers, so no network
+access or credentials are needed, and measures for each workflow:
+
+  - program build time (CompoundProgram construction)
+  - per-node dispatch overhead of forward and aforward, with a zero-delay LM
+  - peak traced memory per aforward execution (tracemalloc)
+  - aforward throughput at several concurrency levels, with `--lm-delay`
+    seconds of simulated LM latency per call
+
+Results are printed and, with `--output`, written as JSON. Pass a previous
+results file to `--compare` to print the relative change of every metric.
+
+Usage:
+    python benchmarks/bench_runtime.py [--workflows linear rag] [--iterations 100]
+        [--concurrency 1 4 16 64] [--lm-delay 0.01] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from datetime import datetime, timezone
+
+import dspy
+
+from stub_lm import patch_create_lm
+from stub_retriever import patch_retrievers
+from workflows import WORKFLOWS
+
+from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.core.execution_context import ExecutionContext, bind_execution_context
+from dspy_forge.models.workflow import Workflow
+
+INPUTS = {"question": "What is topic1 about?"}
+
+# Metrics where a lower value is an improvement
+LOWER_IS_BETTER = ("build_ms", "forward_us_per_node", "aforward_us_per_node", "peak_kib_per_execution")
+
+
+def run_forward(program: CompoundProgram, workflow: Workflow) -> int:
+    """Run one synchronous execution and return the number of nodes that ran"""
+    context = ExecutionContext(workflow, INPUTS)
+    with bind_execution_context(context):
+        program(**INPUTS)
+    return len(context.execution_trace)
+
+
+async def run_aforward(program: CompoundProgram, workflow: Workflow) -> int:
+    """Run one asynchronous execution and return the number of nodes that ran"""
+    context = ExecutionContext(workflow, INPUTS)
+    with bind_execution_context(context):
+        await program.acall(**INPUTS)
+    return len(context.execution_trace)
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def dispatch_us_per_node(program: CompoundProgram, workflow: Workflow, iterations: int) -> dict:
+    run_forward(program, workflow)  # warm up
+    start = time.perf_counter()
+    nodes = sum(run_forward(program, workflow) for _ in range(iterations))
+    forward_us = (time.perf_counter() - start) / nodes * 1e6
+
+    async def run_all():
+        await run_aforward(program, workflow)  # warm up
+        start = time.perf_counter()
+        nodes = 0
+        for _ in range(iterations):
+            nodes += await run_aforward(program, workflow)
+        return (time.perf_counter() - start) / nodes * 1e6, nodes / iterations
+
+    aforward_us, nodes_per_run = asyncio.run(run_all())
+    return {"nodes_per_run": nodes_per_run, "forward_us_per_node": forward_us, "aforward_us_per_node": aforward_us}
+
+
+def peak_kib_per_execution(program: CompoundProgram, workflow: Workflow, iterations: int) -> float:
+    """Mean peak of memory allocated during one aforward execution, above what was allocated before it"""
+
+    async def run_all():
+        await run_aforward(program, workflow)  # warm up
+        peaks = []
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            await run_aforward(program, workflow)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        return sum(peaks) / len(peaks) / 1024
+
+    tracemalloc.start()
+    try:
+        return asyncio.run(run_all())
+    finally:
+        tracemalloc.stop()
+
+
+def throughput(program: CompoundProgram, workflow: Workflow, concurrency: int, rounds: int) -> float:
+    """Executions per second with `concurrency` executions in flight at all times"""
+
+    async def worker():
+        for _ in range(rounds):
+            await run_aforward(program, workflow)
+
+    async def run_all():
+        await run_aforward(program, workflow)  # warm up
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return concurrency * rounds / (time.perf_counter() - start)
+
+    return asyncio.run(run_all())
+
+
+def benchmark_workflow(name: str, args) -> dict:
+    workflow = WORKFLOWS[name]()
+    result = {"nodes": len(workflow.nodes), "edges": len(workflow.edges),
+              "build_ms": best_ms(lambda: CompoundProgram(workflow), args.repeat)}
+
+    stub = patch_create_lm()
+    program = CompoundProgram(workflow)
+    result.update(dispatch_us_per_node(program, workflow, args.iterations))
+    result["peak_kib_per_execution"] = peak_kib_per_execution(program, workflow, args.memory_iterations)
+
+    stub.delay = args.lm_delay
+    for concurrency in args.concurrency:
+        result[f"throughput_c{concurrency}_per_s"] = throughput(program, workflow, concurrency, args.rounds)
+    return result
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: dict):
+    for name, metrics in results.items():
+        print(f"{name} ({metrics['nodes']} nodes, {metrics['nodes_per_run']:.0f} executed)")
+        for key, value in metrics.items():
+            if key not in ("nodes", "edges", "nodes_per_run"):
+                print(f"  {key:<28} {value:12.2f}")
+
+
+def print_comparison(results: dict, baseline: dict):
+    print(f"\nchange vs {baseline['meta']['revision']} ({baseline['meta']['timestamp']}), + is better")
+    for name, metrics in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        print(name)
+        for key, value in metrics.items():
+            if key in ("nodes", "edges", "nodes_per_run") or not previous.get(key):
+                continue
+            change = (value - previous[key]) / previous[key] * 100
+            if key in LOWER_IS_BETTER:
+                change = -change
+            print(f"  {key:<28} {previous[key]:12.2f} -> {value:12.2f}  {change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workflows", nargs="+", choices=sorted(WORKFLOWS), default=list(WORKFLOWS))
+    parser.add_argument("--iterations", type=int, default=100, help="executions timed per dispatch measurement")
+    parser.add_argument("--memory-iterations", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20, help="program builds, best time is reported")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--rounds", type=int, default=5, help="executions per concurrent worker")
+    parser.add_argument("--lm-delay", type=float, default=0.01, help="simulated LM latency for throughput runs")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="results JSON file from an earlier run to compare against")
+    args = parser.parse_args()
+
+    logging.getLogger("dspy").setLevel(logging.ERROR)
+    patch_retrievers()
+
+    results = {name: benchmark_workflow(name, args) for name in args.workflows}
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "dspy": dspy.__version__,
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+
+    print_results(results)
+    if args.compare:
+        with open(args.compare) as fh:
+            print_comparison(results, json.load(fh))
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Scaling benchmark of workflow validation, compilation, program build and storage.
+
+Generates synthetic workflows of increasing size (see workflow_generator.py)
+and times, best of `--repeat`:
+
+  - validate:  WorkflowValidationService.validate_workflow, with an empty cache
+  - revalidate: validate_workflow after editing one node's data, with the
+               cache holding the results for the workflow before the edit
+  - compile:   compiler_service.compile_workflow_to_code
+  - build:     CompoundProgram construction, with StubLM
+  - save/load: LocalDirectoryStorage.save_workflow and get_workflow in a temporary directory
+
+For each operation the growth exponent k of time ~ nodes^k is fitted between
+the smallest and largest size, so a change from linear to quadratic work
+shows up as k going from ~1 to ~2. With `--max-exponent` the benchmark exits
+non-zero when any operation grows faster than that.
+
+Usage:
+    python benchmarks/bench_scaling.py [--sizes 50 100 200 400 800] [--repeat 3]
+        [--router-depth 2] [--router-fanout 3] [--max-exponent 1.5] [--output scaling.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import tempfile
+import time
+
+from stub_lm import patch_create_lm
+from workflow_generator import generate_workflow
+
+from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.models.workflow import Workflow
+from dspy_forge.services.compiler_service import compiler_service
+from dspy_forge.services.validation_service import WorkflowValidationService
+from dspy_forge.storage.local import LocalDirectoryStorage
+
+OPERATIONS = ("validate", "revalidate", "compile", "build", "save", "load")
+
+
+def timed(fn, repeat: int) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark_size(workflow, storage: LocalDirectoryStorage, repeat: int) -> dict:
+    validation_service = WorkflowValidationService()
+    errors = validation_service.validate_workflow(workflow)
+    if errors:
+        raise RuntimeError(f"Generated workflow {workflow.id} is invalid: {errors[:5]}")
+
+    def validate():
+        validation_service.clear_cache()
+        validation_service.validate_workflow(workflow)
+
+    # One single-node edit per repetition, each validated after the original workflow
+    edits = []
+    for i in range(repeat):
+        data = workflow.model_dump()
+        data["nodes"][i % len(data["nodes"])]["data"]["instruction"] = f"Edited {i}"
+        edits.append(Workflow(**data))
+    pending = iter(edits)
+
+    def revalidate():
+        validation_service.validate_workflow(next(pending))
+
+    asyncio.run(storage.save_workflow(workflow))
+
+    return {
+        "nodes": len(workflow.nodes),
+        "edges": len(workflow.edges),
+        "validate": timed(validate, repeat),
+        "revalidate": timed(revalidate, repeat),
+        "compile": timed(lambda: compiler_service.compile_workflow_to_code(workflow), repeat),
+        "build": timed(lambda: CompoundProgram(workflow), repeat),
+        "save": timed(lambda: asyncio.run(storage.save_workflow(workflow)), repeat),
+        "load": timed(lambda: asyncio.run(storage.get_workflow(workflow.id)), repeat),
+    }
+
+
+def growth_exponent(smallest: dict, largest: dict, operation: str) -> float:
+    return (math.log(largest[operation] / smallest[operation])
+            / math.log(largest["nodes"] / smallest["nodes"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400, 800])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--router-depth", type=int, default=2)
+    parser.add_argument("--router-fanout", type=int, default=3)
+    parser.add_argument("--merge-width", type=int, default=3)
+    parser.add_argument("--field-selector-length", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-exponent", type=float, help="fail if any operation grows faster than nodes^k")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    patch_create_lm()
+    results = []
+    with tempfile.TemporaryDirectory() as storage_path:
+        storage = LocalDirectoryStorage(storage_path)
+        asyncio.run(storage.initialize())
+
+        print(f"{'nodes':>6} {'edges':>6}" + "".join(f" {operation + ' ms':>12}" for operation in OPERATIONS))
+        for size in args.sizes:
+            workflow = generate_workflow(size, args.router_depth, args.router_fanout, args.merge_width,
+                                         args.field_selector_length, args.seed)
+            result = benchmark_size(workflow, storage, args.repeat)
+            results.append(result)
+            print(f"{result['nodes']:>6} {result['edges']:>6}"
+                  + "".join(f" {result[operation]:>12.2f}" for operation in OPERATIONS))
+
+    exponents = {}
+    if len(results) > 1:
+        smallest, largest = min(results, key=lambda r: r["nodes"]), max(results, key=lambda r: r["nodes"])
+        exponents = {operation: growth_exponent(smallest, largest, operation) for operation in OPERATIONS}
+        print(f"{'k':>13}" + "".join(f" {exponents[operation]:>12.2f}" for operation in OPERATIONS))
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump({"args": vars(args), "results": results, "exponents": exponents}, fh, indent=2)
+
+    if args.max_exponent is not None:
+        too_fast = {operation: k for operation, k in exponents.items() if k > args.max_exponent}
+        if too_fast:
+            print(f"operations growing faster than nodes^{args.max_exponent}: {too_fast}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Deterministic stand-in for dspy.LM used by the benchmarks.
+
+Answers every request with each requested output field set to "<field>-value"
+in DSPy's chat adapter format, optionally after a fixed delay, so benchmarks
+measure dspy-forge overhead without network access or API keys.
+"""
+import asyncio
+import re
+import time
+
+from types import SimpleNamespace
+
+from dspy.clients.base_lm import BaseLM
+
+_FIELD_HEADER = re.compile(r"\[\[ ## (\w+) ## \]\]")
+
+
+class StubLM(BaseLM):
+    """LM that echoes the requested output fields back with placeholder values"""
+
+    def __init__(self, model: str = "stub/model", delay: float = 0.0):
+        super().__init__(model=model, model_type="chat", temperature=0.0, max_tokens=1000, cache=False)
+        self.delay = delay
+        self.calls = 0
+
+    def _response(self, messages):
+        self.calls += 1
+        prompt = messages[-1]["content"] if messages else ""
+        fields = [name for name in dict.fromkeys(_FIELD_HEADER.findall(prompt)) if name != "completed"]
+        content = "\n\n".join(f"[[ ## {name} ## ]]\n{name}-value" for name in fields)
+        content += "\n\n[[ ## completed ## ]]"
+
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+            usage={"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                   "total_tokens": (len(prompt) + len(content)) // 4},
+            model=self.model,
+        )
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        return self._response(messages or [{"role": "user", "content": prompt or ""}])
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._response(messages or [{"role": "user", "content": prompt or ""}])
+
+
+def patch_create_lm(delay: float = 0.0) -> StubLM:
+    """Route every LM lookup made by the runtime to a single StubLM"""
+    from dspy_forge.core import dspy_runtime
+
+    stub = StubLM(delay=delay)
+    dspy_runtime.create_lm = lambda *args, **kwargs: stub
+    return stub
@@ -0,0 +1,21 @@
+"""
+Deterministic stand-in for the Databricks vector search retriever used by the benchmarks.
+
+Returns `num_passages` placeholder passages derived from the query, optionally
+after a fixed delay, so RAG workflows run without network access.
+"""
+import time
+
+from dspy_forge.components.retriever_templates import UnstructuredRetrieveTemplate
+
+
+def patch_retrievers(num_passages: int = 5, delay: float = 0.0):
+    """Serve every UnstructuredRetrieve node from placeholder passages"""
+
+    def retrieve(self, query: str):
+        if delay:
+            time.sleep(delay)
+        passages = [f"Passage {i} from {self.index_name} about: {query}" for i in range(num_passages)]
+        return dict(context=passages, passages=passages, query=query)
+
+    UnstructuredRetrieveTemplate._retrieve = retrieve
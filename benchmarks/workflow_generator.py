@@ -0,0 +1,182 @@
+"""
+Synthetic large-workflow generator for scaling benchmarks.
+
+Builds valid workflows out of randomly chosen stages appended to a single
+chain, until the requested node count is reached:
+
+  - module step:       module -> signature
+  - FieldSelector chain: `field_selector_length` FieldSelectors renaming a
+                       signature output, then a module step
+  - parallel block:    `merge_width` module steps from the same node, joined by a Merge
+  - router block:      a Router with `router_fanout` branches (the last one the
+                       default), each a short sequence of stages that may contain
+                       nested router blocks down to `router_depth`, joined by a Merge
+
+The same arguments and seed always produce the same workflow.
+
+Usage:
+    python benchmarks/workflow_generator.py [--nodes 200] [--router-depth 2] [--router-fanout 3] > workflow.json
+"""
+import argparse
+import random
+
+from typing import List, Tuple
+
+from workflows import edge, logic, module, router_branch, signature
+
+from dspy_forge.models.workflow import Workflow
+
+# (node id, names of the fields it outputs)
+Tail = Tuple[str, List[str]]
+
+
+class _WorkflowBuilder:
+    def __init__(self, router_depth: int, router_fanout: int, merge_width: int, field_selector_length: int,
+                 seed: int):
+        self.router_depth = router_depth
+        self.router_fanout = router_fanout
+        self.merge_width = merge_width
+        self.field_selector_length = field_selector_length
+        self.rng = random.Random(seed)
+        self.nodes: List[dict] = []
+        self.edges: List[dict] = []
+        self.signature_ids = {"start"}
+
+    def _id(self, prefix: str) -> str:
+        return f"{prefix}-{len(self.nodes)}"
+
+    def _connect(self, source: str, target: str, source_handle: str = None):
+        self.edges.append(edge(source, target, source_handle))
+
+    def module_step(self, tail: Tail, source_handle: str = None) -> Tail:
+        module_id = self._id("module")
+        self.nodes.append(module(module_id, self.rng.choice(["Predict", "ChainOfThought"]), f"Process {module_id}"))
+        output_id = self._id("sig")
+        field = f"text_{len(self.nodes)}"
+        self.nodes.append(signature(output_id, [field, f"{field}_notes"]))
+        self.signature_ids.add(output_id)
+        self._connect(tail[0], module_id, source_handle)
+        self._connect(module_id, output_id)
+        return output_id, [field, f"{field}_notes"]
+
+    def field_selector_chain(self, tail: Tail, source_handle: str = None) -> Tail:
+        if source_handle is not None or tail[0] not in self.signature_ids:
+            # FieldSelectors take their fields from a signature node
+            tail = self.module_step(tail, source_handle)
+            source_handle = None
+        for _ in range(self.field_selector_length):
+            selector_id = self._id("select")
+            selected = tail[1][0]
+            renamed = f"selected_{len(self.nodes)}"
+            self.nodes.append(logic(selector_id, "FieldSelector", selected_fields=[selected],
+                                    field_mappings={selected: renamed}))
+            self._connect(tail[0], selector_id)
+            tail = (selector_id, [renamed])
+        return self.module_step(tail)
+
+    def _merge(self, tails: List[Tail]) -> Tail:
+        merge_id = self._id("merge")
+        self.nodes.append(logic(merge_id, "Merge"))
+        fields = []
+        for source, source_fields in tails:
+            self._connect(source, merge_id)
+            fields.extend(field for field in source_fields if field not in fields)
+        return merge_id, fields
+
+    def parallel_block(self, tail: Tail, source_handle: str = None) -> Tail:
+        if source_handle is not None:
+            # Parallel paths leave from a single node, not from a router handle
+            tail = self.module_step(tail, source_handle)
+        return self._merge([self.module_step(tail) for _ in range(self.merge_width)])
+
+    def router_block(self, tail: Tail, depth: int, source_handle: str = None) -> Tail:
+        if source_handle is not None:
+            tail = self.module_step(tail, source_handle)
+
+        router_id = self._id("router")
+        branches = [router_branch(f"{router_id}-branch-{i}", f"keyword{i}") for i in range(self.router_fanout - 1)]
+        branches.append(router_branch(f"{router_id}-default"))
+        for branch in branches:
+            for condition in branch["condition_config"]["structured_conditions"]:
+                condition["field"] = tail[1][0]
+        self.nodes.append(logic(router_id, "Router", router_config={"branches": branches}))
+        self._connect(tail[0], router_id)
+
+        branch_tails = []
+        for branch in branches:
+            branch_tail = (router_id, tail[1])
+            handle = branch["branch_id"]
+            for _ in range(self.rng.randint(1, 2)):
+                branch_tail = self.stage(branch_tail, depth - 1, handle)
+                handle = None
+            branch_tails.append(branch_tail)
+        return self._merge(branch_tails)
+
+    def stage(self, tail: Tail, depth: int, source_handle: str = None) -> Tail:
+        """Append one randomly chosen stage"""
+        kinds = ["module", "module"]
+        if self.field_selector_length > 0:
+            kinds.append("field_selector")
+        if self.merge_width > 1:
+            kinds.append("parallel")
+        if depth > 0 and self.router_fanout > 1:
+            kinds.append("router")
+
+        kind = self.rng.choice(kinds)
+        if kind == "field_selector":
+            return self.field_selector_chain(tail, source_handle)
+        if kind == "parallel":
+            return self.parallel_block(tail, source_handle)
+        if kind == "router":
+            return self.router_block(tail, depth, source_handle)
+        return self.module_step(tail, source_handle)
+
+    def build(self, num_nodes: int, workflow_id: str) -> Workflow:
+        self.nodes.append(signature("start", ["question"], is_start=True))
+        tail: Tail = ("start", ["question"])
+        # Leave room for the final module and end node
+        while len(self.nodes) < num_nodes - 2:
+            tail = self.stage(tail, self.router_depth)
+
+        self.nodes.append(module("answer", "ChainOfThought", "Answer the question"))
+        self.nodes.append(signature("end", ["answer"], is_end=True))
+        self._connect(tail[0], "answer")
+        self._connect("answer", "end")
+        return Workflow(id=workflow_id, name=workflow_id, nodes=self.nodes, edges=self.edges)
+
+
+def generate_workflow(num_nodes: int, router_depth: int = 2, router_fanout: int = 3, merge_width: int = 3,
+                      field_selector_length: int = 2, seed: int = 0) -> Workflow:
+    """
+    Generate a valid workflow of at least `num_nodes` nodes. Stages are added
+    whole, so the result may exceed `num_nodes` by up to one stage.
+
+    Args:
+        num_nodes: Minimum number of nodes
+        router_depth: Maximum nesting of router blocks, 0 for no routers
+        router_fanout: Branches per router
+        merge_width: Parallel paths per parallel block, below 2 for no parallel blocks
+        field_selector_length: FieldSelectors per FieldSelector chain, 0 for no chains
+        seed: Random seed for the choice of stages
+    """
+    builder = _WorkflowBuilder(router_depth, router_fanout, merge_width, field_selector_length, seed)
+    return builder.build(num_nodes, f"generated-{num_nodes}-{seed}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=200)
+    parser.add_argument("--router-depth", type=int, default=2)
+    parser.add_argument("--router-fanout", type=int, default=3)
+    parser.add_argument("--merge-width", type=int, default=3)
+    parser.add_argument("--field-selector-length", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    workflow = generate_workflow(args.nodes, args.router_depth, args.router_fanout, args.merge_width,
+                                 args.field_selector_length, args.seed)
+    print(workflow.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
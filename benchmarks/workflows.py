@@ -0,0 +1,116 @@
+"""
+Representative workflow shapes for the runtime benchmarks.
+
+Every builder returns a valid Workflow whose modules use the "databricks/stub"
+model (routed to StubLM by patch_create_lm) and whose retrievers are served by
+patch_retrievers, so the workflows run without network access.
+"""
+from typing import Callable, Dict, List
+
+from dspy_forge.models.workflow import Workflow
+
+POSITION = {"x": 0, "y": 0}
+
+
+def signature(node_id: str, fields: List[str], is_start: bool = False, is_end: bool = False) -> dict:
+    return {"id": node_id, "type": "signature_field", "position": POSITION,
+            "data": {"fields": [{"name": name, "type": "str", "required": True} for name in fields],
+                     "is_start": is_start, "is_end": is_end}}
+
+
+def module(node_id: str, module_type: str = "Predict", instruction: str = "Answer the question") -> dict:
+    return {"id": node_id, "type": "module", "position": POSITION,
+            "data": {"module_type": module_type, "model": "databricks/stub", "instruction": instruction}}
+
+
+def logic(node_id: str, logic_type: str, **data) -> dict:
+    return {"id": node_id, "type": "logic", "position": POSITION, "data": {"logic_type": logic_type, **data}}
+
+
+def retriever(node_id: str, num_results: int = 5) -> dict:
+    return {"id": node_id, "type": "retriever", "position": POSITION,
+            "data": {"retriever_type": "UnstructuredRetrieve", "catalog_name": "bench", "schema_name": "bench",
+                     "index_name": node_id, "content_column": "text", "id_column": "id",
+                     "num_results": num_results}}
+
+
+def edge(source: str, target: str, source_handle: str = None) -> dict:
+    return {"id": f"edge-{source}-{target}", "source": source, "target": target, "sourceHandle": source_handle}
+
+
+def router_branch(branch_id: str, keyword: str = None) -> dict:
+    conditions = [{"field": "question", "operator": "contains", "value": keyword}] if keyword else []
+    return {"branch_id": branch_id, "label": branch_id, "is_default": keyword is None,
+            "condition_config": {"structured_conditions": conditions}}
+
+
+def linear_chain(num_modules: int = 6) -> Workflow:
+    """start -> (module -> signature)* -> end, alternating Predict and ChainOfThought"""
+    nodes = [signature("start", ["question"], is_start=True)]
+    edges = []
+    previous = "start"
+    for i in range(num_modules):
+        last = i == num_modules - 1
+        output_id = "end" if last else f"sig-{i}"
+        nodes.append(module(f"module-{i}", "ChainOfThought" if i % 2 else "Predict", f"Step {i}"))
+        nodes.append(signature(output_id, ["answer" if last else f"field_{i}"], is_end=last))
+        edges += [edge(previous, f"module-{i}"), edge(f"module-{i}", output_id)]
+        previous = output_id
+    return Workflow(id="bench-linear", name="linear chain", nodes=nodes, edges=edges)
+
+
+def router_fanout(num_branches: int = 4) -> Workflow:
+    """start -> Router -> one of `num_branches` module branches -> Merge -> end"""
+    branches = [router_branch(f"branch-{i}", f"topic{i}") for i in range(num_branches - 1)]
+    branches.append(router_branch("default"))
+
+    nodes = [signature("start", ["question"], is_start=True),
+             logic("router", "Router", router_config={"branches": branches}),
+             logic("merge", "Merge"),
+             signature("end", ["answer"], is_end=True)]
+    edges = [edge("start", "router"), edge("merge", "end")]
+    for branch in branches:
+        branch_id = branch["branch_id"]
+        nodes += [module(f"module-{branch_id}"), signature(f"sig-{branch_id}", ["answer"])]
+        edges += [edge("router", f"module-{branch_id}", branch_id),
+                  edge(f"module-{branch_id}", f"sig-{branch_id}"),
+                  edge(f"sig-{branch_id}", "merge")]
+    return Workflow(id="bench-router", name="router fan-out", nodes=nodes, edges=edges)
+
+
+def field_selector_chain(num_stages: int = 4) -> Workflow:
+    """start -> (module -> signature(summary, topic) -> FieldSelector(summary -> context))* -> module -> end"""
+    nodes = [signature("start", ["question"], is_start=True)]
+    edges = []
+    previous = "start"
+    for i in range(num_stages):
+        nodes += [module(f"module-{i}", instruction=f"Summarize step {i}"),
+                  signature(f"sig-{i}", ["summary", "topic"]),
+                  logic(f"select-{i}", "FieldSelector", selected_fields=["summary"],
+                        field_mappings={"summary": "context"})]
+        edges += [edge(previous, f"module-{i}"), edge(f"module-{i}", f"sig-{i}"), edge(f"sig-{i}", f"select-{i}")]
+        previous = f"select-{i}"
+    nodes += [module("answer"), signature("end", ["answer"], is_end=True)]
+    edges += [edge(previous, "answer"), edge("answer", "end")]
+    return Workflow(id="bench-field-selector", name="FieldSelector chain", nodes=nodes, edges=edges)
+
+
+def rag(num_retrievers: int = 2, num_results: int = 5) -> Workflow:
+    """start -> parallel retrievers -> Merge -> ChainOfThought -> end"""
+    nodes = [signature("start", ["question"], is_start=True),
+             logic("merge", "Merge"),
+             module("answer", "ChainOfThought", "Answer using the retrieved context"),
+             signature("end", ["answer"], is_end=True)]
+    edges = [edge("merge", "answer"), edge("answer", "end")]
+    for i in range(num_retrievers):
+        nodes.append(retriever(f"retriever-{i}", num_results))
+        edges += [edge("start", f"retriever-{i}"), edge(f"retriever-{i}", "merge")]
+    return Workflow(id="bench-rag", name="RAG", nodes=nodes, edges=edges)
+
+
+WORKFLOWS: Dict[str, Callable[[], Workflow]] = {
+    "linear": linear_chain,
+    "router": router_fanout,
+    "field_selector": field_selector_chain,
+    "rag": rag,
+}
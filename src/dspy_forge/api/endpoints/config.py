@@ -3,9 +3,15 @@ Configuration API endpoints.
 
 Provides endpoints for retrieving system configuration and LM provider status.
 """
+import asyncio
+
 from fastapi import APIRouter
-from typing import Dict
-from dspy_forge.core.lm_config import get_provider_config_status
+from typing import Any, Dict, Optional
+from dspy_forge.core.executors import get_executor_stats
+from dspy_forge.core.lm_cache import get_lm_response_cache
+from dspy_forge.core.lm_config import get_provider_config_status, lm_registry
+from dspy_forge.core.rate_limiter import get_limiter_stats
+from dspy_forge.core.semantic_cache import get_semantic_cache
 
 router = APIRouter()
 
@@ -21,3 +27,75 @@ async def get_lm_providers() -> Dict[str, bool]:
     Note: This endpoint does NOT return actual API keys, only boolean flags.
     """
     return get_provider_config_status()
+
+
+@router.get("/lm-registry")
+async def get_lm_registry_stats() -> Dict[str, int]:
+    """
+    Get counters for the pooled LM instances (hits, misses and live instances).
+    """
+    return lm_registry.stats()
+
+
+@router.post("/lm-registry/invalidate")
+async def invalidate_lm_registry(model_name: Optional[str] = None) -> Dict[str, int]:
+    """
+    Drop pooled LM instances so they are rebuilt with the current settings.
+
+    Drops all instances, or only those of `model_name` if given.
+    """
+    lm_registry.invalidate(model_name)
+    return lm_registry.stats()
+
+
+@router.get("/lm-rate-limits")
+async def get_lm_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get per provider/model rate limiter metrics: concurrency limit, in-flight and
+    waiting calls, queue wait times and throttle (HTTP 429) events.
+    """
+    return get_limiter_stats()
+
+
+@router.get("/executors")
+async def get_executors_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get queue depth and latency metrics for the retriever thread pools.
+    """
+    return get_executor_stats()
+
+
+@router.get("/lm-cache")
+async def get_lm_cache_stats() -> Dict[str, Any]:
+    """
+    Get LM response cache statistics (entries, size, hits, misses and evictions).
+    """
+    cache = get_lm_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.post("/lm-cache/clear")
+async def clear_lm_cache(namespace: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Clear cached LM responses.
+
+    Clears all entries, or only those of the `namespace` (workflow ID) if given.
+    """
+    cache = get_lm_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    await asyncio.to_thread(cache.clear, namespace)
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/semantic-cache")
+async def get_semantic_cache_stats() -> Dict[str, Any]:
+    """
+    Get semantic answer cache statistics (workflows, entries, hits, misses and evictions).
+    """
+    cache = get_semantic_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
@@ -1,12 +1,24 @@
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+import json
+import asyncio
+import tempfile
+
+from fastapi import APIRouter, HTTPException, status, BackgroundTasks, Request, Header, Query
+from fastapi.responses import Response, StreamingResponse
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union, Iterable, AsyncIterable, AsyncIterator
 from pydantic import BaseModel
 
-from dspy_forge.models.workflow import WorkflowExecution, NodeType, PlaygroundExecutionRequest, ExecutionRequest
+from dspy_forge.models.workflow import (
+    WorkflowExecution, NodeType, PlaygroundExecutionRequest, ExecutionRequest, BatchExecutionRequest
+)
 from dspy_forge.services.workflow_service import workflow_service
 from dspy_forge.services.execution_service import execution_engine
+from dspy_forge.services.execution_store import execution_store
+from dspy_forge.storage.factory import get_storage_backend
+from dspy_forge.core.config import settings
 from dspy_forge.core.logging import get_logger
+from dspy_forge.core.profiling import ProfilerBusyError
+from dspy_forge.core.tracing import start_span
 
 from dspy_forge.services.validation_service import validation_service
 from dspy_forge.models.workflow import Workflow
@@ -15,6 +27,55 @@ from dspy_forge.models.workflow import Workflow
 router = APIRouter()
 logger = get_logger(__name__)
 
+# JSONL uploads larger than this are spooled to a temporary file
+JSONL_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+# Bytes of JSONL lines read and parsed per worker thread call
+JSONL_READ_CHUNK = 256 * 1024
+
+# How often a running playground execution checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# Header values that make a run skip the LM response and semantic caches (e.g.
+# `X-LM-Cache: bypass`). Such runs are also never coalesced with identical ones.
+LM_CACHE_BYPASS_VALUES = {"bypass", "no-cache", "off"}
+
+# Header values that stop a run from being coalesced with identical in-flight
+# runs (`X-Coalesce: off`), without skipping any cache
+COALESCE_OFF_VALUES = {"off", "false", "0", "no"}
+
+
+# Header values that request a profiled run (`X-Profile: true`)
+PROFILE_VALUES = {"1", "true", "yes", "on"}
+
+# Profile artifacts of an execution, by the name used to fetch them
+PROFILE_ARTIFACTS = {
+    "speedscope": ("profile.speedscope.json", "application/json"),
+    "collapsed": ("stacks.collapsed.txt", "text/plain"),
+    "allocations": ("allocations.json", "application/json"),
+}
+
+
+def _should_bypass_lm_cache(x_lm_cache: Optional[str]) -> bool:
+    """Check the X-LM-Cache request header for a cache bypass"""
+    return bool(x_lm_cache) and x_lm_cache.strip().lower() in LM_CACHE_BYPASS_VALUES
+
+
+def _should_coalesce(x_coalesce: Optional[str]) -> bool:
+    """Check the X-Coalesce request header for a coalescing opt-out"""
+    return not x_coalesce or x_coalesce.strip().lower() not in COALESCE_OFF_VALUES
+
+
+def _should_profile(x_profile: Optional[str]) -> bool:
+    """Check the X-Profile request header, rejecting it if profiling is disabled on the server"""
+    if not x_profile or x_profile.strip().lower() not in PROFILE_VALUES:
+        return False
+    if not settings.profiling_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Profiling is disabled on this server"
+        )
+    return True
+
 
 def _normalize_workflow_data(workflow_ir: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -211,56 +272,112 @@ def _process_playground_input(input_data: Dict[str, Any], conversation_history:
     return processed_input
 
 
+def _prepare_playground_execution(request: PlaygroundExecutionRequest) -> tuple[Workflow, Dict[str, Any]]:
+    """Build and validate the playground workflow and its processed input data"""
+    # Use provided workflow ID
+    workflow_id = request.workflow_id
+    
+    # Normalize workflow IR data from frontend format to backend format
+    normalized_workflow_ir = _normalize_workflow_data(request.workflow_ir)
+    logger.debug(f"Normalized workflow IR: {normalized_workflow_ir}")
+    
+    workflow_data = {
+        "id": workflow_id,
+        "name": "Playground Workflow",
+        "description": "Temporary workflow for playground execution",
+        "nodes": normalized_workflow_ir.get("nodes", []),
+        "edges": normalized_workflow_ir.get("edges", []),
+        "created_at": datetime.now(),
+        "updated_at": datetime.now()
+    }
+    
+    workflow = Workflow(**workflow_data)
+    logger.debug(f"Created workflow with {len(workflow.nodes)} nodes and {len(workflow.edges)} edges")
+    
+    # Validate workflow
+    errors = validation_service.validate_for_execution(workflow)
+    
+    if errors:
+        logger.error(f"Workflow validation failed: {errors}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Workflow validation failed: {'; '.join(errors)}"
+        )
+    
+    # Prepare input data with question and history
+    input_data = {
+        "question": request.question,
+    }
+    
+    # Process input data to handle question and history dynamically
+    processed_input = _process_playground_input(input_data, request.conversation_history, workflow)
+    logger.debug(f"Processed input: {processed_input}")
+    
+    return workflow, processed_input
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an execution event as a server-sent event"""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+async def _execute_until_disconnected(http_request: Request, workflow: Workflow, input_data: Dict[str, Any],
+                                      bypass_lm_cache: bool, profile: bool = False,
+                                      coalesce: bool = True) -> WorkflowExecution:
+    """Run a workflow execution, cancelling it if the client disconnects before it finishes"""
+    task = asyncio.create_task(execution_engine.execute_workflow(
+        workflow, input_data, bypass_lm_cache=bypass_lm_cache, profile=profile, coalesce=coalesce
+    ))
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+
+            if await http_request.is_disconnected():
+                logger.info("Client disconnected, cancelling playground execution")
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 @router.post("/playground")
-async def execute_workflow_playground(request: PlaygroundExecutionRequest):
-    """Execute a workflow from the playground interface"""
+async def execute_workflow_playground(request: PlaygroundExecutionRequest, http_request: Request,
+                                      x_lm_cache: Optional[str] = Header(default=None),
+                                      x_profile: Optional[str] = Header(default=None),
+                                      x_coalesce: Optional[str] = Header(default=None)):
+    """
+    Execute a workflow from the playground interface.
+    Send `X-LM-Cache: bypass` to skip the LM response cache for non-deterministic runs.
+    Send `X-Coalesce: off` to run separately from identical in-flight executions
+    while still using the caches.
+    Send `X-Profile: true` (with profiling enabled on the server) to profile the run;
+    the response then carries the `profile_path` of the profile artifacts.
+    The execution is cancelled if the client disconnects before it finishes.
+    """
+    with start_span("playground.request", {'workflow.id': request.workflow_id}):
+        return await _execute_workflow_playground(request, http_request, x_lm_cache, x_profile, x_coalesce)
+
+
+async def _execute_workflow_playground(request: PlaygroundExecutionRequest, http_request: Request,
+                                       x_lm_cache: Optional[str], x_profile: Optional[str],
+                                       x_coalesce: Optional[str] = None) -> Dict[str, Any]:
+    profile = _should_profile(x_profile)
     try:
         logger.info(f"Playground execution request with workflow IR")
         logger.debug(f"Question: {request.question}")
         logger.debug(f"Conversation history length: {len(request.conversation_history)}")
         
-        # Use provided workflow ID
-        workflow_id = request.workflow_id
-        
-        # Normalize workflow IR data from frontend format to backend format
-        normalized_workflow_ir = _normalize_workflow_data(request.workflow_ir)
-        logger.debug(f"Normalized workflow IR: {normalized_workflow_ir}")
-        
-        workflow_data = {
-            "id": workflow_id,
-            "name": "Playground Workflow",
-            "description": "Temporary workflow for playground execution",
-            "nodes": normalized_workflow_ir.get("nodes", []),
-            "edges": normalized_workflow_ir.get("edges", []),
-            "created_at": datetime.now(),
-            "updated_at": datetime.now()
-        }
-        
-        workflow = Workflow(**workflow_data)
-        logger.debug(f"Created workflow with {len(workflow.nodes)} nodes and {len(workflow.edges)} edges")
-        
-        # Validate workflow
-        errors = validation_service.validate_for_execution(workflow)
-        
-        if errors:
-            logger.error(f"Workflow validation failed: {errors}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Workflow validation failed: {'; '.join(errors)}"
-            )
-        
-        # Prepare input data with question and history
-        input_data = {
-            "question": request.question,
-        }
-        
-        # Process input data to handle question and history dynamically
-        processed_input = _process_playground_input(input_data, request.conversation_history, workflow)
-        logger.debug(f"Processed input: {processed_input}")
+        workflow, processed_input = _prepare_playground_execution(request)
         
         # Execute workflow directly
         logger.debug("Executing workflow")
-        execution = await execution_engine.execute_workflow(workflow, processed_input)
+        execution = await _execute_until_disconnected(
+            http_request, workflow, processed_input, _should_bypass_lm_cache(x_lm_cache), profile,
+            _should_coalesce(x_coalesce)
+        )
         
         logger.info(f"Execution completed with status: {execution.status}")
         if execution.error:
@@ -303,15 +420,259 @@ async def execute_workflow_playground(request: PlaygroundExecutionRequest):
                 "error": None
             }
         
+        if execution.profile_path:
+            response["profile_path"] = execution.profile_path
+
         logger.info(f"Playground execution completed successfully")
         return response
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         logger.error(f"Playground execution failed: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Playground execution failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/playground/stream")
+async def execute_workflow_playground_stream(request: PlaygroundExecutionRequest,
+                                             x_lm_cache: Optional[str] = Header(default=None)):
+    """
+    Execute a workflow from the playground interface, streaming progress as server-sent events.
+
+    Emits a `node` event as each node finishes (node id, type, status, timing and
+    outputs), `token` events (node id, field, chunk) as modules that feed end
+    nodes generate their output, and ends with a `final` event carrying the
+    execution id, status, final outputs and error, if any.
+    Send `X-LM-Cache: bypass` to skip the LM response cache.
+    """
+    logger.info(f"Streaming playground execution request with workflow IR")
+    try:
+        with start_span("playground.stream_request", {'workflow.id': request.workflow_id}) as request_span:
+            workflow, processed_input = _prepare_playground_execution(request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Playground execution failed: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Playground execution failed: {str(e)}"
+        )
+
+    bypass_lm_cache = _should_bypass_lm_cache(x_lm_cache)
+
+    async def event_stream():
+        # The response streams after the handler returns, so its span continues the request's trace explicitly
+        with start_span("playground.stream", {'workflow.id': workflow.id}, parent=request_span):
+            async for event in execution_engine.stream_workflow(workflow, processed_input, bypass_lm_cache):
+                yield _format_sse(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _get_executable_workflow(workflow_id: str) -> Workflow:
+    """Load a saved workflow and check it is ready for execution"""
+    workflow = await workflow_service.get_workflow(workflow_id)
+    if not workflow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow not found"
+        )
+
+    errors = validation_service.validate_for_execution(workflow)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Workflow validation failed: {'; '.join(errors)}"
+        )
+
+    return workflow
+
+
+async def _spool_request_body(request: Request) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy the request body into a spooled file (kept in memory when small, moved to
+    disk when large). The body has to be fully received before a streaming
+    response starts, as the response listens on the same channel for disconnects.
+    Writes run in a worker thread, as the spool may be on disk.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=JSONL_SPOOL_MAX_MEMORY)
+    try:
+        async for chunk in request.stream():
+            await asyncio.to_thread(spool.write, chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _parse_jsonl_lines(spool: tempfile.SpooledTemporaryFile, first_line_number: int) -> Tuple[List[Any], int]:
+    """Read and parse about JSONL_READ_CHUNK bytes of lines, returning the items and the number of lines read"""
+    items = []
+    lines = spool.readlines(JSONL_READ_CHUNK)
+    for line_number, line in enumerate(lines, start=first_line_number):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            items.append(ValueError(f"Invalid JSON on line {line_number}: {e}"))
+    return items, len(lines)
+
+
+async def _read_jsonl_inputs(spool: tempfile.SpooledTemporaryFile) -> AsyncIterator[Any]:
+    """
+    Parse JSONL inputs a chunk of lines at a time. Reading and parsing run in a
+    worker thread, so large uploads don't block the event loop.
+    Lines that are not valid JSON are yielded as ValueErrors so they are reported per item.
+    """
+    try:
+        line_number = 1
+        while True:
+            items, lines_read = await asyncio.to_thread(_parse_jsonl_lines, spool, line_number)
+            if not lines_read:
+                break
+            line_number += lines_read
+            for item in items:
+                yield item
+    finally:
+        spool.close()
+
+
+def _stream_batch_results(
+    workflow: Workflow,
+    inputs: Union[Iterable[Any], AsyncIterable[Any]],
+    concurrency: Optional[int],
+    bypass_lm_cache: bool = False
+) -> StreamingResponse:
+    """Stream batch results as JSONL, one line per item as it completes"""
+    async def result_lines():
+        async for item in execution_engine.execute_batch(workflow, inputs, concurrency, bypass_lm_cache):
+            yield json.dumps(item, default=str) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/coalescing")
+async def get_coalescing_stats() -> Dict[str, int]:
+    """
+    Get counters for coalesced executions: runs currently in flight, runs that
+    were executed, and executions that joined an identical in-flight run.
+    """
+    return execution_engine.get_coalescing_stats()
+
+
+@router.post("/{workflow_id}/batch")
+async def execute_workflow_batch(workflow_id: str, request: BatchExecutionRequest,
+                                 x_lm_cache: Optional[str] = Header(default=None)):
+    """
+    Execute a saved workflow for a list of inputs.
+
+    Runs up to `concurrency` executions at a time and streams one JSON line per
+    item as it completes: index, status, result (end node outputs), error and
+    execution_time. Send `X-LM-Cache: bypass` to skip the LM response cache.
+    """
+    workflow = await _get_executable_workflow(workflow_id)
+    logger.info(f"Batch execution of {len(request.inputs)} inputs for workflow {workflow_id}")
+    return _stream_batch_results(
+        workflow, request.inputs, request.concurrency, _should_bypass_lm_cache(x_lm_cache)
+    )
+
+
+@router.post("/{workflow_id}/batch/jsonl")
+async def execute_workflow_batch_jsonl(workflow_id: str, request: Request, concurrency: Optional[int] = None,
+                                       x_lm_cache: Optional[str] = Header(default=None)):
+    """
+    Execute a saved workflow for inputs uploaded as a JSONL body (one JSON object per line).
+
+    The upload is spooled to disk when large and parsed one line at a time, so
+    inputs are never all held in memory. Results are streamed back as in the
+    JSON batch endpoint.
+    """
+    workflow = await _get_executable_workflow(workflow_id)
+    spool = await _spool_request_body(request)
+    logger.info(f"Batch execution of JSONL upload for workflow {workflow_id}")
+    return _stream_batch_results(
+        workflow, _read_jsonl_inputs(spool), concurrency, _should_bypass_lm_cache(x_lm_cache)
+    )
+
+
+@router.get("/records")
+async def list_execution_records(
+    workflow_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500)
+):
+    """
+    List executions, newest first, with pagination.
+
+    Filters by workflow and by creation time (`start` inclusive, `end` exclusive,
+    ISO 8601). Returns the total match count and execution summaries.
+    """
+    return await execution_store.query(workflow_id, start, end, offset, limit)
+
+
+@router.get("/records/{execution_id}", response_model=WorkflowExecution)
+async def get_execution_record(execution_id: str):
+    """Get an execution, including its result and trace"""
+    execution = await execution_engine.get_execution_status(execution_id)
+    if not execution:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Execution not found"
+        )
+    return execution
+
+
+@router.get("/records/{execution_id}/trace")
+async def get_execution_record_trace(execution_id: str):
+    """Get the execution trace of an execution"""
+    trace = await execution_store.get_trace(execution_id)
+    if trace is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Execution not found"
+        )
+    return trace
+
+
+@router.get("/records/{execution_id}/profile")
+async def get_execution_record_profile(execution_id: str, artifact: str = Query(default="speedscope")):
+    """
+    Get a profile artifact of a profiled execution: `speedscope` (speedscope JSON),
+    `collapsed` (collapsed stacks for flame graph tools) or `allocations`.
+    """
+    if artifact not in PROFILE_ARTIFACTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown profile artifact '{artifact}', expected one of: {', '.join(PROFILE_ARTIFACTS)}"
+        )
+
+    execution = await execution_store.get(execution_id)
+    if execution is None or not execution.profile_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiled execution not found"
+        )
+
+    filename, media_type = PROFILE_ARTIFACTS[artifact]
+    storage = await get_storage_backend()
+    content = await storage.get_file(f"{execution.profile_path}/{filename}")
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile artifact not found"
+        )
+    return Response(content=content, media_type=media_type)
@@ -0,0 +1,20 @@
+"""
+Metrics API endpoint.
+
+Serves the in-process metrics in the Prometheus text format for scraping.
+"""
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Get all metrics in the Prometheus text format"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
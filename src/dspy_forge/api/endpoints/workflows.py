@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Query, status, BackgroundTasks
 from typing import List, Dict, Optional, Literal, Any
 from pydantic import BaseModel, Field, field_validator
 
 from dspy_forge.core.logging import get_logger
+from dspy_forge.storage.catalog import SortField
 from dspy_forge.storage.factory import get_storage_backend
 from dspy_forge.models.workflow import (
     Workflow, WorkflowCreateRequest, WorkflowUpdateRequest, DeploymentRequest
@@ -97,12 +98,22 @@ async def create_workflow(workflow_request: WorkflowCreateRequest):
         )
 
 
-@router.get("/", response_model=List[Workflow])
-async def list_workflows():
-    """List all workflows"""
+@router.get("/")
+async def list_workflows(
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=50, ge=1, le=500),
+    sort_by: SortField = "updated_at",
+    order: Literal["asc", "desc"] = "desc"
+):
+    """
+    List workflow summaries with pagination.
+
+    Summaries come from the workflow catalog (id, name, description, timestamps,
+    node and edge counts, has_optimization and stored size), so no workflow is
+    loaded. Returns the total workflow count and one page of summaries.
+    """
     try:
-        workflows = await workflow_service.list_workflows()
-        return workflows
+        return await workflow_service.list_workflow_summaries(offset, limit, sort_by, order == "desc")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,327 @@
+"""
+Result cache for retriever nodes.
+
+Caches Vector Search and Genie results keyed by (index or space id, query with
+normalized whitespace, query_type, k). Queries differing only in case are
+distinct unless case-folding is enabled for the retriever type, as a backend
+may rank them differently. Entries live in a size-bounded in-memory LRU tier and,
+optionally, an on-disk tier under artifacts_path that survives restarts, with
+its own entry and byte limits. Both tiers expire entries after a TTL and evict
+least recently used entries when over their limits.
+
+Results are stored serialized, so every lookup returns a fresh copy that
+callers can modify without affecting the cache.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_query(query: str, case_insensitive: bool = False) -> str:
+    """Normalize a query's whitespace for cache lookups, and its case with `case_insensitive`"""
+    normalized = " ".join(str(query).split())
+    return normalized.casefold() if case_insensitive else normalized
+
+
+def make_cache_key(source_id: str, query: str, query_type: Optional[str] = None, k: Optional[int] = None,
+                   case_insensitive: bool = False) -> str:
+    """Build a cache key from the retriever source, normalized query, query type and result count"""
+    content = json.dumps([source_id, normalize_query(query, case_insensitive), query_type or "", k])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class CacheLookup(NamedTuple):
+    """Outcome of a cache operation, reported in the execution trace"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class _MemoryEntry(NamedTuple):
+    payload: str  # JSON serialized result
+    size: int
+    expires_at: float
+
+
+class _DiskEntry(NamedTuple):
+    size: int
+    expires_at: float
+
+
+class RetrieverResultCache:
+    """Two-tier (memory + optional disk) TTL/LRU cache for retriever results"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_bytes: int, disk_path: Optional[str] = None,
+                 disk_max_entries: int = 16384, disk_max_bytes: int = 256 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Index of the disk tier, least recently used first
+        self._disk_entries: "OrderedDict[str, _DiskEntry]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_lock = threading.Lock()
+        self.disk_evictions = 0
+
+        if self.disk_path:
+            os.makedirs(self.disk_path, exist_ok=True)
+            self._load_disk_index()
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], CacheLookup]:
+        """Look up a result in memory, then on disk"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry.payload), CacheLookup(hits=1)
+
+                self._remove(key)
+                self.evictions += 1
+
+        payload, expires_at = self._read_disk(key, now)
+        if payload is not None:
+            # Promote to the memory tier with its remaining lifetime
+            evicted = self._put_memory(key, payload, expires_at)
+            with self._lock:
+                self.hits += 1
+            return json.loads(payload), CacheLookup(hits=1, evictions=evicted)
+
+        with self._lock:
+            self.misses += 1
+        return None, CacheLookup(misses=1)
+
+    def put(self, key: str, value: Dict[str, Any]) -> CacheLookup:
+        """Store a result in both tiers. Returns the number of evictions it caused."""
+        expires_at = time.time() + self.ttl_seconds
+        payload = json.dumps(value, default=str)
+        evicted = self._put_memory(key, payload, expires_at)
+        evicted += self._write_disk(key, payload, expires_at)
+        return CacheLookup(evictions=evicted)
+
+    def clear(self):
+        """Drop all entries from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+        if self.disk_path and os.path.isdir(self.disk_path):
+            with self._disk_lock:
+                self._disk_entries.clear()
+                self._disk_bytes = 0
+                for filename in os.listdir(self.disk_path):
+                    if filename.endswith(".json"):
+                        self._remove_disk_file(os.path.join(self.disk_path, filename))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_enabled": bool(self.disk_path),
+                "disk_entries": len(self._disk_entries),
+                "disk_bytes": self._disk_bytes,
+                "disk_max_entries": self.disk_max_entries,
+                "disk_max_bytes": self.disk_max_bytes,
+                "disk_evictions": self.disk_evictions,
+            }
+
+    def _put_memory(self, key: str, payload: str, expires_at: float) -> int:
+        size = len(payload)
+        if size > self.max_bytes:
+            return 0
+
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _MemoryEntry(payload, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                evicted += 1
+
+            self.evictions += evicted
+        return evicted
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, f"{key}.json")
+
+    def _load_disk_index(self):
+        """Index entries left on disk by earlier runs, dropping expired ones and trimming to the limits"""
+        now = time.time()
+        found = []
+        for filename in os.listdir(self.disk_path):
+            if not filename.endswith(".json"):
+                # Leftover temporary files from interrupted writes
+                if filename.endswith(".tmp"):
+                    self._remove_disk_file(os.path.join(self.disk_path, filename))
+                continue
+
+            path = os.path.join(self.disk_path, filename)
+            try:
+                stat = os.stat(path)
+                with open(path, "r") as f:
+                    expires_at = json.load(f).get("expires_at", 0)
+            except (OSError, ValueError, AttributeError):
+                self._remove_disk_file(path)
+                continue
+
+            if expires_at <= now:
+                self._remove_disk_file(path)
+            else:
+                # Reads touch their file, so mtime orders entries by last use
+                found.append((stat.st_mtime, filename[:-len(".json")], _DiskEntry(stat.st_size, expires_at)))
+
+        with self._disk_lock:
+            for _, key, entry in sorted(found):
+                self._disk_entries[key] = entry
+                self._disk_bytes += entry.size
+            self._evict_disk(now)
+
+    def _read_disk(self, key: str, now: float) -> Tuple[Optional[str], float]:
+        if not self.disk_path:
+            return None, 0.0
+
+        with self._disk_lock:
+            entry = self._disk_entries.get(key)
+            if entry is None:
+                return None, 0.0
+            if entry.expires_at <= now:
+                self._drop_disk_entry(key)
+                return None, 0.0
+            self._disk_entries.move_to_end(key)
+
+        path = self._disk_file(key)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Failed to read retriever cache entry {path}: {e}")
+            with self._disk_lock:
+                self._drop_disk_entry(key)
+            return None, 0.0
+
+        return json.dumps(data.get("value"), default=str), entry.expires_at
+
+    def _write_disk(self, key: str, payload: str, expires_at: float) -> int:
+        """Write an entry to the disk tier. Returns the number of evictions it caused."""
+        if not self.disk_path:
+            return 0
+
+        content = f'{{"expires_at": {json.dumps(expires_at)}, "value": {payload}}}'
+        size = len(content.encode("utf-8"))
+        if size > self.disk_max_bytes:
+            return 0
+
+        path = self._disk_file(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write retriever cache entry {path}: {e}")
+            self._remove_disk_file(temp_path)
+            return 0
+
+        with self._disk_lock:
+            previous = self._disk_entries.pop(key, None)
+            if previous is not None:
+                self._disk_bytes -= previous.size
+            self._disk_entries[key] = _DiskEntry(size, expires_at)
+            self._disk_bytes += size
+            return self._evict_disk(time.time())
+
+    def _evict_disk(self, now: float) -> int:
+        """Drop expired disk entries, then least recently used ones while over the limits. Needs _disk_lock."""
+        expired = [key for key, entry in self._disk_entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._drop_disk_entry(key)
+
+        evicted = 0
+        while self._disk_entries and (len(self._disk_entries) > self.disk_max_entries
+                                      or self._disk_bytes > self.disk_max_bytes):
+            self._drop_disk_entry(next(iter(self._disk_entries)))
+            evicted += 1
+
+        self.disk_evictions += len(expired) + evicted
+        return evicted
+
+    def _drop_disk_entry(self, key: str):
+        """Remove an entry from the disk index and its file. Needs _disk_lock."""
+        entry = self._disk_entries.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry.size
+        self._remove_disk_file(self._disk_file(key))
+
+    @staticmethod
+    def _remove_disk_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_retriever_cache: Optional[RetrieverResultCache] = None
+_retriever_cache_lock = threading.Lock()
+
+
+def get_retriever_cache() -> Optional[RetrieverResultCache]:
+    """Get the retriever result cache, or None if caching is disabled"""
+    global _retriever_cache
+
+    if not settings.retriever_cache_enabled:
+        return None
+
+    with _retriever_cache_lock:
+        if _retriever_cache is None:
+            disk_path = (
+                os.path.join(settings.artifacts_path, "cache", "retrievers")
+                if settings.retriever_cache_disk_enabled else None
+            )
+            _retriever_cache = RetrieverResultCache(
+                ttl_seconds=settings.retriever_cache_ttl_seconds,
+                max_entries=settings.retriever_cache_max_entries,
+                max_bytes=settings.retriever_cache_max_bytes,
+                disk_path=disk_path,
+                disk_max_entries=settings.retriever_cache_disk_max_entries,
+                disk_max_bytes=settings.retriever_cache_disk_max_bytes,
+            )
+        return _retriever_cache
@@ -6,15 +6,62 @@ Handles UnstructuredRetrieve and StructuredRetrieve node types.
 import os, ast
 import dspy
 
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 
+from dspy_forge.core.config import settings
 from dspy_forge.core.templates import NodeTemplate, CodeGenerationContext
+from dspy_forge.core.executors import get_executor, VECTOR_SEARCH_POOL, GENIE_POOL
+from dspy_forge.core.execution_context import get_current_context
+from dspy_forge.core.metrics import RETRIEVER_METRICS
+from dspy_forge.core.tracing import start_span
+from dspy_forge.components.retriever_cache import get_retriever_cache, make_cache_key
 from dspy.retrievers.databricks_rm import DatabricksRM
 from dspy_forge.components.genie.databricks_genie import DatabricksGenieRM
 
 class BaseRetrieverTemplate(NodeTemplate):
     """Base template for retriever nodes"""
 
+    # Thread pool that runs the blocking retriever client
+    executor_name: str = VECTOR_SEARCH_POOL
+
+    async def acall(self, **inputs) -> dspy.Prediction:
+        """Async call for playground - runs the blocking call() on the retriever's thread pool"""
+        return await get_executor(self.executor_name).run(self.call, **inputs)
+
+    def _cached_retrieve(self, source_id: str, query: str, query_type: Optional[str], k: Optional[int],
+                         retrieve: Callable[[], Dict[str, Any]]) -> dspy.Prediction:
+        """Run the retrieval through the result cache (if enabled) and record hit/miss counts on the trace"""
+        cache = get_retriever_cache()
+        if cache is None:
+            return dspy.Prediction(**self._tracked_retrieve(source_id, query, retrieve))
+
+        case_insensitive = self.node_data.get('retriever_type') in settings.retriever_cache_case_insensitive_types
+        key = make_cache_key(source_id, query, query_type, k, case_insensitive)
+        fields, lookup = cache.get(key)
+        if fields is None:
+            fields = self._tracked_retrieve(source_id, query, retrieve)
+            stored = cache.put(key, fields)
+            lookup = lookup._replace(evictions=lookup.evictions + stored.evictions)
+
+        context = get_current_context()
+        if context is not None:
+            context.record_cache_stats(self.node_id, lookup._asdict())
+
+        # Cached results may come from a differently formatted query, report the actual one
+        return dspy.Prediction(**{**fields, 'query': query})
+
+    def _tracked_retrieve(self, source_id: str, query: str, retrieve: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Call the retriever backend, recording it in the retriever metrics and as a span"""
+        retriever_type = self.node_data.get('retriever_type', '')
+        attributes = {
+            'retriever.type': retriever_type,
+            'retriever.source': source_id,
+            'retriever.query': query,
+            'node.id': self.node_id
+        }
+        with RETRIEVER_METRICS.track(retriever_type), start_span("retriever.call", attributes):
+            return retrieve()
+
     @staticmethod
     def _extract_query(inputs: Dict[str, Any]) -> str:
         """Extract query from inputs"""
@@ -50,6 +97,8 @@ class UnstructuredRetrieveTemplate(BaseRetrieverTemplate):
             raise ValueError("UnstructuredRetrieve requires catalog_name, schema_name, index_name, content_column, and id_column")
 
         databricks_index_name = f"{catalog_name}.{schema_name}.{index_name}"
+        self.index_name = databricks_index_name
+        self.num_results = num_results
 
         self.retriever = DatabricksRM(
             databricks_index_name=databricks_index_name,
@@ -63,6 +112,12 @@ class UnstructuredRetrieveTemplate(BaseRetrieverTemplate):
     def call(self, **inputs) -> dspy.Prediction:
         """Synchronous call for optimization"""
         query = self._extract_query(inputs)
+        return self._cached_retrieve(
+            self.index_name, query, self.query_type, self.num_results,
+            lambda: self._retrieve(query)
+        )
+
+    def _retrieve(self, query: str) -> Dict[str, Any]:
         result = self.retriever(query, query_type=self.query_type)
 
         # Extract passages
@@ -74,16 +129,12 @@ class UnstructuredRetrieveTemplate(BaseRetrieverTemplate):
         else:
             context_list = [str(passages)]
 
-        return dspy.Prediction(
+        return dict(
             context=context_list,
             passages=context_list,
             query=query
         )
 
-    async def acall(self, **inputs) -> dspy.Prediction:
-        """Async call for playground - retrievers are sync anyway"""
-        return self.call(**inputs)
-    
     def generate_code(self, context: CodeGenerationContext) -> Dict[str, Any]:
         """Generate code for UnstructuredRetrieve node"""
         query_type = self.node_data.get('query_type', '')
@@ -141,6 +192,8 @@ class UnstructuredRetrieveTemplate(BaseRetrieverTemplate):
 class StructuredRetrieveTemplate(BaseRetrieverTemplate):
     """Template for StructuredRetrieve nodes"""
 
+    executor_name = GENIE_POOL
+
     def initialize(self, context: Any):
         """Initialize StructuredRetrieve component with call/acall interface"""
         genie_space_id = self.node_data.get('genie_space_id', '')
@@ -148,6 +201,8 @@ class StructuredRetrieveTemplate(BaseRetrieverTemplate):
         if not genie_space_id:
             raise ValueError("StructuredRetrieve requires genie_space_id")
 
+        self.genie_space_id = genie_space_id
+
         # Initialize Genie retriever once
         self.retriever = DatabricksGenieRM(
             databricks_genie_space_id=genie_space_id,
@@ -158,6 +213,12 @@ class StructuredRetrieveTemplate(BaseRetrieverTemplate):
     def call(self, **inputs) -> dspy.Prediction:
         """Synchronous call for optimization"""
         query = self._extract_query(inputs)
+        return self._cached_retrieve(
+            self.genie_space_id, query, None, None,
+            lambda: self._retrieve(query)
+        )
+
+    def _retrieve(self, query: str) -> Dict[str, Any]:
         result = self.retriever(query)
 
         # Extract fields from the Prediction object
@@ -166,7 +227,7 @@ class StructuredRetrieveTemplate(BaseRetrieverTemplate):
         query_description = getattr(result, 'query_reasoning', '')
         conversation_id = getattr(result, 'conversation_id', '')
 
-        return dspy.Prediction(
+        return dict(
             context=context_list,
             sql_query=sql_query,
             query_description=query_description,
@@ -174,10 +235,6 @@ class StructuredRetrieveTemplate(BaseRetrieverTemplate):
             query=query
         )
 
-    async def acall(self, **inputs) -> dspy.Prediction:
-        """Async call for playground - Genie is sync anyway"""
-        return self.call(**inputs)
-    
     def generate_code(self, context: CodeGenerationContext) -> Dict[str, Any]:
         """Generate code for StructuredRetrieve node"""
         genie_space_id = self.node_data.get('genie_space_id', '')
@@ -2,7 +2,7 @@ import os
 import mlflow
 
 from pydantic_settings import BaseSettings
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 
 from databricks.sdk import WorkspaceClient
 from dspy_forge.core.logging import get_logger
@@ -55,6 +55,104 @@ class Settings(BaseSettings):
     databricks_token: Optional[str] = None
     databricks_warehouse_id: Optional[str] = None
 
+    # Program cache settings (initialized workflow programs reused across executions)
+    program_cache_max_size: int = 32
+    program_cache_ttl_seconds: int = 3600
+
+    # Workflow validation results (per node and per graph topology), as an LRU
+    # capped by the estimated memory of the cached errors
+    validation_cache_max_bytes: int = 8 * 1024 * 1024
+
+    # Batch execution settings
+    batch_default_concurrency: int = 4
+    batch_max_concurrency: int = 32
+
+    # Execution records: recent executions kept in memory, all finished ones
+    # appended to a segmented, indexed log on the storage backend. Indexes of
+    # closed segments are loaded on demand, at most this many at a time
+    execution_store_max_entries: int = 256
+    execution_store_ttl_seconds: int = 3600
+    execution_log_segment_max_records: int = 1000
+    execution_log_index_cache_segments: int = 8
+    execution_log_max_write_retries: int = 3
+
+    # Execution trace detail: "full" payloads, "truncated" to a byte cap per
+    # field, or "hashes" (sha256 and size of each field only)
+    trace_verbosity: Literal["full", "truncated", "hashes"] = "full"
+    trace_max_field_bytes: int = 2048
+
+    # Prometheus metrics served at /metrics
+    metrics_enabled: bool = True
+
+    # OpenTelemetry span tracing (opt-in). Spans go to a JSON lines file
+    # (artifacts_path/traces/spans.jsonl unless tracing_json_path is set) or to
+    # an OTLP/HTTP collector, which needs opentelemetry-exporter-otlp-proto-http
+    tracing_enabled: bool = False
+    tracing_exporter: Literal["json", "otlp"] = "json"
+    tracing_json_path: Optional[str] = None
+    tracing_otlp_endpoint: Optional[str] = None
+    tracing_service_name: str = "dspy-forge"
+
+    # On-demand profiling of single playground executions (X-Profile header).
+    # Artifacts are saved to profiles/<execution_id> on the storage backend
+    profiling_enabled: bool = False
+    profiling_sample_interval_seconds: float = 0.005
+    profiling_top_allocations: int = 50
+
+    # Share one in-flight run between concurrent identical executions
+    execution_coalescing_enabled: bool = True
+
+    # Thread pools for blocking retriever clients
+    vector_search_pool_max_workers: int = 8
+    genie_pool_max_workers: int = 4
+    default_pool_max_workers: int = 4
+
+    # Retriever result cache (opt-in), optionally persisted under artifacts_path
+    retriever_cache_enabled: bool = False
+    retriever_cache_ttl_seconds: int = 300
+    retriever_cache_max_entries: int = 1024
+    retriever_cache_max_bytes: int = 64 * 1024 * 1024
+    retriever_cache_disk_enabled: bool = False
+    retriever_cache_disk_max_entries: int = 16384
+    retriever_cache_disk_max_bytes: int = 256 * 1024 * 1024
+    # Retriever types (e.g. "UnstructuredRetrieve") whose cache keys ignore query case
+    retriever_cache_case_insensitive_types: List[str] = []
+
+    # Exact-match LM response cache (opt-in, on top of dspy.LM's own request
+    # cache), persisted under artifacts_path
+    lm_cache_enabled: bool = False
+    lm_cache_memory_max_entries: int = 2048
+    lm_cache_disk_enabled: bool = True
+    lm_cache_disk_max_bytes: int = 512 * 1024 * 1024
+
+    # Semantic cache of end-to-end answers (opt-in). The embedder is "hashing"
+    # (built-in, offline) or "package.module:factory"
+    semantic_cache_enabled: bool = False
+    semantic_cache_embedder: str = "hashing"
+    semantic_cache_embedding_dim: int = 512
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_max_entries: int = 256
+    semantic_cache_ttl_seconds: int = 3600
+
+    # Execution time limits in seconds (playground and batch runs). Nodes can
+    # override the node timeout with `timeout_seconds` in their data; None means
+    # no limit. A timed-out retriever call is abandoned, not stopped: it keeps
+    # its thread pool worker until the blocking client returns
+    execution_timeout_seconds: Optional[float] = None
+    node_timeout_seconds: Optional[float] = None
+
+    # LM rate limiting per provider/model (opt-in): RPM/TPM budgets (0 for none),
+    # AIMD concurrency bounds and retries of throttled calls. Overrides map
+    # "provider/model" to {"rpm": ..., "tpm": ..., "max_concurrency": ...}
+    lm_rate_limit_enabled: bool = False
+    lm_rate_limit_rpm: int = 0
+    lm_rate_limit_tpm: int = 0
+    lm_rate_limit_overrides: Dict[str, Dict[str, int]] = {}
+    lm_max_concurrency: int = 16
+    lm_min_concurrency: int = 1
+    lm_throttle_max_retries: int = 4
+    lm_throttle_backoff_seconds: float = 1.0
+
     # LM Provider settings (for non-Databricks models)
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
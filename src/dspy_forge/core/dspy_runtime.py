@@ -1,48 +1,150 @@
 
 import dspy
+import asyncio
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from dspy_forge.core.config import settings
 from dspy_forge.core.logging import get_logger
 from dspy_forge.core.lm_config import create_lm
-from dspy_forge.utils.workflow_utils import (
-    get_execution_order,
-    find_start_nodes,
-    find_end_nodes,
-    get_node_dependencies,
-    identify_router_nodes,
-    get_branch_paths,
-)
+from dspy_forge.core.lm_cache import lm_cache_scope
+from dspy_forge.core.metrics import NODE_METRICS
+from dspy_forge.core.tracing import start_span
+from dspy_forge.core.execution_plan import ExecutionPlan
+from dspy_forge.core.execution_context import ExecutionContext, get_current_context
 from dspy_forge.core.templates import TemplateFactory
-from dspy_forge.models.workflow import Workflow, WorkflowExecution
+from dspy_forge.models.workflow import Workflow, WorkflowExecution, NodeType
+from dspy_forge.services.validation_service import WorkflowValidationError
 from dspy_forge.components import registry  # This will auto-register all templates
 
 logger = get_logger(__name__)
 
+# Extra Prediction attributes copied for retrievers (and rationale for CoT)
+_RATIONALE_ATTR = 'rationale'
+_RETRIEVER_ATTRS = ('context', 'passages', 'query', 'sql_query', 'query_description', 'conversation_id')
+
+
+class NodeTimeoutError(TimeoutError):
+    """Raised when a node runs past its timeout or the execution deadline"""
+
+
+class _DagScheduler:
+    """
+    Tracks node readiness for a single aforward() run.
+
+    A node is ready once it is active and every predecessor has resolved, i.e.
+    either finished or will never run. Nodes outside router branches are active
+    from the start; branch nodes are activated (or skipped) when their router
+    finishes. Readiness is propagated incrementally from resolved nodes to their
+    successors, so each node and edge is visited a constant number of times.
+    """
+
+    def __init__(self, plan: ExecutionPlan):
+        self.plan = plan
+        self.activated = set(plan.initial_path)
+        self.skipped = set()
+        self.started = set()
+        self.resolved = set()
+        self.pending_predecessors = {
+            node_id: len(plan.predecessors.get(node_id, ())) for node_id in plan.execution_order
+        }
+        self._ready = []
+        for node_id in plan.initial_path:
+            self._check_ready(node_id)
+
+    def take_ready(self) -> List[str]:
+        """Return nodes that became ready since the last call, in execution order"""
+        ready, self._ready = self._ready, []
+        ready.sort(key=self.plan.order_index.__getitem__)
+        return ready
+
+    def complete(self, node_id: str, selected_branch: Optional[str] = None):
+        """Mark a started node as finished, applying router branch selection"""
+        if selected_branch:
+            branch_nodes = self.plan.router_branch_map[node_id].get(selected_branch, ())
+            self.skipped.update(self.plan.get_skipped_branch_nodes(node_id, selected_branch))
+            self.activated.update(branch_nodes)
+
+        # Resolve the node, then cascade to nodes that can no longer run
+        worklist = [node_id]
+        while worklist:
+            current = worklist.pop()
+            if current in self.resolved:
+                continue
+            self.resolved.add(current)
+
+            for successor in self.plan.successors.get(current, ()):
+                self.pending_predecessors[successor] -= 1
+                self._check_ready(successor)
+
+            for owned_id in self.plan.router_owned_nodes.get(current, ()):
+                if self._is_dead(owned_id):
+                    worklist.append(owned_id)
+                else:
+                    self._check_ready(owned_id)
+
+    def _is_dead(self, node_id: str) -> bool:
+        """A branch node is dead if it was skipped, or no router can activate it anymore"""
+        if node_id in self.resolved or node_id in self.started:
+            return False
+        if node_id in self.skipped:
+            return True
+        return node_id not in self.activated and all(
+            router_id in self.resolved for router_id in self.plan.branch_owners.get(node_id, ())
+        )
+
+    def _check_ready(self, node_id: str):
+        if (self.pending_predecessors.get(node_id) == 0
+                and node_id in self.activated and node_id not in self.skipped
+                and node_id not in self.started and node_id not in self.resolved):
+            self.started.add(node_id)
+            self._ready.append(node_id)
+
+
 class CompoundProgram(dspy.Module):
-    """Dynamic compound program that encapsulates the entire workflow"""
+    """
+    Dynamic compound program that encapsulates the entire workflow.
+
+    A program holds no per-request state: node outputs and the trace are written
+    to the ExecutionContext bound with bind_execution_context(), so one initialized
+    program can serve concurrent requests. The context passed to the constructor
+    is used when none is bound (e.g. when optimizers call the program directly).
+    """
 
-    def __init__(self, workflow: Workflow, context: Any):
+    def __init__(self, workflow: Workflow, context: Optional[ExecutionContext] = None):
         super().__init__()
         self.workflow = workflow
-        self.context = context
+        self._default_context = context
         self.components = {}
-        self.execution_order, _ = get_execution_order(workflow)
+        self.output_attrs: Dict[str, tuple] = {}
+        self.stream_fields: Dict[str, tuple] = {}
+        self.metric_labels: Dict[str, tuple] = {}  # Node ID -> (node_type, module_type)
 
-        # Identify router nodes and their branch paths
-        self.router_node_ids = identify_router_nodes(workflow)
-        self.router_branch_map = {}
-        for router_id in self.router_node_ids:
-            self.router_branch_map[router_id] = get_branch_paths(workflow, router_id)
+        # Index the workflow once; all per-request lookups go through the plan
+        self.plan = ExecutionPlan(workflow)
+        if not self.plan.is_acyclic:
+            raise WorkflowValidationError("Cannot determine execution order: workflow contains a cycle")
+
+        self.execution_order = list(self.plan.execution_order)
+        self.router_node_ids = list(self.plan.router_node_ids)
+        self.router_branch_map = self.plan.router_branch_map
 
         # Initialize all components
         self._initialize_components()
 
+    @property
+    def context(self) -> ExecutionContext:
+        """Execution context of the request currently running this program"""
+        context = get_current_context() or self._default_context
+        if context is None:
+            raise RuntimeError("No execution context bound for CompoundProgram")
+        return context
+
     def _initialize_components(self):
         """Initialize all workflow components as DSPy modules"""
         for node_id in self.execution_order:
-            node = next((n for n in self.workflow.nodes if n.id == node_id), None)
+            node = self.plan.get_node(node_id)
             if not node:
                 continue
 
@@ -51,86 +153,77 @@ class CompoundProgram(dspy.Module):
 
             # Initialize component if it has an initialize method
             if hasattr(template, 'initialize'):
-                component = template.initialize(self.context)
+                component = template.initialize(self._default_context)
                 if component:
                     self.components[node_id] = component
 
-    def forward(self, **inputs):
-        """
-        Synchronous execution for DSPy optimizers.
-        Uses component.call() methods directly.
-        """
-        # Build execution path considering routers
-        execution_path = self._build_execution_path()
-        processed_nodes = set()
-
-        i = 0
-        while i < len(execution_path):
-            node_id = execution_path[i]
+            self.output_attrs[node_id] = self._get_output_attrs(template)
+            self.metric_labels[node_id] = (
+                node.type.value,
+                node.data.get('module_type') or node.data.get('retriever_type') or node.data.get('logic_type') or ''
+            )
 
-            if node_id in processed_nodes:
-                i += 1
-                continue
+            if node.type == NodeType.MODULE:
+                stream_fields = self._get_stream_fields(node_id)
+                if stream_fields:
+                    self.stream_fields[node_id] = stream_fields
 
-            start_time = datetime.now()
-            node = next((n for n in self.workflow.nodes if n.id == node_id), None)
-            if not node:
-                i += 1
+    def _get_output_attrs(self, template: Any) -> tuple:
+        """
+        Get the Prediction attributes to copy into a node's outputs, in order:
+        the connected output fields, rationale, then the retriever extras.
+        """
+        inner_template = getattr(template, '_template', None)
+        if inner_template is None or not hasattr(inner_template, '_get_connected_fields'):
+            output_field_names = []
+        else:
+            output_field_names = inner_template._get_connected_fields(is_input=False)
+
+        attrs = list(output_field_names)
+        if _RATIONALE_ATTR not in attrs:
+            attrs.append(_RATIONALE_ATTR)
+        attrs.extend(attr for attr in _RETRIEVER_ATTRS if attr not in attrs)
+        return tuple(attrs)
+
+    def _get_stream_fields(self, node_id: str) -> tuple:
+        """
+        Get the output fields of a module that feed end nodes directly.
+        These are the fields whose tokens are streamed to playground clients.
+        """
+        fields = []
+        for edge in self.plan.get_outgoing_edges(node_id):
+            if edge.target not in self.plan.end_node_set:
                 continue
 
-            node_inputs = self._get_node_inputs(node_id, inputs)
+            if edge.is_field_level:
+                candidates = [edge.source_field]
+            else:
+                end_node = self.plan.get_node(edge.target)
+                candidates = [field.get('name') for field in end_node.data.get('fields', [])]
 
-            try:
-                # Check if this is a router node
-                if node_id in self.router_node_ids:
-                    # Execute router to determine branch
-                    if isinstance(self.components[node_id], dspy.primitives.module.Module):
-                        model_name = node.data.get('model', '')
-                        with dspy.context(lm=create_lm(model_name)):
-                            result = self.components[node_id](**node_inputs)
-                    else:
-                        result = self.components[node_id].call(**node_inputs)
-
-                    self._process_node_result(node_id, node, node_inputs, start_time, result)
-                    processed_nodes.add(node_id)
-
-                    # Get selected branch
-                    selected_branch = result.get('branch') if isinstance(result, dict) else getattr(result, 'branch', None)
-
-                    if selected_branch:
-                        # Get nodes in selected branch
-                        branch_nodes = self.router_branch_map[node_id].get(selected_branch, [])
-
-                        # Insert branch nodes into execution path after router
-                        for j, branch_node_id in enumerate(branch_nodes):
-                            execution_path.insert(i + 1 + j, branch_node_id)
-
-                        # Mark all other branch nodes as processed (skip them)
-                        # But don't mark nodes that also appear in the selected branch (merge points)
-                        selected_branch_nodes = set(branch_nodes)
-                        for branch_id, nodes in self.router_branch_map[node_id].items():
-                            if branch_id != selected_branch:
-                                for node_to_skip in nodes:
-                                    # Only mark as processed if NOT in selected branch
-                                    if node_to_skip not in selected_branch_nodes:
-                                        processed_nodes.add(node_to_skip)
-                else:
-                    # Regular node execution
-                    if isinstance(self.components[node_id], dspy.primitives.module.Module):
-                        model_name = node.data.get('model')
-                        with dspy.context(lm=create_lm(model_name)):
-                            result = self.components[node_id](**node_inputs)
-                    else:
-                        result = self.components[node_id].call(**node_inputs)
+            fields.extend(
+                name for name in candidates
+                if name and name in self.output_attrs[node_id] and name not in fields
+            )
+        return tuple(fields)
 
-                    self._process_node_result(node_id, node, node_inputs, start_time, result)
-                    processed_nodes.add(node_id)
+    def forward(self, **inputs):
+        """
+        Synchronous execution for DSPy optimizers.
+        Uses component.call() methods directly.
 
-            except Exception as e:
-                self._handle_node_error(node_id, node, node_inputs, start_time, e)
-                processed_nodes.add(node_id)
+        Nodes run one at a time, in the order aforward() would start them, so a
+        node only runs once all of its predecessors have settled.
+        """
+        scheduler = _DagScheduler(self.plan)
 
-            i += 1
+        ready = scheduler.take_ready()
+        while ready:
+            for node_id in ready:
+                node = self.plan.get_node(node_id)
+                selected_branch = self._run_node(node_id, node, inputs) if node else None
+                scheduler.complete(node_id, selected_branch)
+            ready = scheduler.take_ready()
 
         return self._get_final_outputs()
 
@@ -138,135 +231,193 @@ class CompoundProgram(dspy.Module):
         """
         Asynchronous execution for playground/real-time usage.
         Uses component.acall() methods.
-        """
-        # Build execution path considering routers
-        execution_path = self._build_execution_path()
-        processed_nodes = set()
 
-        i = 0
-        while i < len(execution_path):
-            node_id = execution_path[i]
-
-            if node_id in processed_nodes:
-                i += 1
-                continue
-
-            start_time = datetime.now()
-            node = next((n for n in self.workflow.nodes if n.id == node_id), None)
-            if not node:
-                i += 1
-                continue
+        Nodes are scheduled as a DAG rather than walked one at a time: every node
+        is launched as its own asyncio task as soon as all of its predecessors have
+        settled, so nodes without an edge between them run concurrently. Router
+        branches are activated/skipped when the router finishes, with the same
+        semantics as forward().
+        """
+        scheduler = _DagScheduler(self.plan)
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while True:
+                for node_id in scheduler.take_ready():
+                    task = asyncio.create_task(self._arun_node(node_id, inputs))
+                    running[task] = node_id
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    scheduler.complete(node_id, task.result())
+        finally:
+            # Don't leave orphaned node tasks behind if the execution is cancelled
+            for task in running:
+                task.cancel()
 
-            node_inputs = self._get_node_inputs(node_id, inputs)
+        return self._get_final_outputs()
 
-            try:
-                # Check if this is a router node
-                if node_id in self.router_node_ids:
-                    # Execute router to determine branch
-                    if isinstance(self.components[node_id], dspy.primitives.module.Module):
-                        model_name = node.data.get('model', '')
-                        with dspy.context(lm=create_lm(model_name)):
-                            result = await self.components[node_id].acall(**node_inputs)
-                    else:
-                        result = await self.components[node_id].acall(**node_inputs)
-
-                    self._process_node_result(node_id, node, node_inputs, start_time, result)
-                    processed_nodes.add(node_id)
-
-                    # Get selected branch
-                    selected_branch = result.get('branch') if isinstance(result, dict) else getattr(result, 'branch', None)
-
-                    if selected_branch:
-                        # Get nodes in selected branch
-                        branch_nodes = self.router_branch_map[node_id].get(selected_branch, [])
-
-                        # Insert branch nodes into execution path after router
-                        for j, branch_node_id in enumerate(branch_nodes):
-                            execution_path.insert(i + 1 + j, branch_node_id)
-
-                        # Mark all other branch nodes as processed (skip them)
-                        # But don't mark nodes that also appear in the selected branch (merge points)
-                        selected_branch_nodes = set(branch_nodes)
-                        for branch_id, nodes in self.router_branch_map[node_id].items():
-                            if branch_id != selected_branch:
-                                for node_to_skip in nodes:
-                                    # Only mark as processed if NOT in selected branch
-                                    if node_to_skip not in selected_branch_nodes:
-                                        processed_nodes.add(node_to_skip)
+    def _lm_cache_scope(self):
+        """Scope LM response caching to this workflow, honouring the run's bypass flag"""
+        return lm_cache_scope(self.plan.workflow_id, self.context.bypass_lm_cache)
+
+    def _run_node(self, node_id: str, node: Any, inputs: Dict[str, Any]) -> Optional[str]:
+        """Execute a single node synchronously. Returns the selected branch for router nodes."""
+        start_time = datetime.now()
+        node_inputs = self._get_node_inputs(node_id, inputs)
+        metric_labels = self.metric_labels[node_id]
+        metrics_started_at = NODE_METRICS.start(*metric_labels)
+        error = None
+
+        try:
+            component = self.components[node_id]
+            with start_span("node.call", self._span_attributes(node_id)):
+                if isinstance(component, dspy.primitives.module.Module):
+                    # Use model-specific context for DSPy modules
+                    model_name = node.data.get('model', '')
+                    with dspy.context(lm=create_lm(model_name)), self._lm_cache_scope():
+                        result = component(**node_inputs)
                 else:
-                    # Regular node execution
-                    if isinstance(self.components[node_id], dspy.primitives.module.Module):
-                        model_name = node.data.get('model', '')
-                        # Use model-specific context for DSPy modules
-                        with dspy.context(lm=create_lm(model_name)):
-                            result = await self.components[node_id].acall(**node_inputs)
-                    else:
-                        # Use default LM or no context
-                        result = await self.components[node_id].acall(**node_inputs)
-
-                    self._process_node_result(node_id, node, node_inputs, start_time, result)
-                    processed_nodes.add(node_id)
+                    result = component.call(**node_inputs)
+
+            self._process_node_result(node_id, node, node_inputs, start_time, result)
+        except Exception as e:
+            error = e
+            self._handle_node_error(node_id, node, node_inputs, start_time, e)
+            return None
+        finally:
+            NODE_METRICS.finish(metrics_started_at, *metric_labels, error=error)
+
+        if node_id in self.plan.router_branch_map:
+            return self._get_selected_branch(result)
+        return None
+
+    async def _arun_node(self, node_id: str, inputs: Dict[str, Any]) -> Optional[str]:
+        """Execute a single node asynchronously. Returns the selected branch for router nodes."""
+        node = self.plan.get_node(node_id)
+        if not node:
+            return None
+
+        start_time = datetime.now()
+        node_inputs = self._get_node_inputs(node_id, inputs)
+        metric_labels = self.metric_labels[node_id]
+        metrics_started_at = NODE_METRICS.start(*metric_labels)
+        error = None
+
+        try:
+            timeout, limited_by_deadline = self._get_node_timeout(node)
+            if timeout is not None and timeout <= 0:
+                raise NodeTimeoutError(f"Node {node_id} cancelled: execution deadline exceeded")
 
-            except Exception as e:
-                self._handle_node_error(node_id, node, node_inputs, start_time, e)
-                processed_nodes.add(node_id)
+            try:
+                with start_span("node.acall", self._span_attributes(node_id)):
+                    result = await asyncio.wait_for(self._acall_component(node_id, node, node_inputs), timeout)
+            except asyncio.TimeoutError:
+                if limited_by_deadline:
+                    raise NodeTimeoutError(f"Node {node_id} cancelled: execution deadline exceeded")
+                raise NodeTimeoutError(f"Node {node_id} timed out after {timeout:g}s")
+
+            self._process_node_result(node_id, node, node_inputs, start_time, result)
+        except Exception as e:
+            error = e
+            self._handle_node_error(node_id, node, node_inputs, start_time, e)
+            return None
+        finally:
+            NODE_METRICS.finish(metrics_started_at, *metric_labels, error=error)
+
+        if node_id in self.plan.router_branch_map:
+            return self._get_selected_branch(result)
+        return None
+
+    def _span_attributes(self, node_id: str) -> Dict[str, Any]:
+        node_type, module_type = self.metric_labels[node_id]
+        return {
+            'workflow.id': self.plan.workflow_id,
+            'node.id': node_id,
+            'node.type': node_type,
+            'node.module_type': module_type
+        }
+
+    async def _acall_component(self, node_id: str, node: Any, node_inputs: Dict[str, Any]) -> Any:
+        """Call a node's component asynchronously"""
+        component = self.components[node_id]
+        if isinstance(component, dspy.primitives.module.Module):
+            # Each node runs in its own task, so this LM override is scoped to
+            # this node and can't leak into nodes running concurrently
+            model_name = node.data.get('model', '')
+            with dspy.context(lm=create_lm(model_name)), self._lm_cache_scope():
+                if node_id in self.stream_fields and self.context.event_queue is not None:
+                    return await self._astream_module(node_id, component, node_inputs)
+                return await component.acall(**node_inputs)
+
+        # Use default LM or no context
+        return await component.acall(**node_inputs)
+
+    def _get_node_timeout(self, node: Any) -> tuple[Optional[float], bool]:
+        """
+        Get the time a node may run for: its `timeout_seconds` (or the default node
+        timeout), capped by the time left before the execution deadline.
+        Returns the timeout (None for no limit) and whether the deadline is the limit.
 
-            i += 1
+        A timeout cancels the node's task. Retrievers running on the executors
+        pools aren't interrupted by that, see InstrumentedExecutor.run.
+        """
+        node_timeout = node.data.get('timeout_seconds') or settings.node_timeout_seconds
+        remaining = self.context.remaining_time()
 
-        return self._get_final_outputs()
+        if remaining is not None and (node_timeout is None or remaining < float(node_timeout)):
+            return remaining, True
+        return (float(node_timeout) if node_timeout is not None else None), False
 
-    def _build_execution_path(self) -> List[str]:
+    async def _astream_module(self, node_id: str, component: dspy.Module, node_inputs: Dict[str, Any]) -> Any:
         """
-        Build initial execution path, excluding nodes that are inside router branches.
-        Branch nodes will be added dynamically when routers are executed.
+        Run a module feeding an end node with DSPy streaming, publishing a `token`
+        event per chunk of its end-node fields. Returns the final Prediction.
         """
-        # Get all nodes that are in any branch
-        all_branch_nodes = set()
-        for router_id in self.router_node_ids:
-            for branch_id, branch_nodes in self.router_branch_map[router_id].items():
-                all_branch_nodes.update(branch_nodes)
-
-        # Build execution path excluding branch nodes
-        execution_path = []
-        for node_id in self.execution_order:
-            if node_id not in all_branch_nodes:
-                execution_path.append(node_id)
-
-        return execution_path
+        # Listeners buffer per call, so each execution gets its own
+        listeners = [dspy.streaming.StreamListener(signature_field_name=field)
+                     for field in self.stream_fields[node_id]]
+        stream = dspy.streamify(component, stream_listeners=listeners, is_async_program=True)
+
+        result = None
+        async for value in stream(**node_inputs):
+            if isinstance(value, dspy.streaming.StreamResponse):
+                self.context.emit_event('token', {
+                    'node_id': node_id,
+                    'field': value.signature_field_name,
+                    'chunk': value.chunk
+                })
+            elif isinstance(value, dspy.Prediction):
+                result = value
+        return result
+
+    def _get_selected_branch(self, result: Any) -> Optional[str]:
+        """Get the branch selected by a router node result"""
+        return result.get('branch') if isinstance(result, dict) else getattr(result, 'branch', None)
 
     def _get_node_inputs(self, node_id: str, initial_inputs: Dict[str, Any]) -> Dict[str, Any]:
         """Get inputs for a node from its dependencies"""
-        dependencies = get_node_dependencies(self.workflow, node_id)
-
         # Check if this is a start node
-        start_nodes = find_start_nodes(self.workflow)
-        if node_id in start_nodes:
+        if node_id in self.plan.start_node_set:
             return initial_inputs
 
         # Get inputs from previous node outputs
         inputs = {}
-        incoming_edges = [edge for edge in self.workflow.edges if edge.target == node_id]
-
-        for edge in incoming_edges:
+        for edge in self.plan.get_incoming_edges(node_id):
             source_outputs = self.context.get_node_output(edge.source)
 
-            if edge.sourceHandle and edge.targetHandle:
+            if edge.is_field_level:
                 # Field-level connection
-                source_field = edge.sourceHandle.replace('source-', '')
-                target_field = edge.targetHandle.replace('target-', '')
-
-                if source_field in source_outputs:
-                    inputs[target_field] = source_outputs[source_field]
+                if edge.source_field in source_outputs:
+                    inputs[edge.target_field] = source_outputs[edge.source_field]
             else:
                 # Whole-node connection
                 inputs.update(source_outputs)
 
-        # Fallback to legacy behavior
-        if not incoming_edges:
-            for dep_node_id in dependencies:
-                dep_outputs = self.context.get_node_output(dep_node_id)
-                inputs.update(dep_outputs)
-
         return inputs
 
     def _process_node_result(self, node_id: str, node: Any, node_inputs: Dict[str, Any],
@@ -275,24 +426,38 @@ class CompoundProgram(dspy.Module):
         outputs = self._extract_outputs_from_call(result, node)
         self.context.set_node_output(node_id, outputs)
         execution_time = (datetime.now() - start_time).total_seconds()
-        self.context.add_trace_entry(node_id, node.type.value, node_inputs, outputs, execution_time)
+        self.context.add_trace_entry(node_id, node.type.value, node_inputs, execution_time)
+        self._emit_node_event(node_id, node, 'completed', outputs, execution_time)
         return outputs
 
     def _handle_node_error(self, node_id: str, node: Any, node_inputs: Dict[str, Any],
                           start_time: datetime, error: Exception) -> Dict[str, Any]:
         """Handle error during node execution (common logic for forward/aforward)"""
-        logger.error(f"Error executing node {node_id}: {error}", exc_info=True)
+        # Timeouts are expected outcomes, their traceback adds nothing
+        logger.error(f"Error executing node {node_id}: {error}", exc_info=not isinstance(error, NodeTimeoutError))
         outputs = {'error': str(error)}
         self.context.set_node_output(node_id, outputs)
         execution_time = (datetime.now() - start_time).total_seconds()
-        self.context.add_trace_entry(node_id, node.type.value, node_inputs, outputs, execution_time)
+        self.context.add_trace_entry(node_id, node.type.value, node_inputs, execution_time)
+        self._emit_node_event(node_id, node, 'failed', outputs, execution_time)
         return outputs
 
+    def _emit_node_event(self, node_id: str, node: Any, status: str,
+                         outputs: Dict[str, Any], execution_time: float):
+        """Publish a node completion event for streaming clients"""
+        self.context.emit_event('node', {
+            'node_id': node_id,
+            'node_type': node.type.value,
+            'status': status,
+            'outputs': outputs,
+            'execution_time': execution_time,
+            'timestamp': datetime.now().isoformat()
+        })
+
     def _get_final_outputs(self) -> dspy.Prediction:
         """Extract final outputs from end nodes (common logic for forward/aforward)"""
-        end_nodes = find_end_nodes(self.workflow)
         final_outputs = {}
-        for end_node_id in end_nodes:
+        for end_node_id in self.plan.end_nodes:
             final_outputs.update(self.context.get_node_output(end_node_id))
         return dspy.Prediction(**final_outputs)
 
@@ -305,29 +470,11 @@ class CompoundProgram(dspy.Module):
         if isinstance(result, dict):
             return result
 
-        # If result is a DSPy Prediction, extract all fields
+        # If result is a DSPy Prediction, copy the node's precomputed output attributes.
+        # Membership checks avoid an AttributeError round trip for every attribute
+        # the result doesn't have.
         if isinstance(result, dspy.Prediction):
-            outputs = {}
-
-            # Get expected output fields from workflow
-            template = TemplateFactory.create_template(node, self.workflow)
-            output_field_names = template._template._get_connected_fields(is_input=False)
-
-            # Extract expected fields
-            for field_name in output_field_names:
-                if hasattr(result, field_name):
-                    outputs[field_name] = getattr(result, field_name)
-
-            # Also extract special fields (rationale for CoT, etc.)
-            if hasattr(result, 'rationale'):
-                outputs['rationale'] = result.rationale
-
-            # For retrievers, extract additional fields
-            for attr in ['context', 'passages', 'query', 'sql_query', 'query_description', 'conversation_id']:
-                if hasattr(result, attr) and attr not in outputs:
-                    outputs[attr] = getattr(result, attr)
-
-            return outputs
+            return {attr: result[attr] for attr in self.output_attrs[node.id] if attr in result}
 
         # Fallback: convert to dict
-        return {'result': str(result)}
\ No newline at end of file
+        return {'result': str(result)}
@@ -0,0 +1,169 @@
+import time
+import json
+import asyncio
+import hashlib
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator
+
+from dspy_forge.core.config import settings
+from dspy_forge.models.workflow import Workflow
+
+TRACE_VERBOSITY_LEVELS = ("full", "truncated", "hashes")
+
+
+def _encode_field(value: Any) -> bytes:
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return json.dumps(value, default=str, ensure_ascii=False).encode('utf-8')
+
+
+def compact_field(value: Any, verbosity: str, max_bytes: int) -> Any:
+    """
+    Reduce one payload field to the given trace verbosity. Truncated fields
+    keep a UTF-8 preview of at most `max_bytes`, hashed fields only their
+    sha256 and size in bytes.
+    """
+    if verbosity == "full":
+        return value
+
+    encoded = _encode_field(value)
+    if verbosity == "truncated" and len(encoded) <= max_bytes:
+        return value
+
+    compacted = {'sha256': hashlib.sha256(encoded).hexdigest(), 'size': len(encoded)}
+    if verbosity == "truncated":
+        compacted['preview'] = encoded[:max_bytes].decode('utf-8', errors='ignore')
+    return compacted
+
+
+def compact_payload(payload: Dict[str, Any], verbosity: str, max_bytes: int) -> Dict[str, Any]:
+    """Reduce each field of a node's inputs or outputs to the given trace verbosity"""
+    if verbosity == "full" or not isinstance(payload, dict):
+        return payload
+    return {key: compact_field(value, verbosity, max_bytes) for key, value in payload.items()}
+
+
+class TraceEntry:
+    """
+    One node run in an execution trace. The node's outputs are not kept here,
+    they are in the context's node_outputs under the same node ID.
+    """
+    __slots__ = ('node_id', 'node_type', 'inputs', 'execution_time', 'timestamp', 'cache')
+
+    def __init__(self, node_id: str, node_type: str, inputs: Dict[str, Any], execution_time: float,
+                 timestamp: str, cache: Optional[Dict[str, int]] = None):
+        self.node_id = node_id
+        self.node_type = node_type
+        self.inputs = inputs
+        self.execution_time = execution_time
+        self.timestamp = timestamp
+        self.cache = cache
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            'node_id': self.node_id,
+            'node_type': self.node_type,
+            'inputs': self.inputs,
+            'execution_time': self.execution_time,
+            'timestamp': self.timestamp
+        }
+        if self.cache is not None:
+            entry['cache'] = self.cache
+        return entry
+
+
+class ExecutionContext:
+    """Context for workflow execution"""
+    def __init__(self, workflow: Workflow, input_data: Dict[str, Any],
+                 event_queue: Optional[asyncio.Queue] = None, bypass_lm_cache: bool = False,
+                 timeout_seconds: Optional[float] = None, trace_verbosity: Optional[str] = None):
+        self.workflow = workflow
+        self.input_data = input_data
+        self.event_queue = event_queue  # Receives progress events for streaming clients
+        self.bypass_lm_cache = bypass_lm_cache  # Send every LM call to the provider (non-deterministic runs)
+        # Monotonic time by which the whole run must finish, None for no limit
+        self.deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+        self.node_outputs: Dict[str, Dict[str, Any]] = {}
+        self.execution_trace: List[TraceEntry] = []
+        self.trace_verbosity = trace_verbosity or settings.trace_verbosity
+        if self.trace_verbosity not in TRACE_VERBOSITY_LEVELS:
+            raise ValueError(f"Unknown trace verbosity '{self.trace_verbosity}'")
+        self.models: Dict[str, Any] = {}
+        self.node_counts: Dict[str, int] = {}  # Track count of each module type
+        self.cache_stats: Dict[str, Dict[str, int]] = {}  # Per-node cache hits/misses/evictions
+        
+    def remaining_time(self) -> Optional[float]:
+        """Get the seconds left before the execution deadline, or None if there is no deadline"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
+    def set_node_output(self, node_id: str, output: Dict[str, Any]):
+        """Set output for a node"""
+        self.node_outputs[node_id] = output
+        
+    def get_node_output(self, node_id: str) -> Dict[str, Any]:
+        """Get output from a node"""
+        return self.node_outputs.get(node_id, {})
+        
+    def has_node_errors(self) -> bool:
+        """Check whether any node failed or timed out (its output is then an `error` entry)"""
+        return any('error' in outputs for outputs in self.node_outputs.values())
+
+    def record_cache_stats(self, node_id: str, stats: Dict[str, int]):
+        """Accumulate cache hit/miss/eviction counts for a node"""
+        node_stats = self.cache_stats.setdefault(node_id, {})
+        for name, count in stats.items():
+            node_stats[name] = node_stats.get(name, 0) + count
+
+    def add_trace_entry(self, node_id: str, node_type: str, inputs: Dict[str, Any], execution_time: float):
+        """Add entry to execution trace. The node's outputs stay in node_outputs only."""
+        cache = dict(self.cache_stats[node_id]) if node_id in self.cache_stats else None
+        self.execution_trace.append(TraceEntry(
+            node_id,
+            node_type,
+            compact_payload(inputs, self.trace_verbosity, settings.trace_max_field_bytes),
+            execution_time,
+            datetime.now().isoformat(),
+            cache
+        ))
+
+    def serialize_trace(self) -> List[Dict[str, Any]]:
+        """Get the execution trace as a list of dicts"""
+        return [entry.to_dict() for entry in self.execution_trace]
+
+    def serialize_node_outputs(self) -> Dict[str, Dict[str, Any]]:
+        """Get the outputs of every node, reduced to the trace verbosity"""
+        return {
+            node_id: compact_payload(outputs, self.trace_verbosity, settings.trace_max_field_bytes)
+            for node_id, outputs in self.node_outputs.items()
+        }
+
+    def emit_event(self, event: str, data: Dict[str, Any]):
+        """Publish a progress event to the streaming client, if any"""
+        if self.event_queue is not None:
+            self.event_queue.put_nowait({'event': event, 'data': data})
+
+
+# The context of the request currently being executed. Programs are shared
+# between requests, so per-request state is looked up here instead of being
+# stored on the program. asyncio tasks inherit the value from their parent.
+_current_context: ContextVar[Optional[ExecutionContext]] = ContextVar("execution_context", default=None)
+
+
+def get_current_context() -> Optional[ExecutionContext]:
+    """Get the execution context bound to the current task, if any"""
+    return _current_context.get()
+
+
+@contextmanager
+def bind_execution_context(context: ExecutionContext) -> Iterator[ExecutionContext]:
+    """Bind an execution context for the duration of a program call"""
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
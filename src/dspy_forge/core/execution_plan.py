@@ -0,0 +1,176 @@
+"""
+Precompiled execution plan for workflows.
+
+An ExecutionPlan is built once per workflow and gives O(1) access to nodes,
+incoming/outgoing edges, start/end nodes and router branches, so that runtime,
+validation and compilation don't have to rescan the node and edge lists for
+every lookup.
+"""
+import networkx as nx
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from dspy_forge.models.workflow import Workflow, NodeType
+
+
+class EdgeBinding(NamedTuple):
+    """An edge with its connection handles pre-parsed into field names"""
+    source: str
+    target: str
+    source_field: Optional[str]  # None for whole-node connections
+    target_field: Optional[str]
+    source_handle: Optional[str]
+    target_handle: Optional[str]
+
+    @property
+    def is_field_level(self) -> bool:
+        return self.source_field is not None and self.target_field is not None
+
+
+def _freeze_lists(mapping: Dict[str, List]) -> Mapping[str, Tuple]:
+    return MappingProxyType({key: tuple(values) for key, values in mapping.items()})
+
+
+class ExecutionPlan:
+    """Immutable, indexed view of a workflow's structure"""
+
+    def __init__(self, workflow: Workflow):
+        self.workflow_id = workflow.id
+
+        # Node index (for duplicate IDs the first node wins, as in WorkflowAdjacency and the
+        # workflow_utils lookups, so the runtime and branch analysis resolve an ID to the same node)
+        self.node_ids: Tuple[str, ...] = tuple(node.id for node in workflow.nodes)
+        nodes: Dict[str, Any] = {}
+        for node in workflow.nodes:
+            nodes.setdefault(node.id, node)
+        self.nodes: Mapping[str, Any] = MappingProxyType(nodes)
+
+        # Edge indexes
+        incoming: Dict[str, List[EdgeBinding]] = {}
+        outgoing: Dict[str, List[EdgeBinding]] = {}
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.node_ids)
+
+        for edge in workflow.edges:
+            binding = EdgeBinding(
+                source=edge.source,
+                target=edge.target,
+                source_field=edge.sourceHandle.replace('source-', '') if edge.sourceHandle and edge.targetHandle else None,
+                target_field=edge.targetHandle.replace('target-', '') if edge.sourceHandle and edge.targetHandle else None,
+                source_handle=edge.sourceHandle,
+                target_handle=edge.targetHandle,
+            )
+            incoming.setdefault(edge.target, []).append(binding)
+            outgoing.setdefault(edge.source, []).append(binding)
+            graph.add_edge(edge.source, edge.target)
+
+        self.incoming_edges: Mapping[str, Tuple[EdgeBinding, ...]] = _freeze_lists(incoming)
+        self.outgoing_edges: Mapping[str, Tuple[EdgeBinding, ...]] = _freeze_lists(outgoing)
+        self.graph: nx.DiGraph = nx.freeze(graph)
+        self.predecessors: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {node_id: tuple(graph.predecessors(node_id)) for node_id in graph.nodes}
+        )
+        self.successors: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            {node_id: tuple(graph.successors(node_id)) for node_id in graph.nodes}
+        )
+
+        # Topological order (empty if the workflow contains a cycle)
+        self.is_acyclic = nx.is_directed_acyclic_graph(graph)
+        self.execution_order: Tuple[str, ...] = tuple(nx.topological_sort(graph)) if self.is_acyclic else ()
+        self.order_index: Mapping[str, int] = MappingProxyType(
+            {node_id: i for i, node_id in enumerate(self.execution_order)}
+        )
+
+        # Start / end nodes
+        self.start_nodes: Tuple[str, ...] = tuple(
+            node.id for node in workflow.nodes
+            if node.type == NodeType.SIGNATURE_FIELD and
+            (node.data.get('is_start', False) or node.data.get('isStart', False))
+        )
+        self.end_nodes: Tuple[str, ...] = tuple(
+            node.id for node in workflow.nodes
+            if node.type == NodeType.SIGNATURE_FIELD and
+            (node.data.get('is_end', False) or node.data.get('isEnd', False))
+        )
+        self.start_node_set = frozenset(self.start_nodes)
+        self.end_node_set = frozenset(self.end_nodes)
+
+        # Router branch maps
+        self.router_node_ids: Tuple[str, ...] = tuple(
+            node.id for node in workflow.nodes
+            if node.type == NodeType.LOGIC and node.data.get('logic_type') == 'Router'
+        )
+        self.router_branch_map: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({})
+        self.branch_owners: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+        self.router_owned_nodes: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+        self.branch_node_ids = frozenset()
+        if self.router_node_ids and self.is_acyclic:
+            self._build_branch_maps(workflow)
+
+        # Initial execution path: everything outside router branches, branch nodes
+        # are added when their router selects them
+        self.initial_path: Tuple[str, ...] = tuple(
+            node_id for node_id in self.execution_order if node_id not in self.branch_node_ids
+        )
+
+    def _build_branch_maps(self, workflow: Workflow):
+        """Resolve router branch paths and the reverse node -> router index"""
+        # Imported here as workflow_utils depends on the validation service, which uses plans
+        from dspy_forge.utils.workflow_utils import WorkflowAdjacency, get_branch_paths
+
+        adjacency = WorkflowAdjacency(workflow)
+        branch_map = {}
+        owners: Dict[str, List[str]] = {}
+        owned: Dict[str, List[str]] = {}
+        for router_id in self.router_node_ids:
+            branch_paths = get_branch_paths(workflow, router_id, adjacency)
+            branch_map[router_id] = MappingProxyType(
+                {branch_id: tuple(nodes) for branch_id, nodes in branch_paths.items()}
+            )
+
+            router_nodes = owned.setdefault(router_id, [])
+            for branch_nodes in branch_paths.values():
+                for node_id in branch_nodes:
+                    node_owners = owners.setdefault(node_id, [])
+                    if router_id not in node_owners:
+                        node_owners.append(router_id)
+                        router_nodes.append(node_id)
+
+        self.router_branch_map = MappingProxyType(branch_map)
+        self.branch_owners = _freeze_lists(owners)
+        self.router_owned_nodes = _freeze_lists(owned)
+        self.branch_node_ids = frozenset(owners)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Plans are immutable, so copies of a program (e.g. by optimizers) can share them
+        return self
+
+    def get_node(self, node_id: str) -> Optional[Any]:
+        """Get a node by ID"""
+        return self.nodes.get(node_id)
+
+    def get_incoming_edges(self, node_id: str) -> Tuple[EdgeBinding, ...]:
+        """Get edges whose target is the given node"""
+        return self.incoming_edges.get(node_id, ())
+
+    def get_outgoing_edges(self, node_id: str) -> Tuple[EdgeBinding, ...]:
+        """Get edges whose source is the given node"""
+        return self.outgoing_edges.get(node_id, ())
+
+    def get_skipped_branch_nodes(self, router_id: str, selected_branch: str) -> frozenset:
+        """
+        Get nodes in the non-selected branches of a router.
+        Nodes that also appear in the selected branch (merge points) are not skipped.
+        """
+        branch_map = self.router_branch_map.get(router_id, {})
+        selected_branch_nodes = set(branch_map.get(selected_branch, ()))
+
+        skipped = set()
+        for branch_id, nodes in branch_map.items():
+            if branch_id != selected_branch:
+                skipped.update(n for n in nodes if n not in selected_branch_nodes)
+        return frozenset(skipped)
@@ -0,0 +1,132 @@
+"""
+Bounded, named thread pools for blocking work.
+
+Blocking clients (Databricks Vector Search, Genie) are run on dedicated pools
+so they never block the event loop, and so one slow backend can only exhaust
+its own pool. Each pool tracks its queue depth and latency.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Pool names
+VECTOR_SEARCH_POOL = "vector-search"
+GENIE_POOL = "genie"
+
+
+class InstrumentedExecutor:
+    """Thread pool that records queue depth, active workers and latency"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"dspy-forge-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.max_run_seconds = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable on the pool without blocking the event loop.
+
+        Cancelling the caller (e.g. a node timeout) drops a call that is still
+        queued, but can't interrupt one that is running: it keeps its worker
+        until the blocking client returns, and its result is discarded.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        submitted_at = time.perf_counter()
+
+        with self._lock:
+            self.queued += 1
+            self.submitted += 1
+
+        def run_instrumented():
+            started_at = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                wait = started_at - submitted_at
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+            succeeded = False
+            try:
+                result = context.run(functools.partial(fn, *args, **kwargs))
+                succeeded = True
+                return result
+            finally:
+                elapsed = time.perf_counter() - started_at
+                with self._lock:
+                    self.active -= 1
+                    self.total_run_seconds += elapsed
+                    self.max_run_seconds = max(self.max_run_seconds, elapsed)
+                    if succeeded:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+
+        return await loop.run_in_executor(self._executor, run_instrumented)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool metrics"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_wait_seconds": self.total_wait_seconds / finished if finished else 0.0,
+                "avg_run_seconds": self.total_run_seconds / finished if finished else 0.0,
+                "max_wait_seconds": self.max_wait_seconds,
+                "max_run_seconds": self.max_run_seconds,
+            }
+
+
+_POOL_SIZES = {
+    VECTOR_SEARCH_POOL: lambda: settings.vector_search_pool_max_workers,
+    GENIE_POOL: lambda: settings.genie_pool_max_workers,
+}
+
+_executors: Dict[str, InstrumentedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> InstrumentedExecutor:
+    """Get (creating on first use) the named pool"""
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            max_workers = _POOL_SIZES[name]() if name in _POOL_SIZES else settings.default_pool_max_workers
+            executor = InstrumentedExecutor(name, max_workers)
+            _executors[name] = executor
+            logger.debug(f"Created thread pool '{name}' with {max_workers} workers")
+        return executor
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for all pools created so far"""
+    with _executors_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.stats() for executor in executors}
+
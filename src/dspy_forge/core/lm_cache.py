@@ -0,0 +1,350 @@
+"""
+Exact-match LM response cache.
+
+Caches LM outputs keyed by the model, the full formatted prompt/messages and the
+sampling parameters. Entries live in an in-memory LRU front and a SQLite store
+under artifacts_path that is shared by playground, batch and optimization runs
+and survives restarts. Entries are namespaced per workflow, and the disk store
+evicts least recently used entries when it grows past its size limit.
+
+The cache is opt-in (lm_cache_enabled), as dspy.LM keeps its own request cache.
+Calls in a bypass scope skip both caches. On async calls, disk reads and writes
+run in a worker thread, and access times of disk hits are recorded in batches.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import dspy
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+from dspy_forge.core.rate_limiter import RateLimitedLM
+
+logger = get_logger(__name__)
+
+DEFAULT_NAMESPACE = "default"
+
+# Request arguments that don't change the response
+_IGNORED_KWARGS = ("api_key", "api_base", "base_url", "cache")
+
+# Disk hits whose access times are buffered before they are written in one batch
+_ACCESS_FLUSH_SIZE = 256
+
+
+class CacheScope(NamedTuple):
+    namespace: str
+    bypass: bool
+
+
+_cache_scope: ContextVar[Optional[CacheScope]] = ContextVar("lm_cache_scope", default=None)
+
+
+@contextmanager
+def lm_cache_scope(namespace: Optional[str], bypass: bool = False) -> Iterator[CacheScope]:
+    """Set the cache namespace (usually the workflow ID) and bypass flag for LM calls in this block"""
+    scope = CacheScope(namespace or DEFAULT_NAMESPACE, bypass)
+    token = _cache_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _cache_scope.reset(token)
+
+
+def make_cache_key(namespace: str, model: str, model_type: str, prompt: Any, messages: Any,
+                   request_kwargs: Dict[str, Any]) -> str:
+    """Build a cache key from the namespace, model, formatted prompt/messages and sampling params"""
+    params = {k: v for k, v in request_kwargs.items() if k not in _IGNORED_KWARGS}
+    content = json.dumps(
+        [namespace, model, model_type, prompt, messages, params],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class LMResponseCache:
+    """Memory LRU in front of an optional size-bounded SQLite store"""
+
+    def __init__(self, max_memory_entries: int, db_path: Optional[str] = None, max_disk_bytes: int = 0):
+        self.max_memory_entries = max_memory_entries
+        self.db_path = db_path
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()  # key -> (namespace, value)
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self._pending_access: Dict[str, float] = {}  # key -> access time not yet written to disk
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.db_path:
+            self._open_db()
+
+    def _open_db(self):
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, namespace TEXT NOT NULL, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_namespace ON responses (namespace)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"LM response cache store unavailable at {self.db_path}, using memory only: {e}")
+            self._db = None
+
+    @property
+    def disk_enabled(self) -> bool:
+        return self._db is not None
+
+    def get(self, key: str) -> Optional[Any]:
+        """Look up cached outputs in memory, then on disk"""
+        outputs = self.get_memory(key)
+        if outputs is None:
+            outputs = self.get_disk(key)
+        return outputs
+
+    def get_memory(self, key: str, count_miss: bool = False) -> Optional[Any]:
+        """Look up cached outputs in memory only. Misses are counted only with `count_miss`."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[1])
+            if count_miss:
+                self.misses += 1
+            return None
+
+    def get_disk(self, key: str) -> Optional[Any]:
+        """Look up cached outputs on disk, promoting hits to memory. Blocks on SQLite."""
+        with self._lock:
+            if self._db is not None:
+                try:
+                    row = self._db.execute("SELECT namespace, value FROM responses WHERE key = ?", (key,)).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"LM response cache read failed: {e}")
+                    row = None
+
+                if row is not None:
+                    self._record_access(key)
+                    self._put_memory(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return json.loads(row[1])
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, namespace: str, outputs: Any):
+        """Store outputs. Outputs that can't be serialized to JSON are not cached."""
+        try:
+            value = json.dumps(outputs)
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            self._put_memory(key, namespace, value)
+            if self._db is None:
+                return
+
+            size = len(value)
+            try:
+                self._pending_access.pop(key, None)
+                row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, namespace, value, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, namespace, value, size, time.time())
+                )
+                self._disk_bytes += size - (row[0] if row else 0)
+                self._evict_disk()
+            except sqlite3.Error as e:
+                logger.warning(f"LM response cache write failed: {e}")
+
+    def _put_memory(self, key: str, namespace: str, value: str):
+        self._memory[key] = (namespace, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _record_access(self, key: str):
+        """Buffer the access time of a disk hit, writing the buffer once it is full. Needs _lock."""
+        self._pending_access[key] = time.time()
+        if len(self._pending_access) >= _ACCESS_FLUSH_SIZE:
+            self._flush_access()
+
+    def _flush_access(self):
+        """Write buffered access times in one statement. Needs _lock."""
+        if not self._pending_access or self._db is None:
+            return
+        pending = [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+        self._pending_access.clear()
+        try:
+            self._db.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?", pending)
+        except sqlite3.Error as e:
+            logger.warning(f"LM response cache access time update failed: {e}")
+
+    def _evict_disk(self):
+        """Delete least recently used rows until the store is within its size limit"""
+        if self._disk_bytes > self.max_disk_bytes:
+            # Eviction order has to reflect recent hits
+            self._flush_access()
+        while self._disk_bytes > self.max_disk_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                return
+
+            for key, size in rows:
+                if self._disk_bytes <= self.max_disk_bytes:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self.evictions += 1
+
+    def clear(self, namespace: Optional[str] = None):
+        """Drop cached entries for a namespace, or all entries if no namespace is given"""
+        with self._lock:
+            self._flush_access()
+            if namespace is None:
+                self._memory.clear()
+            else:
+                for key in [k for k, (ns, _) in self._memory.items() if ns == namespace]:
+                    del self._memory[key]
+            if self._db is None:
+                return
+
+            try:
+                if namespace is None:
+                    self._db.execute("DELETE FROM responses")
+                else:
+                    self._db.execute("DELETE FROM responses WHERE namespace = ?", (namespace,))
+                self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"LM response cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "max_memory_entries": self.max_memory_entries,
+                "disk_enabled": self._db is not None,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_lm_response_cache: Optional[LMResponseCache] = None
+_lm_response_cache_lock = threading.Lock()
+
+
+def get_lm_response_cache() -> Optional[LMResponseCache]:
+    """Get the LM response cache, or None if caching is disabled"""
+    global _lm_response_cache
+
+    if not settings.lm_cache_enabled:
+        return None
+
+    with _lm_response_cache_lock:
+        if _lm_response_cache is None:
+            db_path = (
+                os.path.join(settings.artifacts_path, "cache", "lm_responses.sqlite3")
+                if settings.lm_cache_disk_enabled else None
+            )
+            _lm_response_cache = LMResponseCache(
+                max_memory_entries=settings.lm_cache_memory_max_entries,
+                db_path=db_path,
+                max_disk_bytes=settings.lm_cache_disk_max_bytes,
+            )
+        return _lm_response_cache
+
+
+class CachedLM(RateLimitedLM):
+    """LM that serves repeated requests from the LM response cache, and rate limits the others"""
+
+    def _cache_key(self, prompt: Any, messages: Any, kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """Get the (cache, key, namespace) for a call, or None if the call shouldn't use the cache"""
+        cache = get_lm_response_cache()
+        if cache is None:
+            return None
+        if not self.cache or kwargs.get("cache") is False:
+            return None
+
+        scope = _cache_scope.get()
+        namespace = scope.namespace if scope else DEFAULT_NAMESPACE
+        key = make_cache_key(namespace, self.model, self.model_type, prompt, messages, {**self.kwargs, **kwargs})
+        return cache, key, namespace
+
+    def _bypassed(self) -> bool:
+        scope = _cache_scope.get()
+        return scope is not None and scope.bypass
+
+    def __call__(self, prompt=None, *, messages=None, **kwargs):
+        if self._bypassed():
+            # Also skip dspy.LM's own request cache
+            return super().__call__(prompt, messages=messages, **{**kwargs, "cache": False})
+
+        cached = self._cache_key(prompt, messages, kwargs)
+        if cached is None:
+            return super().__call__(prompt, messages=messages, **kwargs)
+
+        cache, key, namespace = cached
+        # Streaming calls always go to the LM so that tokens reach the listeners
+        if dspy.settings.send_stream is None:
+            outputs = cache.get(key)
+            if outputs is not None:
+                return outputs
+
+        outputs = super().__call__(prompt, messages=messages, **kwargs)
+        if isinstance(outputs, list):
+            cache.put(key, namespace, outputs)
+        return outputs
+
+    async def acall(self, prompt=None, *, messages=None, **kwargs):
+        if self._bypassed():
+            return await super().acall(prompt, messages=messages, **{**kwargs, "cache": False})
+
+        cached = self._cache_key(prompt, messages, kwargs)
+        if cached is None:
+            return await super().acall(prompt, messages=messages, **kwargs)
+
+        cache, key, namespace = cached
+        if dspy.settings.send_stream is None:
+            # SQLite reads block, so disk lookups run in a worker thread
+            outputs = cache.get_memory(key, count_miss=not cache.disk_enabled)
+            if outputs is None and cache.disk_enabled:
+                outputs = await asyncio.to_thread(cache.get_disk, key)
+            if outputs is not None:
+                return outputs
+
+        outputs = await super().acall(prompt, messages=messages, **kwargs)
+        if isinstance(outputs, list):
+            if cache.disk_enabled:
+                await asyncio.to_thread(cache.put, key, namespace, outputs)
+            else:
+                cache.put(key, namespace, outputs)
+        return outputs
@@ -6,8 +6,11 @@ for different providers (Databricks, OpenAI, Anthropic, Gemini, custom).
 """
 import dspy
 import os
-from typing import Optional, Dict, Any
+import hashlib
+import threading
+from typing import Optional, Dict, Any, Tuple
 from dspy_forge.core.config import settings
+from dspy_forge.core.lm_cache import CachedLM
 from dspy_forge.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -79,9 +82,90 @@ def get_provider_config_status() -> Dict[str, bool]:
     }
 
 
+def get_credentials_fingerprint(provider: str) -> str:
+    """
+    Get a fingerprint of the credentials used for a provider.
+    Used to key pooled LM instances so that they are rebuilt when credentials change.
+    """
+    if provider == LMProvider.DATABRICKS:
+        credentials = (
+            settings.databricks_config_profile,
+            settings.databricks_host,
+            settings.databricks_token,
+            os.environ.get("DATABRICKS_CLIENT_ID"),
+        )
+    elif provider == LMProvider.OPENAI:
+        credentials = (settings.openai_api_key,)
+    elif provider == LMProvider.ANTHROPIC:
+        credentials = (settings.anthropic_api_key,)
+    elif provider == LMProvider.GEMINI:
+        credentials = (settings.gemini_api_key,)
+    else:
+        credentials = (settings.custom_lm_api_base, settings.custom_lm_api_key)
+
+    return hashlib.sha256(repr(credentials).encode("utf-8")).hexdigest()[:16]
+
+
+class LMRegistry:
+    """
+    Pool of shared dspy.LM instances.
+
+    Instances are keyed by (provider, model, kwargs) and tagged with the provider's
+    credentials fingerprint. Reusing an instance keeps its litellm client and
+    connections alive across requests; an instance whose credentials have changed
+    is replaced on the next lookup.
+    """
+
+    def __init__(self):
+        self._instances: Dict[Tuple, Tuple[str, dspy.LM]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, model_name: str, **kwargs) -> dspy.LM:
+        """Get a pooled LM instance, creating it on first use"""
+        provider, actual_model = parse_model_name(model_name)
+        key = (provider, actual_model, tuple(sorted((k, repr(v)) for k, v in kwargs.items())))
+        fingerprint = get_credentials_fingerprint(provider)
+
+        with self._lock:
+            cached = self._instances.get(key)
+            if cached and cached[0] == fingerprint:
+                self.hits += 1
+                return cached[1]
+
+            self.misses += 1
+            lm = _build_lm(model_name, **kwargs)
+            self._instances[key] = (fingerprint, lm)
+            return lm
+
+    def invalidate(self, model_name: Optional[str] = None):
+        """Drop pooled instances for a model, or all instances if no model is given"""
+        with self._lock:
+            if model_name is None:
+                self._instances.clear()
+                return
+
+            provider, actual_model = parse_model_name(model_name)
+            for key in [k for k in self._instances if k[:2] == (provider, actual_model)]:
+                del self._instances[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Get registry counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "live_instances": len(self._instances),
+            }
+
+
 def create_lm(model_name: str, **kwargs) -> dspy.LM:
     """
-    Create a DSPy LM instance with proper configuration based on provider.
+    Get a DSPy LM instance with proper configuration based on provider.
+
+    Instances are pooled in the LM registry, so repeated calls with the same
+    model, arguments and credentials return the same instance.
 
     Args:
         model_name: Model name in format "provider/model" or just "model" (defaults to Databricks)
@@ -96,10 +180,19 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
     if not model_name:
         raise ValueError("model_name cannot be empty")
 
+    return lm_registry.get_or_create(model_name, **kwargs)
+
+
+def _build_lm(model_name: str, **kwargs) -> dspy.LM:
+    """Create a new DSPy LM instance for the model's provider, backed by the LM response cache"""
     provider, actual_model = parse_model_name(model_name)
 
     logger.debug(f"Creating LM for provider='{provider}', model='{actual_model}'")
 
+    # Throttled calls are retried by the rate limiter, which has to see every 429
+    if settings.lm_rate_limit_enabled:
+        kwargs.setdefault("num_retries", 0)
+
     # Databricks provider
     if provider == LMProvider.DATABRICKS:
         if not is_databricks_configured():
@@ -108,7 +201,7 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
                 "Please configure DATABRICKS_CONFIG_PROFILE or DATABRICKS_HOST/DATABRICKS_TOKEN."
             )
         # For Databricks, DSPy uses ambient credentials
-        return dspy.LM(model=f"{LMProvider.DATABRICKS}/{actual_model}", **kwargs)
+        return CachedLM(model=f"{LMProvider.DATABRICKS}/{actual_model}", **kwargs)
 
     # OpenAI provider
     elif provider == LMProvider.OPENAI:
@@ -117,7 +210,7 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
                 "OpenAI API key not configured. "
                 "Please set OPENAI_API_KEY in your .env file."
             )
-        return dspy.LM(
+        return CachedLM(
             model=f"{LMProvider.OPENAI}/{actual_model}",
             api_key=settings.openai_api_key,
             **kwargs
@@ -130,7 +223,7 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
                 "Anthropic API key not configured. "
                 "Please set ANTHROPIC_API_KEY in your .env file."
             )
-        return dspy.LM(
+        return CachedLM(
             model=f"{LMProvider.ANTHROPIC}/{actual_model}",
             api_key=settings.anthropic_api_key,
             **kwargs
@@ -143,7 +236,7 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
                 "Gemini API key not configured. "
                 "Please set GEMINI_API_KEY in your .env file."
             )
-        return dspy.LM(
+        return CachedLM(
             model=f"{LMProvider.GEMINI}/{actual_model}",
             api_key=settings.gemini_api_key,
             **kwargs
@@ -162,7 +255,7 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
                 f"Custom provider '{provider}' requires both CUSTOM_LM_API_BASE and "
                 f"CUSTOM_LM_API_KEY to be set in your .env file."
             )
-        return dspy.LM(
+        return CachedLM(
             model=f"{provider}/{actual_model}",
             api_base=settings.custom_lm_api_base,
             api_key=settings.custom_lm_api_key,
@@ -173,6 +266,10 @@ def create_lm(model_name: str, **kwargs) -> dspy.LM:
         raise ValueError(f"Unsupported provider: {provider}")
 
 
+# Global LM registry instance
+lm_registry = LMRegistry()
+
+
 def validate_model_config(model_name: str) -> tuple[bool, Optional[str]]:
     """
     Validate that a model configuration is valid and the provider is configured.
@@ -0,0 +1,281 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are kept per label set in plain Python objects
+and rendered in the Prometheus text format by the `/metrics` route. Recording a
+value is a dict lookup plus a locked update, cheap enough to stay on in
+production. Counters and gauges can instead be given a `collect` callback that
+reads their current values when `/metrics` is scraped, for state another
+component already keeps. When `metrics_enabled` is off every metric is a no-op.
+"""
+import threading
+import time
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dspy_forge.core.config import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from cache hits and local I/O up to long LM calls and optimizations
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _NoopChild:
+    """Stands in for every labelled metric while metrics are disabled"""
+
+    def inc(self, amount: float = 1):
+        pass
+
+    def dec(self, amount: float = 1):
+        pass
+
+    def set(self, value: float):
+        pass
+
+    def observe(self, value: float):
+        pass
+
+
+_NOOP = _NoopChild()
+
+
+class _ValueChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self, lock: threading.Lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...], lock: threading.Lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot counts values above every bucket
+        self.sum = 0.0
+        self.count = 0
+        self._lock = lock
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+
+# Callback returning (label values, value) pairs for a metric when it is scraped
+Collector = Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]
+
+
+class Metric:
+    """A metric family: one child per combination of label values"""
+
+    type_name = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str],
+                 collect: Optional[Collector] = None):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        return _ValueChild(self._lock)
+
+    def labels(self, *values: str):
+        """Get the child for a set of label values, in `labelnames` order"""
+        if not self.registry.enabled:
+            return _NOOP
+
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _samples(self) -> List[str]:
+        if self.collect is not None:
+            values = list(self.collect()) if self.registry.enabled else []
+        else:
+            with self._lock:
+                values = [(key, child.value) for key, child in self._children.items()]
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"] + self._samples()
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets, self._lock)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            children = [(key, list(child.counts), child.sum, child.count) for key, child in self._children.items()]
+
+        lines = []
+        for key, counts, total, count in children:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registry of metric families, rendered together for scraping"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                collect: Optional[Collector] = None) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames, collect))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              collect: Optional[Collector] = None) -> Gauge:
+        return self._register(Gauge(self, name, documentation, labelnames, collect))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class OperationMetrics:
+    """Latency histogram, in-flight gauge and error counter for one kind of operation"""
+
+    def __init__(self, registry: MetricsRegistry, prefix: str, description: str, labelnames: Sequence[str]):
+        self.duration = registry.histogram(
+            f"{prefix}_duration_seconds", f"Duration of {description} in seconds", labelnames
+        )
+        self.in_flight = registry.gauge(f"{prefix}_in_flight", f"{description.capitalize()} in progress", labelnames)
+        self.errors = registry.counter(
+            f"{prefix}_errors_total", f"Failed {description}, by exception type", tuple(labelnames) + ("error",)
+        )
+
+    def start(self, *labels: str) -> float:
+        """Mark an operation as started. Returns the start time to pass to `finish`."""
+        self.in_flight.labels(*labels).inc()
+        return time.perf_counter()
+
+    def finish(self, started_at: float, *labels: str, error: Optional[BaseException] = None):
+        """Record a finished operation"""
+        self.in_flight.labels(*labels).dec()
+        self.duration.labels(*labels).observe(time.perf_counter() - started_at)
+        if error is not None:
+            self.errors.labels(*labels, type(error).__name__).inc()
+
+    @contextmanager
+    def track(self, *labels: str) -> Iterator[None]:
+        """Time the block, counting it as in flight and recording the exception it raises, if any"""
+        started_at = self.start(*labels)
+        error = None
+        try:
+            yield
+        except Exception as e:  # Cancellation is not counted as an error
+            error = e
+            raise
+        finally:
+            self.finish(started_at, *labels, error=error)
+
+
+# Global metrics registry instance
+registry = MetricsRegistry(enabled=settings.metrics_enabled)
+
+# Workflow IDs are left out of the labels, as every workflow would add its own
+# series; spans carry them instead
+NODE_METRICS = OperationMetrics(
+    registry, "dspy_forge_node", "workflow node runs", ("node_type", "module_type")
+)
+LM_METRICS = OperationMetrics(registry, "dspy_forge_lm_call", "LM provider calls", ("model",))
+LM_TOKENS = registry.counter(
+    "dspy_forge_lm_tokens_total", "Tokens used by LM provider calls", ("model", "kind")
+)
+RETRIEVER_METRICS = OperationMetrics(
+    registry, "dspy_forge_retriever_call", "retriever backend calls", ("retriever_type",)
+)
+STORAGE_METRICS = OperationMetrics(
+    registry, "dspy_forge_storage", "storage backend operations", ("backend", "operation")
+)
+COALESCED_EXECUTIONS = registry.counter(
+    "dspy_forge_coalesced_executions_total",
+    "Coalescable executions, by role: leader (ran the workflow) or joined (shared an in-flight run)", ("role",)
+)
+COALESCING_IN_FLIGHT = registry.gauge(
+    "dspy_forge_coalescing_in_flight", "Coalesced runs in progress"
+)
+SERVICE_METRICS = OperationMetrics(
+    registry, "dspy_forge_service", "optimization and deployment jobs", ("service",)
+)
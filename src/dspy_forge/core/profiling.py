@@ -0,0 +1,185 @@
+"""
+On-demand profiling of single workflow executions.
+
+A profiled execution runs under a sampling profiler, which periodically
+records the stack of every thread (the event loop as well as the retriever
+thread pools), and under tracemalloc. The result is rendered as collapsed
+stacks (one `thread;frame;...;frame count` line per stack, for flame graph
+tools), a speedscope JSON profile with one sampled profile per thread, and
+the peak traced memory with the allocation sites still holding the most
+memory when the execution ends.
+
+Both the sampler and tracemalloc observe the whole process, so only one
+execution is profiled at a time and concurrent requests show up in its profile.
+"""
+import json
+import sys
+import threading
+import time
+import tracemalloc
+
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# Allocations by the profiler itself and by imports are left out of allocation statistics
+_ALLOCATION_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib*>"),
+)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profiled execution is started while another is running"""
+
+
+class Frame(NamedTuple):
+    name: str
+    file: str
+    line: int
+
+    def label(self) -> str:
+        return f"{self.name} ({self.file}:{self.line})"
+
+
+class ProfileResult(NamedTuple):
+    duration_seconds: float
+    interval_seconds: float
+    samples: Dict[Tuple[str, Tuple[Frame, ...]], int]  # (thread name, root-first stack) -> sample count
+    peak_memory_bytes: int
+    top_allocations: List[Dict[str, Any]]
+
+    def collapsed_stacks(self) -> str:
+        """Render samples as collapsed stacks"""
+        lines = []
+        for (thread_name, stack), count in sorted(self.samples.items(), key=lambda item: -item[1]):
+            frames = ";".join(frame.label().replace(";", ":") for frame in stack)
+            lines.append(f"{thread_name};{frames} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        """Render samples as a speedscope file, one sampled profile per thread"""
+        frame_index: Dict[Frame, int] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
+
+        for (thread_name, stack), count in self.samples.items():
+            profile = profiles.setdefault(thread_name, {
+                "type": "sampled",
+                "name": thread_name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration_seconds,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append([frame_index.setdefault(frame, len(frame_index)) for frame in stack])
+            profile["weights"].append(count * self.interval_seconds)
+
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "dspy-forge",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": f.name, "file": f.file, "line": f.line} for f in frame_index]},
+            "profiles": list(profiles.values()),
+        }
+
+    def allocations(self) -> Dict[str, Any]:
+        return {
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "top_allocations": self.top_allocations,
+        }
+
+
+class SamplingProfiler:
+    """Samples the stacks of all other threads every `interval` seconds"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="dspy-forge-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(Frame(code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+
+
+_active_lock = threading.Lock()
+
+
+class ExecutionProfiler:
+    """Sampling profiler plus tracemalloc around one execution"""
+
+    def __init__(self, interval: float, top_allocations: int):
+        self.sampler = SamplingProfiler(interval)
+        self.top_allocations = top_allocations
+        self._started_at = 0.0
+        self._owns_tracemalloc = False
+
+    def start(self):
+        """Start profiling. Raises ProfilerBusyError if another execution is being profiled."""
+        if not _active_lock.acquire(blocking=False):
+            raise ProfilerBusyError("Another execution is already being profiled")
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._started_at = time.perf_counter()
+        self.sampler.start()
+
+    def stop(self) -> ProfileResult:
+        """Stop profiling and collect the result. Blocks until the sampler thread exits, so call it off the event loop."""
+        try:
+            self.sampler.stop()
+            duration = time.perf_counter() - self._started_at
+
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot().filter_traces(_ALLOCATION_FILTERS)
+            top = [
+                {
+                    "file": stat.traceback[0].filename,
+                    "line": stat.traceback[0].lineno,
+                    "size_bytes": stat.size,
+                    "count": stat.count,
+                }
+                for stat in snapshot.statistics("lineno")[:self.top_allocations]
+            ]
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+        finally:
+            _active_lock.release()
+
+        return ProfileResult(duration, self.sampler.interval, dict(self.sampler.samples), peak, top)
+
+
+def profile_artifacts(result: ProfileResult, name: str) -> Dict[str, str]:
+    """Render a profile as artifact file name -> content"""
+    return {
+        "profile.speedscope.json": json.dumps(result.speedscope(name)),
+        "stacks.collapsed.txt": result.collapsed_stacks(),
+        "allocations.json": json.dumps(result.allocations(), indent=2),
+    }
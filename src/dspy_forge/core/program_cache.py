@@ -0,0 +1,143 @@
+"""
+Cache of initialized CompoundPrograms.
+
+Building a program re-creates templates, dynamic signature classes and retriever
+clients and loads program.json, so the execution engine reuses programs across
+requests. Entries are keyed by a hash of the normalized workflow content and the
+workflow's program.json version, and evicted by LRU order and TTL.
+"""
+import hashlib
+import json
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+from dspy_forge.models.workflow import Workflow
+
+logger = get_logger(__name__)
+
+
+def workflow_content_hash(workflow: Workflow) -> str:
+    """
+    Hash the parts of a workflow that affect the compiled program.
+    Layout (positions), names and timestamps are ignored, as is optimization data
+    merged in from program.json, which is tracked by the program.json version.
+    """
+    nodes = [
+        {
+            'id': node.id,
+            'type': node.type.value,
+            'data': {k: v for k, v in node.data.items() if k != 'optimization_data'},
+        }
+        for node in workflow.nodes
+    ]
+    edges = [
+        [edge.source, edge.target, edge.sourceHandle, edge.targetHandle]
+        for edge in workflow.edges
+    ]
+    content = json.dumps({'nodes': nodes, 'edges': edges}, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class _CacheEntry(NamedTuple):
+    workflow_id: str
+    program: Any
+    created_at: float
+
+
+class ProgramCache:
+    """Thread-safe LRU cache of initialized programs with TTL expiry"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_version(self, workflow_id: str) -> int:
+        """Get the current program.json version of a workflow"""
+        with self._lock:
+            return self._versions.get(workflow_id, 0)
+
+    def make_key(self, workflow: Workflow, version: int) -> str:
+        """Build the cache key for a workflow at a given program.json version"""
+        return f"{workflow.id}:{version}:{workflow_content_hash(workflow)}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached program, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if self.ttl_seconds and time.monotonic() - entry.created_at > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.program
+
+    def put(self, key: str, workflow_id: str, version: int, program: Any):
+        """
+        Cache a program built for the given program.json version.
+        Programs built against a version that has since been invalidated are dropped.
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            if self._versions.get(workflow_id, 0) != version:
+                return
+
+            self._entries[key] = _CacheEntry(workflow_id, program, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, workflow_id: str):
+        """Drop all programs for a workflow, e.g. after a new program.json is written"""
+        with self._lock:
+            self._versions[workflow_id] = self._versions.get(workflow_id, 0) + 1
+            stale_keys = [k for k, entry in self._entries.items() if entry.workflow_id == workflow_id]
+            for key in stale_keys:
+                del self._entries[key]
+
+        if stale_keys:
+            logger.debug(f"Invalidated {len(stale_keys)} cached program(s) for workflow {workflow_id}")
+
+    def clear(self):
+        """Drop all cached programs"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+# Global program cache instance
+program_cache = ProgramCache(
+    max_size=settings.program_cache_max_size,
+    ttl_seconds=settings.program_cache_ttl_seconds,
+)
@@ -0,0 +1,374 @@
+"""
+Provider-aware rate limiting for LM calls.
+
+Every LM built by `create_lm` goes through a limiter for its provider/model.
+A limiter combines token buckets for the requests-per-minute and
+tokens-per-minute budgets with an AIMD (additive increase, multiplicative
+decrease) concurrency limit: each successful call raises the limit a little,
+and each throttled (HTTP 429) call halves it and is retried after a backoff.
+Queue wait times and throttle events are tracked per limiter and exported to
+/metrics, together with the queue gauges, when it is scraped.
+"""
+import asyncio
+import threading
+import time
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import dspy
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+from dspy_forge.core.metrics import LM_METRICS, LM_TOKENS, registry
+from dspy_forge.core.tracing import start_span
+
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` tokens per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+
+    def try_take(self, amount: float, now: float) -> float:
+        """Take `amount` tokens if available. Returns 0, or the seconds until they will be."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        # Requests larger than the whole budget are let through once the bucket is full
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def refund(self, amount: float):
+        """Return tokens taken for a call that did not start"""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class ProviderLimiter:
+    """RPM/TPM token buckets plus an AIMD concurrency limit for one provider/model"""
+
+    def __init__(self, key: str, rpm: int = 0, tpm: int = 0,
+                 max_concurrency: int = 16, min_concurrency: int = 1):
+        self.key = key
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        # Callers waiting for a slot or budget are woken when a call releases its slot:
+        # threads through the condition, coroutines through their futures
+        self._released = threading.Condition(self._lock)
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+        self.calls = 0
+        self.throttled = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _try_acquire(self, tokens: int) -> Optional[float]:
+        """
+        Take a concurrency slot and budget for a call. Must be called with the lock held.
+        Returns 0, the seconds until the budgets allow the call, or None while no slot is free.
+        """
+        if self.in_flight >= int(self.limit):
+            return None
+
+        now = time.monotonic()
+        # Check both budgets before taking from either, so a refused call costs nothing
+        if self.requests is not None:
+            wait = self.requests.try_take(1, now)
+            if wait:
+                return wait
+        if self.tokens is not None:
+            wait = self.tokens.try_take(tokens, now)
+            if wait:
+                if self.requests is not None:
+                    self.requests.refund(1)
+                return wait
+
+        self.in_flight += 1
+        return 0.0
+
+    def _record_wait(self, waited: float):
+        """Must be called with the lock held"""
+        self.waiting -= 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def acquire(self, tokens: int) -> float:
+        """Block until the call may start. Returns the time spent waiting."""
+        started_at = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+            while (wait := self._try_acquire(tokens)) != 0:
+                self._released.wait(wait)
+            waited = time.monotonic() - started_at
+            self._record_wait(waited)
+        return waited
+
+    async def aacquire(self, tokens: int) -> float:
+        """Wait without blocking the event loop until the call may start. Returns the time spent waiting."""
+        loop = asyncio.get_running_loop()
+        started_at = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(tokens)
+                    if wait == 0:
+                        break
+                    waiter = (loop, loop.create_future())
+                    self._async_waiters.append(waiter)
+                try:
+                    await asyncio.wait({waiter[1]}, timeout=wait)
+                finally:
+                    with self._lock:
+                        if waiter in self._async_waiters:
+                            self._async_waiters.remove(waiter)
+        finally:
+            waited = time.monotonic() - started_at
+            with self._lock:
+                self._record_wait(waited)
+        return waited
+
+    def release(self, throttled: bool = False):
+        """Free the call's slot and adjust the concurrency limit"""
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            if throttled:
+                self.throttled += 1
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+            self._released.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # The waiter's event loop is closed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter metrics"""
+        with self._lock:
+            return {
+                "concurrency_limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "avg_wait_seconds": self.total_wait_seconds / self.calls if self.calls else 0.0,
+                "total_wait_seconds": self.total_wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+                "rpm": int(self.requests.capacity) if self.requests else None,
+                "tpm": int(self.tokens.capacity) if self.tokens else None,
+            }
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+_limiters: Dict[Tuple[str, str], ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model: str) -> Optional[ProviderLimiter]:
+    """Get (creating on first use) the limiter for a model, or None if rate limiting is disabled"""
+    if not settings.lm_rate_limit_enabled:
+        return None
+
+    # Imported here as lm_config builds its LMs from this module
+    from dspy_forge.core.lm_config import parse_model_name
+
+    key = parse_model_name(model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            name = "/".join(key)
+            budgets = settings.lm_rate_limit_overrides.get(name, {})
+            limiter = ProviderLimiter(
+                name,
+                rpm=budgets.get("rpm", settings.lm_rate_limit_rpm),
+                tpm=budgets.get("tpm", settings.lm_rate_limit_tpm),
+                max_concurrency=budgets.get("max_concurrency", settings.lm_max_concurrency),
+                min_concurrency=settings.lm_min_concurrency,
+            )
+            _limiters[key] = limiter
+        return limiter
+
+
+def get_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for all limiters created so far"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.key: limiter.stats() for limiter in limiters}
+
+
+def _collect_limiter_stat(field: str) -> Callable[[], List[Tuple[Tuple[str, ...], float]]]:
+    def collect():
+        return [((key,), stats[field]) for key, stats in get_limiter_stats().items()]
+    return collect
+
+
+# Limiter metrics, read from the limiters when /metrics is scraped
+registry.gauge("dspy_forge_lm_limiter_waiting", "LM calls waiting for their limiter", ("limiter",),
+               collect=_collect_limiter_stat("waiting"))
+registry.gauge("dspy_forge_lm_limiter_in_flight", "LM calls holding a limiter slot", ("limiter",),
+               collect=_collect_limiter_stat("in_flight"))
+registry.gauge("dspy_forge_lm_limiter_concurrency_limit", "Current AIMD concurrency limit", ("limiter",),
+               collect=_collect_limiter_stat("concurrency_limit"))
+registry.counter("dspy_forge_lm_limiter_calls_total", "LM calls finished through the limiter", ("limiter",),
+                 collect=_collect_limiter_stat("calls"))
+registry.counter("dspy_forge_lm_limiter_throttled_total", "LM calls throttled by the provider (HTTP 429)",
+                 ("limiter",), collect=_collect_limiter_stat("throttled"))
+registry.counter("dspy_forge_lm_limiter_wait_seconds_total", "Time LM calls spent waiting for their limiter",
+                 ("limiter",), collect=_collect_limiter_stat("total_wait_seconds"))
+registry.gauge("dspy_forge_lm_limiter_max_wait_seconds", "Longest wait of an LM call for its limiter",
+               ("limiter",), collect=_collect_limiter_stat("max_wait_seconds"))
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Check whether an error (or one it was raised from) is a provider rate limit (HTTP 429)"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if getattr(error, "status_code", None) == 429 or "RateLimit" in type(error).__name__:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _throttle_backoff(attempt: int) -> float:
+    return min(settings.lm_throttle_backoff_seconds * (2 ** attempt), 30.0)
+
+
+def estimate_tokens(prompt: Any, messages: Any, request_kwargs: Dict[str, Any]) -> int:
+    """Estimate the tokens a call counts against a TPM budget (~4 characters per prompt token, plus max_tokens)"""
+    if messages:
+        chars = sum(len(str(message.get("content", ""))) if isinstance(message, dict) else len(str(message))
+                    for message in messages)
+    else:
+        chars = len(str(prompt or ""))
+    return chars // 4 + int(request_kwargs.get("max_tokens") or 0)
+
+
+def record_token_usage(model: str, usage: Dict[str, Any]):
+    """Count a call's prompt and completion tokens in the LM metrics"""
+    prompt_tokens = usage.get("prompt_tokens", usage.get("input_tokens"))
+    completion_tokens = usage.get("completion_tokens", usage.get("output_tokens"))
+    if prompt_tokens:
+        LM_TOKENS.labels(model, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LM_TOKENS.labels(model, "completion").inc(completion_tokens)
+
+
+class _UsageRecorder:
+    """
+    Usage tracker installed for the duration of an LM call. dspy reports a
+    call's usage to the tracker whether or not history is enabled; it is
+    recorded in the LM metrics and passed on to the tracker it wraps, if any.
+    """
+
+    def __init__(self, parent: Any = None):
+        self.parent = parent
+
+    def add_usage(self, lm: str, usage_entry: Dict[str, Any]):
+        record_token_usage(lm, dict(usage_entry or {}))
+        if self.parent is not None:
+            self.parent.add_usage(lm, usage_entry)
+
+    def __getattr__(self, name: str):
+        if self.parent is None:
+            raise AttributeError(name)
+        return getattr(self.parent, name)
+
+
+class RateLimitedLM(dspy.LM):
+    """
+    dspy.LM whose calls go through the provider/model limiter.
+    Throttled calls are retried here (up to lm_throttle_max_retries) so the
+    limiter sees every 429; the underlying client should not retry them itself.
+    Calls (including limiter waits) and their token usage are recorded in the LM metrics.
+    Token usage is taken from the usage dspy reports for the call (not from
+    history), so it is recorded with `disable_history` set too.
+    """
+
+    def _limited_call(self, call: Callable[[], Any], tokens: int) -> Any:
+        limiter = get_limiter(self.model)
+        if limiter is None:
+            return call()
+
+        attempt = 0
+        while True:
+            limiter.acquire(tokens)
+            try:
+                result = call()
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                limiter.release(throttled)
+                if not throttled or attempt >= settings.lm_throttle_max_retries:
+                    raise
+                logger.warning(f"LM call to {limiter.key} throttled, retrying (attempt {attempt + 1})")
+                time.sleep(_throttle_backoff(attempt))
+                attempt += 1
+                continue
+
+            limiter.release()
+            return result
+
+    async def _alimited_call(self, call: Callable[[], Any], tokens: int) -> Any:
+        limiter = get_limiter(self.model)
+        if limiter is None:
+            return await call()
+
+        attempt = 0
+        while True:
+            await limiter.aacquire(tokens)
+            try:
+                result = await call()
+            except asyncio.CancelledError:
+                limiter.release()
+                raise
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                limiter.release(throttled)
+                if not throttled or attempt >= settings.lm_throttle_max_retries:
+                    raise
+                logger.warning(f"LM call to {limiter.key} throttled, retrying (attempt {attempt + 1})")
+                await asyncio.sleep(_throttle_backoff(attempt))
+                attempt += 1
+                continue
+
+            limiter.release()
+            return result
+
+    def __call__(self, prompt=None, *, messages=None, **kwargs):
+        tokens = estimate_tokens(prompt, messages, {**self.kwargs, **kwargs})
+        with LM_METRICS.track(self.model), start_span("lm.call", {"lm.model": self.model}), \
+                dspy.context(usage_tracker=_UsageRecorder(dspy.settings.usage_tracker)):
+            return self._limited_call(
+                lambda: super(RateLimitedLM, self).__call__(prompt, messages=messages, **kwargs), tokens
+            )
+
+    async def acall(self, prompt=None, *, messages=None, **kwargs):
+        tokens = estimate_tokens(prompt, messages, {**self.kwargs, **kwargs})
+        with LM_METRICS.track(self.model), start_span("lm.call", {"lm.model": self.model}), \
+                dspy.context(usage_tracker=_UsageRecorder(dspy.settings.usage_tracker)):
+            return await self._alimited_call(
+                lambda: super(RateLimitedLM, self).acall(prompt, messages=messages, **kwargs), tokens
+            )
@@ -0,0 +1,226 @@
+"""
+Semantic cache of end-to-end workflow answers.
+
+Embeds the start-node inputs of a run and, when a previous run of the same
+workflow had inputs similar enough (cosine similarity above a threshold),
+returns that run's final outputs instead of executing the workflow. Each
+workflow keeps its own NumPy matrix of normalized embeddings with LRU/TTL
+eviction, and is reset whenever the workflow content or its program.json
+version changes.
+
+Embedders are pluggable: set `semantic_cache_embedder` to "hashing" for the
+built-in deterministic, offline embedder, or to "package.module:factory" for a
+callable returning an object with `embed(texts) -> np.ndarray`.
+"""
+import hashlib
+import importlib
+import json
+import re
+import threading
+import time
+
+from typing import Any, Dict, List, NamedTuple, Optional, Protocol
+
+import numpy as np
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class Embedder(Protocol):
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dim) float array"""
+        ...
+
+
+class HashingEmbedder:
+    """
+    Deterministic, offline embedder using feature hashing of word unigrams,
+    word bigrams and character trigrams. Good enough to match paraphrases that
+    share most of their wording, and needs no model or network access.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN_PATTERN.findall(text.lower())
+        features = list(words)
+        features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+        for word in words:
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dim] += sign
+        return vectors
+
+
+def load_embedder(spec: str, dim: int) -> Embedder:
+    """Load the embedder named by a settings value ("hashing" or "package.module:factory")"""
+    if spec == "hashing":
+        return HashingEmbedder(dim)
+
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Invalid semantic cache embedder '{spec}', expected 'hashing' or 'module:factory'")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory()
+
+
+def inputs_to_text(input_data: Dict[str, Any]) -> str:
+    """Render start-node inputs as text for embedding, in a stable field order"""
+    lines = []
+    for key in sorted(input_data):
+        value = input_data[key]
+        if not isinstance(value, str):
+            value = json.dumps(value, sort_keys=True, default=str)
+        lines.append(f"{key}: {value}")
+    return "\n".join(lines)
+
+
+class SemanticMatch(NamedTuple):
+    outputs: Dict[str, Any]
+    similarity: float
+
+
+class _WorkflowIndex:
+    """Embedding matrix and cached outputs for one version of one workflow"""
+
+    def __init__(self, program_key: str, dim: int, capacity: int):
+        self.program_key = program_key
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.outputs: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.expires_at = np.zeros(capacity, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+    def lookup(self, vector: np.ndarray, threshold: float, now: float) -> Optional[SemanticMatch]:
+        if self.size == 0:
+            return None
+
+        similarities = self.vectors[:self.size] @ vector
+        similarities[self.expires_at[:self.size] <= now] = -np.inf
+        row = int(np.argmax(similarities))
+        similarity = float(similarities[row])
+        if similarity < threshold:
+            return None
+
+        self.last_used[row] = now
+        return SemanticMatch(self.outputs[row], similarity)
+
+    def insert(self, vector: np.ndarray, outputs: Dict[str, Any], expires_at: float, now: float) -> bool:
+        """Add an entry, replacing an expired or the least recently used one when full. Returns True on eviction."""
+        evicted = False
+        if self.size < len(self.outputs):
+            row = self.size
+            self.size += 1
+        else:
+            expired = np.flatnonzero(self.expires_at <= now)
+            row = int(expired[0]) if len(expired) else int(np.argmin(self.last_used))
+            evicted = True
+
+        self.vectors[row] = vector
+        self.outputs[row] = outputs
+        self.expires_at[row] = expires_at
+        self.last_used[row] = now
+        return evicted
+
+
+class SemanticCache:
+    """Per-workflow semantic cache of final outputs"""
+
+    def __init__(self, embedder: Embedder, threshold: float, max_entries: int, ttl_seconds: float):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._indexes: Dict[str, _WorkflowIndex] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def embed(self, input_data: Dict[str, Any]) -> np.ndarray:
+        """Embed start-node inputs into a normalized vector"""
+        vector = np.asarray(self.embedder.embed([inputs_to_text(input_data)])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, workflow_id: str, program_key: str, vector: np.ndarray) -> Optional[SemanticMatch]:
+        """Find cached outputs for inputs similar to `vector`, for the current program version"""
+        with self._lock:
+            index = self._indexes.get(workflow_id)
+            match = None
+            if index is not None and index.program_key == program_key:
+                match = index.lookup(vector, self.threshold, time.time())
+
+            if match is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return match
+
+    def store(self, workflow_id: str, program_key: str, vector: np.ndarray, outputs: Dict[str, Any]):
+        """Cache the final outputs of a run"""
+        now = time.time()
+        with self._lock:
+            index = self._indexes.get(workflow_id)
+            if index is None or index.program_key != program_key:
+                # The workflow or its program.json changed, so older answers are stale
+                index = _WorkflowIndex(program_key, len(vector), self.max_entries)
+                self._indexes[workflow_id] = index
+
+            if index.insert(vector, outputs, now + self.ttl_seconds, now):
+                self.evictions += 1
+
+    def invalidate(self, workflow_id: str):
+        """Drop all cached answers of a workflow"""
+        with self._lock:
+            self._indexes.pop(workflow_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "workflows": len(self._indexes),
+                "entries": sum(index.size for index in self._indexes.values()),
+                "max_entries_per_workflow": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Get the semantic cache, or None if it is disabled"""
+    global _semantic_cache
+
+    if not settings.semantic_cache_enabled:
+        return None
+
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache(
+                embedder=load_embedder(settings.semantic_cache_embedder, settings.semantic_cache_embedding_dim),
+                threshold=settings.semantic_cache_threshold,
+                max_entries=settings.semantic_cache_max_entries,
+                ttl_seconds=settings.semantic_cache_ttl_seconds,
+            )
+        return _semantic_cache
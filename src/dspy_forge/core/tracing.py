@@ -0,0 +1,122 @@
+"""
+OpenTelemetry span tracing.
+
+When `tracing_enabled` is set, playground requests, workflow validation,
+program builds, node calls, LM calls, retriever calls and storage I/O are
+recorded as nested spans. The span context lives in contextvars, so asyncio
+tasks, and retriever calls on the thread pools (which copy the context),
+are parented to the span that started them.
+
+Spans are exported to a JSON lines file (one OTel JSON span per line, no
+collector needed) or to an OTLP/HTTP collector. They go through this module's
+own TracerProvider rather than the global one, which MLflow tracing may use.
+"""
+import json
+import os
+import threading
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Longest string kept in a span attribute
+MAX_ATTRIBUTE_LENGTH = 1024
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """Appends finished spans to a JSON lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(json.loads(span.to_json(indent=None))) + "\n" for span in spans)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(lines)
+        except OSError as e:
+            logger.warning(f"Failed to write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _create_exporter() -> SpanExporter:
+    if settings.tracing_exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.error("OTLP span export needs opentelemetry-exporter-otlp-proto-http, writing spans to a file instead")
+        else:
+            return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+
+    path = settings.tracing_json_path or os.path.join(settings.artifacts_path, "traces", "spans.jsonl")
+    return JsonFileSpanExporter(path)
+
+
+_tracer_provider: Optional[TracerProvider] = None
+_tracer: Optional[trace.Tracer] = None
+_tracer_lock = threading.Lock()
+_noop_tracer = trace.NoOpTracer()
+
+
+def get_tracer() -> trace.Tracer:
+    """Get the tracer, or a no-op tracer if tracing is disabled"""
+    global _tracer_provider, _tracer
+
+    if not settings.tracing_enabled:
+        return _noop_tracer
+
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                provider = TracerProvider(resource=Resource.create({"service.name": settings.tracing_service_name}))
+                provider.add_span_processor(BatchSpanProcessor(_create_exporter()))
+                _tracer_provider = provider
+                _tracer = provider.get_tracer("dspy_forge")
+    return _tracer
+
+
+def flush_tracing(timeout_millis: int = 30000) -> bool:
+    """Export all finished spans now"""
+    if _tracer_provider is None:
+        return True
+    return _tracer_provider.force_flush(timeout_millis)
+
+
+def _attribute_value(value: Any) -> Any:
+    if isinstance(value, (bool, int, float)):
+        return value
+    return str(value)[:MAX_ATTRIBUTE_LENGTH]
+
+
+@contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None,
+               parent: Optional[trace.Span] = None) -> Iterator[trace.Span]:
+    """
+    Run the block in a new span, a child of `parent` or else of the current span.
+    Exceptions raised in the block are recorded on the span and mark it as
+    failed. Attributes set to None are left out.
+    """
+    tracer = get_tracer()
+    if tracer is _noop_tracer:
+        yield trace.INVALID_SPAN
+        return
+
+    attributes = {key: _attribute_value(value) for key, value in (attributes or {}).items() if value is not None}
+    context = trace.set_span_in_context(parent) if parent is not None else None
+    with tracer.start_as_current_span(name, context=context, attributes=attributes) as span:
+        yield span
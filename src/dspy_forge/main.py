@@ -11,6 +11,7 @@ from fastapi.responses import FileResponse
 from dspy_forge.core.config import settings
 from dspy_forge.core.logging import setup_logging, get_logger
 from dspy_forge.api.routes import router as api_router
+from dspy_forge.api.endpoints.metrics import router as metrics_router
 
 # Initialize logging
 setup_logging(
@@ -38,6 +39,9 @@ def create_app() -> FastAPI:
     # Include API routes
     app.include_router(api_router, prefix=settings.api_prefix)
 
+    # Prometheus metrics, outside the API prefix where scrapers expect them
+    app.include_router(metrics_router)
+
     # Serve React static files
     static_dir = Path(__file__).parent.parent.parent / "ui/build"
     if static_dir.exists():
@@ -198,10 +198,11 @@ class WorkflowExecution(BaseModel):
     workflow_id: str
     input_data: Dict[str, Any]
     execution_id: str
-    status: Literal["pending", "running", "completed", "failed"]
+    status: Literal["pending", "running", "completed", "failed", "cancelled"]
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     trace_id: Optional[str] = None
+    profile_path: Optional[str] = None  # Storage directory of the profile artifacts, for profiled runs
     created_at: datetime = Field(default_factory=datetime.now)
 
 
@@ -223,6 +224,11 @@ class ExecutionRequest(BaseModel):
     input_data: Dict[str, Any]
 
 
+class BatchExecutionRequest(BaseModel):
+    inputs: List[Dict[str, Any]]
+    concurrency: Optional[int] = None  # Max concurrent executions, defaults to settings.batch_default_concurrency
+
+
 class PlaygroundExecutionRequest(BaseModel):
     workflow_id: Optional[str] = None  # Optional workflow ID for tracking
     workflow_ir: Dict[str, Any]  # Workflow IR containing nodes and edges
@@ -4,12 +4,8 @@ from datetime import datetime
 from dspy_forge.models.workflow import Workflow, NodeType
 from dspy_forge.storage.factory import get_storage_backend
 from dspy_forge.core.logging import get_logger
-from dspy_forge.utils.workflow_utils import (
-    get_execution_order,
-    identify_router_nodes,
-    get_branch_paths,
-    find_branch_merge_point
-)
+from dspy_forge.core.execution_plan import ExecutionPlan
+from dspy_forge.services.validation_service import WorkflowValidationError
 from dspy_forge.core.templates import TemplateFactory, CodeGenerationContext
 from dspy_forge.components import registry  # This will auto-register all templates
 
@@ -104,16 +100,13 @@ class WorkflowCompilerService:
             if not end_fields:
                 end_fields = ['output']
             
-            # Get execution order
-            execution_order, graph = get_execution_order(workflow)
+            # Get execution order, router nodes and their branch paths from the plan
+            plan = ExecutionPlan(workflow)
+            if not plan.is_acyclic:
+                raise WorkflowValidationError("Cannot determine execution order: workflow contains a cycle")
 
-            # Identify router nodes
-            router_node_ids = identify_router_nodes(workflow)
-
-            # Build a mapping of router_id -> branch_paths
-            router_branch_map = {}
-            for router_id in router_node_ids:
-                router_branch_map[router_id] = get_branch_paths(workflow, router_id)
+            execution_order = plan.execution_order
+            router_branch_map = plan.router_branch_map
 
             # Generate code for each node using templates
             signatures = []
@@ -127,7 +120,7 @@ class WorkflowCompilerService:
             node_code_map = {}  # Map node_id -> generated code
 
             for node_id in execution_order:
-                node = next((n for n in workflow.nodes if n.id == node_id), None)
+                node = plan.get_node(node_id)
                 if not node:
                     continue
 
@@ -156,12 +149,12 @@ class WorkflowCompilerService:
                 if node_id in processed_nodes:
                     continue
 
-                node = next((n for n in workflow.nodes if n.id == node_id), None)
+                node = plan.get_node(node_id)
                 if not node:
                     continue
 
                 # Check if this is a router node
-                if node_id in router_node_ids:
+                if node_id in router_branch_map:
                     # Generate if-elif-else block for router
                     router_code = self._generate_router_code(
                         workflow, node, router_branch_map[node_id],
@@ -20,6 +20,7 @@ from dspy_forge.services.validation_service import validation_service
 from dspy_forge.services.compiler_service import compiler_service
 from dspy_forge.storage.factory import get_storage_backend
 from dspy_forge.core.logging import get_logger
+from dspy_forge.core.metrics import SERVICE_METRICS
 from dspy_forge.deployment.runner import deploy_agent
 
 logger = get_logger(__name__)
@@ -98,6 +99,8 @@ class DeploymentService:
         deployment_id: str
     ):
         """Deploy workflow asynchronously"""
+        metrics_started_at = SERVICE_METRICS.start("deployment")
+        error = None
         try:
             status = {
                 "status": "validating",
@@ -247,6 +250,7 @@ class DeploymentService:
             logger.info(f"Successfully deployed workflow {workflow.id} as {catalog_name}.{schema_name}.{model_name}")
 
         except Exception as e:
+            error = e
             error_msg = f"Deployment failed: {str(e)}"
             logger.error(f"Deployment failed for {deployment_id}: {error_msg}", exc_info=True)
 
@@ -258,6 +262,8 @@ class DeploymentService:
             await self._save_deployment_status(deployment_id, status)
 
         finally:
+            SERVICE_METRICS.finish(metrics_started_at, "deployment", error=error)
+
             # Cleanup temp directory
             if self._temp_dir and os.path.exists(self._temp_dir):
                 try:
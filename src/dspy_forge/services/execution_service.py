@@ -1,57 +1,122 @@
 import os
+import copy
+import json
+import time
 import uuid
+import asyncio
 import tempfile
 
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import numpy as np
+
+from typing import Dict, Any, List, NamedTuple, Optional, Union, Iterable, AsyncIterable, AsyncIterator
 
 from dspy_forge.storage.factory import get_storage_backend
+from dspy_forge.core.config import settings
 from dspy_forge.core.logging import get_logger
-from dspy_forge.utils.workflow_utils import find_end_nodes
 from dspy_forge.models.workflow import Workflow, WorkflowExecution
 from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.core.execution_context import ExecutionContext, bind_execution_context
+from dspy_forge.core.metrics import COALESCED_EXECUTIONS, COALESCING_IN_FLIGHT
+from dspy_forge.core.profiling import ExecutionProfiler, profile_artifacts
+from dspy_forge.core.program_cache import program_cache
+from dspy_forge.core.semantic_cache import SemanticCache, get_semantic_cache
+from dspy_forge.core.tracing import start_span
+from dspy_forge.services.execution_store import execution_store
 from dspy_forge.components import registry  # This will auto-register all templates
 
 logger = get_logger(__name__)
 
-class ExecutionContext:
-    """Context for workflow execution"""
-    def __init__(self, workflow: Workflow, input_data: Dict[str, Any]):
-        self.workflow = workflow
-        self.input_data = input_data
-        self.node_outputs: Dict[str, Dict[str, Any]] = {}
-        self.execution_trace: List[Dict[str, Any]] = []
-        self.models: Dict[str, Any] = {}
-        self.node_counts: Dict[str, int] = {}  # Track count of each module type
-        
-    def set_node_output(self, node_id: str, output: Dict[str, Any]):
-        """Set output for a node"""
-        self.node_outputs[node_id] = output
-        
-    def get_node_output(self, node_id: str) -> Dict[str, Any]:
-        """Get output from a node"""
-        return self.node_outputs.get(node_id, {})
-        
-    def add_trace_entry(self, node_id: str, node_type: str, inputs: Dict[str, Any], outputs: Dict[str, Any], execution_time: float):
-        """Add entry to execution trace"""
-        self.execution_trace.append({
-            'node_id': node_id,
-            'node_type': node_type,
-            'inputs': inputs,
-            'outputs': outputs,
-            'execution_time': execution_time,
-            'timestamp': datetime.now().isoformat()
-        })
+
+class _SemanticProbe(NamedTuple):
+    """Semantic cache handle for one run: the cache, program version key and input embedding"""
+    cache: SemanticCache
+    program_key: str
+    vector: np.ndarray
+
+
+class _SharedExecution:
+    """An in-flight execution shared by every caller that submitted the same run"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
 
 
 class WorkflowExecutionEngine:
     """Engine for executing DSPy workflows"""
     
     def __init__(self):
-        self.active_executions: Dict[str, WorkflowExecution] = {}
+        self._in_flight: Dict[str, _SharedExecution] = {}
+        self._building: Dict[str, asyncio.Task] = {}  # Program builds in progress, by cache key
+        self.coalesced_executions = 0
+        self.leader_executions = 0
     
-    async def execute_workflow(self, workflow: Workflow, input_data: Dict[str, Any]) -> WorkflowExecution:
-        """Execute a workflow with given input data using CompoundProgram"""
+    async def execute_workflow(self, workflow: Workflow, input_data: Dict[str, Any],
+                               event_queue: Optional[asyncio.Queue] = None,
+                               bypass_lm_cache: bool = False, profile: bool = False,
+                               coalesce: bool = True) -> WorkflowExecution:
+        """
+        Execute a workflow with given input data using CompoundProgram.
+        Progress events are put on `event_queue` if one is given.
+        With `bypass_lm_cache`, LM calls skip the LM response cache and the
+        semantic answer cache. With `profile`, the run is profiled and the
+        artifacts are linked from the execution's `profile_path`; raises
+        ProfilerBusyError if another execution is being profiled.
+
+        Concurrent executions of the same workflow version with the same input are
+        coalesced: they share one in-flight run and all receive its execution.
+        Pass `coalesce=False` to always run separately. Streaming (`event_queue`),
+        `bypass_lm_cache` and profiled runs are never coalesced.
+        """
+        if (not coalesce or event_queue is not None or bypass_lm_cache or profile
+                or not settings.execution_coalescing_enabled):
+            return await self._execute_workflow(workflow, input_data, event_queue, bypass_lm_cache, profile)
+
+        key = self._coalescing_key(workflow, input_data)
+        shared = self._in_flight.get(key)
+        if shared is None:
+            shared = _SharedExecution(asyncio.create_task(self._execute_workflow(workflow, input_data)))
+            self._in_flight[key] = shared
+            shared.task.add_done_callback(lambda _: self._finish_shared(key))
+            self.leader_executions += 1
+            COALESCED_EXECUTIONS.labels("leader").inc()
+            COALESCING_IN_FLIGHT.labels().inc()
+        else:
+            logger.debug(f"Coalescing execution of workflow {workflow.id} with an in-flight run")
+            self.coalesced_executions += 1
+            COALESCED_EXECUTIONS.labels("joined").inc()
+
+        shared.waiters += 1
+        try:
+            # Shielded so one caller going away doesn't cancel the run for the others
+            return await asyncio.shield(shared.task)
+        finally:
+            shared.waiters -= 1
+            if shared.waiters == 0 and not shared.task.done():
+                # Every caller went away, nobody needs the result
+                shared.task.cancel()
+
+    def _finish_shared(self, key: str):
+        self._in_flight.pop(key, None)
+        COALESCING_IN_FLIGHT.labels().dec()
+
+    def _coalescing_key(self, workflow: Workflow, input_data: Dict[str, Any]) -> str:
+        """Identify a run by workflow content, program.json version and normalized input"""
+        program_key = program_cache.make_key(workflow, program_cache.get_version(workflow.id))
+        return f"{program_key}:{json.dumps(input_data, sort_keys=True, default=str)}"
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """Get counters for coalesced executions"""
+        return {
+            "in_flight": len(self._in_flight),
+            "leader_executions": self.leader_executions,
+            "coalesced_executions": self.coalesced_executions,
+        }
+
+    async def _execute_workflow(self, workflow: Workflow, input_data: Dict[str, Any],
+                                event_queue: Optional[asyncio.Queue] = None,
+                                bypass_lm_cache: bool = False, profile: bool = False) -> WorkflowExecution:
+        """Run one workflow execution and record it in the execution store"""
         execution_id = str(uuid.uuid4())
 
         execution = WorkflowExecution(
@@ -61,68 +126,297 @@ class WorkflowExecutionEngine:
             status="pending"
         )
 
-        self.active_executions[execution_id] = execution
+        profiler = None
+        if profile:
+            profiler = ExecutionProfiler(settings.profiling_sample_interval_seconds, settings.profiling_top_allocations)
+            profiler.start()
+
+        execution_store.add(execution)
 
         try:
             # Update status to running
             execution.status = "running"
 
-            storage = await get_storage_backend()
-            content = await storage.get_file(
-                f"workflows/{workflow.id}/program.json")
-
-            # Create execution context
-            context = ExecutionContext(workflow, input_data)
+            # Answer from the semantic cache if a similar question was asked before
+            probe = await self._probe_semantic_cache(workflow, input_data, bypass_lm_cache)
+            match = probe.cache.lookup(workflow.id, probe.program_key, probe.vector) if probe else None
+            if match is not None:
+                logger.debug(f"Semantic cache hit for workflow {workflow.id} (similarity {match.similarity:.3f})")
+                execution.result = {
+                    'final_outputs': copy.deepcopy(match.outputs),
+                    'execution_trace': [],
+                    'node_outputs': {},
+                    'semantic_cache': {'hit': True, 'similarity': match.similarity}
+                }
+                execution.status = "completed"
+                return execution
 
-            # Create and execute CompoundProgram
-            program = CompoundProgram(workflow, context)
-
-            if content:
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json").name
-                try:
-                    with open(temp_file, 'w') as fh:
-                        fh.write(content)
-                    program.load(temp_file)
-                finally:
-                    os.remove(temp_file)
-                logger.info(f"Loaded optimized program for workflow {workflow.id}")
+            # Get a cached CompoundProgram or build a new one
+            program = await self._get_program(workflow)
 
             # Execute the program with input data using async forward
-            await program.aforward(**input_data)
-
-            # Get final outputs from end nodes
-            end_nodes = find_end_nodes(workflow)
-            final_outputs = {}
-            for end_node_id in end_nodes:
-                final_outputs[end_node_id] = context.get_node_output(end_node_id)
+            context, final_outputs = await self._run_program(
+                program, workflow, input_data, event_queue, bypass_lm_cache
+            )
 
             # Include execution trace and intermediate outputs in result
             execution.result = {
                 'final_outputs': final_outputs,
-                'execution_trace': context.execution_trace,
-                'node_outputs': context.node_outputs
+                'execution_trace': context.serialize_trace(),
+                'node_outputs': context.serialize_node_outputs(),
+                'trace_verbosity': context.trace_verbosity
             }
             execution.status = "completed"
 
+            # Runs where a node failed or timed out still complete, but their answer isn't reusable
+            if probe is not None and not context.has_node_errors():
+                probe.cache.store(workflow.id, probe.program_key, probe.vector, copy.deepcopy(final_outputs))
+
+        except asyncio.CancelledError:
+            # The caller went away (e.g. client disconnect), running nodes were cancelled
+            logger.info(f"Workflow execution {execution_id} cancelled")
+            execution.error = "Execution cancelled"
+            execution.status = "cancelled"
+            raise
         except Exception as e:
             logger.error(f"Workflow execution failed: {e}", exc_info=True)
             execution.error = str(e)
             execution.status = "failed"
+        finally:
+            try:
+                if profiler is not None:
+                    execution.profile_path = await self._save_profile(execution, profiler)
+            finally:
+                execution_store.finish(execution)
 
         return execution
+
+    async def _save_profile(self, execution: WorkflowExecution, profiler: ExecutionProfiler) -> Optional[str]:
+        """Stop profiling and save the profile artifacts of an execution. Returns their storage directory, or None on failure."""
+        # Stopping joins the sampler thread and takes a tracemalloc snapshot, both
+        # of which block, so it runs off the event loop along with the rendering
+        result = await asyncio.to_thread(profiler.stop)
+        profile_path = f"profiles/{execution.execution_id}"
+        try:
+            storage = await get_storage_backend()
+            artifacts = await asyncio.to_thread(profile_artifacts, result, f"{execution.workflow_id} {execution.execution_id}")
+            for filename, content in artifacts.items():
+                if not await storage.save_file(f"{profile_path}/{filename}", content):
+                    raise RuntimeError(f"Failed to save {filename}")
+        except Exception as e:
+            logger.error(f"Failed to save profile of execution {execution.execution_id}: {e}")
+            return None
+
+        logger.info(f"Saved profile of execution {execution.execution_id} to {profile_path}")
+        return profile_path
+
+    async def stream_workflow(self, workflow: Workflow, input_data: Dict[str, Any],
+                              bypass_lm_cache: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a workflow, yielding progress events as they happen.
+
+        Yields a `node` event per finished node, `token` events for streamed
+        end-node fields, and ends with a `final` event carrying the execution id,
+        status, final outputs and error.
+        """
+        event_queue: asyncio.Queue = asyncio.Queue()
+
+        async def run():
+            try:
+                return await self.execute_workflow(workflow, input_data, event_queue, bypass_lm_cache)
+            finally:
+                event_queue.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (event := await event_queue.get()) is not None:
+                yield event
+
+            execution = await task
+            yield {
+                'event': 'final',
+                'data': {
+                    'execution_id': execution.execution_id,
+                    'status': execution.status,
+                    'result': (execution.result or {}).get('final_outputs', {}),
+                    'error': execution.error
+                }
+            }
+        finally:
+            # Stop the execution if the consumer goes away (e.g. client disconnect)
+            if not task.done():
+                task.cancel()
+
+    async def execute_batch(
+        self,
+        workflow: Workflow,
+        inputs: Union[Iterable[Any], AsyncIterable[Any]],
+        concurrency: Optional[int] = None,
+        bypass_lm_cache: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a workflow for many inputs, sharing one initialized CompoundProgram.
+
+        At most `concurrency` executions run at a time, and inputs are only pulled
+        from `inputs` as slots free up, so large (or streamed) batches are never
+        held in memory. Results are yielded as each item finishes, in completion
+        order, with the item's index in `inputs`.
+
+        Items that are not dicts are reported as failed; exception items (e.g.
+        JSONL lines that failed to parse) are reported with their message.
+        """
+        concurrency = max(1, min(concurrency or settings.batch_default_concurrency,
+                                 settings.batch_max_concurrency))
+        program = await self._get_program(workflow)
+
+        pending = set()
+        try:
+            index = 0
+            async for input_data in self._iterate_inputs(inputs):
+                pending.add(asyncio.create_task(
+                    self._run_batch_item(program, workflow, index, input_data, bypass_lm_cache)
+                ))
+                index += 1
+
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # Stop in-flight items if the consumer goes away (e.g. client disconnect)
+            for task in pending:
+                task.cancel()
+
+    async def _iterate_inputs(self, inputs: Union[Iterable[Any], AsyncIterable[Any]]) -> AsyncIterator[Any]:
+        """Iterate sync and async input sources alike"""
+        if hasattr(inputs, '__aiter__'):
+            async for item in inputs:
+                yield item
+        else:
+            for item in inputs:
+                yield item
+
+    async def _run_batch_item(self, program: CompoundProgram, workflow: Workflow,
+                              index: int, input_data: Any, bypass_lm_cache: bool = False) -> Dict[str, Any]:
+        """Run a single batch item, capturing its result, error and timing"""
+        start_time = time.perf_counter()
+        item = {'index': index, 'status': 'completed', 'result': None, 'error': None}
+
+        try:
+            if isinstance(input_data, Exception):
+                raise input_data
+            if not isinstance(input_data, dict):
+                raise ValueError(f"Batch input must be a JSON object, got {type(input_data).__name__}")
+
+            probe = await self._probe_semantic_cache(workflow, input_data, bypass_lm_cache)
+            match = probe.cache.lookup(workflow.id, probe.program_key, probe.vector) if probe else None
+            if match is not None:
+                item['result'] = copy.deepcopy(match.outputs)
+            else:
+                context, item['result'] = await self._run_program(
+                    program, workflow, input_data, bypass_lm_cache=bypass_lm_cache
+                )
+                if probe is not None and not context.has_node_errors():
+                    probe.cache.store(workflow.id, probe.program_key, probe.vector, copy.deepcopy(item['result']))
+        except Exception as e:
+            logger.warning(f"Batch item {index} failed for workflow {workflow.id}: {e}")
+            item['status'] = 'failed'
+            item['error'] = str(e)
+
+        item['execution_time'] = time.perf_counter() - start_time
+        return item
+
+    async def _run_program(self, program: CompoundProgram, workflow: Workflow, input_data: Dict[str, Any],
+                           event_queue: Optional[asyncio.Queue] = None,
+                           bypass_lm_cache: bool = False) -> tuple[ExecutionContext, Dict[str, Any]]:
+        """Run the program in a fresh execution context. Returns the context and end node outputs."""
+        context = ExecutionContext(
+            workflow, input_data, event_queue, bypass_lm_cache,
+            timeout_seconds=settings.execution_timeout_seconds
+        )
+        with bind_execution_context(context), start_span("workflow.execute", {'workflow.id': workflow.id}):
+            await program.aforward(**input_data)
+
+        # Get final outputs from end nodes
+        final_outputs = {}
+        for end_node_id in program.plan.end_nodes:
+            final_outputs[end_node_id] = context.get_node_output(end_node_id)
+
+        return context, final_outputs
+
+    async def _probe_semantic_cache(self, workflow: Workflow, input_data: Dict[str, Any],
+                                    bypass: bool = False) -> Optional[_SemanticProbe]:
+        """
+        Embed the run's inputs for the semantic cache. Returns None if the cache is
+        disabled or bypassed, or the workflow has no ID to namespace answers by.
+        """
+        cache = get_semantic_cache()
+        if cache is None or bypass or not workflow.id:
+            return None
+
+        # Answers are tied to the workflow content and program.json version
+        program_key = program_cache.make_key(workflow, program_cache.get_version(workflow.id))
+        # Embedders are pluggable and may be slow (e.g. a local model), keep them off the event loop
+        vector = await asyncio.to_thread(cache.embed, input_data)
+        return _SemanticProbe(cache, program_key, vector)
+
+    async def _get_program(self, workflow: Workflow) -> CompoundProgram:
+        """Get an initialized program for the workflow, building it on a cache miss"""
+        version = program_cache.get_version(workflow.id)
+        cache_key = program_cache.make_key(workflow, version)
+
+        program = program_cache.get(cache_key)
+        if program is not None:
+            logger.debug(f"Using cached program for workflow {workflow.id}")
+            return program
+
+        building = self._building.get(cache_key)
+        if building is None:
+            building = asyncio.create_task(self._build_and_cache(workflow, version, cache_key))
+            self._building[cache_key] = building
+            building.add_done_callback(lambda _: self._building.pop(cache_key, None))
+        # Concurrent misses wait on one build, shielded so a caller going away
+        # doesn't cancel it for the others
+        return await asyncio.shield(building)
+
+    async def _build_and_cache(self, workflow: Workflow, version: int, cache_key: str) -> CompoundProgram:
+        with start_span("program.build", {'workflow.id': workflow.id, 'workflow.nodes': len(workflow.nodes)}):
+            program = await self._build_program(workflow)
+        program_cache.put(cache_key, workflow.id, version, program)
+        return program
+
+    async def _build_program(self, workflow: Workflow) -> CompoundProgram:
+        """Create a CompoundProgram and load optimized state from program.json if available"""
+        program = CompoundProgram(workflow)
+
+        storage = await get_storage_backend()
+        content = await storage.get_file(
+            f"workflows/{workflow.id}/program.json")
+
+        if content:
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json").name
+            try:
+                with open(temp_file, 'w') as fh:
+                    fh.write(content)
+                program.load(temp_file)
+            finally:
+                os.remove(temp_file)
+            logger.info(f"Loaded optimized program for workflow {workflow.id}")
+
+        return program
     
-    def get_execution_status(self, execution_id: str) -> Optional[WorkflowExecution]:
+    async def get_execution_status(self, execution_id: str) -> Optional[WorkflowExecution]:
         """Get execution status"""
-        return self.active_executions.get(execution_id)
+        return await execution_store.get(execution_id)
     
-    def get_execution_trace(self, execution_id: str) -> List[Dict[str, Any]]:
+    async def get_execution_trace(self, execution_id: str) -> List[Dict[str, Any]]:
         """Get execution trace"""
-        execution = self.active_executions.get(execution_id)
-        if not execution:
-            return []
-        
-        # For now, return empty trace - would be populated during execution
-        return []
+        return await execution_store.get_trace(execution_id) or []
 
 
 # Global execution engine instance
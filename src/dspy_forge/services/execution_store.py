@@ -0,0 +1,487 @@
+"""
+Execution record store.
+
+Recent and running executions are kept in a bounded in-memory tier (LRU order
+with TTL expiry). Every finished execution is also appended to an execution log
+on the storage backend: records go to JSONL segment files, and each segment has
+a small JSONL index (execution id, workflow id, status, creation time and the
+record's byte range) appended alongside it, so a record is read back without
+loading its whole segment. Both roll over together, so one append never
+rewrites more than one segment's worth of data, even on backends without a real
+append. When a segment is closed, its summary (record count, creation time span
+and per-workflow counts) is appended to a manifest.
+
+Only the open segment's index is always in memory. Indexes of closed segments
+are loaded on demand into a small LRU, and the manifest summaries let listings
+count matches and skip segments without loading them.
+
+Log layout:
+    executions/manifest.jsonl
+    executions/index/000000.jsonl, 000001.jsonl, ...
+    executions/segments/000000.jsonl, 000001.jsonl, ...
+"""
+import asyncio
+import json
+import time
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from dspy_forge.core.config import settings
+from dspy_forge.core.logging import get_logger
+from dspy_forge.models.workflow import WorkflowExecution
+from dspy_forge.storage.factory import get_storage_backend
+
+logger = get_logger(__name__)
+
+EXECUTION_LOG_DIR = "executions"
+EXECUTION_MANIFEST_PATH = f"{EXECUTION_LOG_DIR}/manifest.jsonl"
+
+
+def _segment_path(segment: int) -> str:
+    return f"{EXECUTION_LOG_DIR}/segments/{segment:06d}.jsonl"
+
+
+def _index_path(segment: int) -> str:
+    return f"{EXECUTION_LOG_DIR}/index/{segment:06d}.jsonl"
+
+
+def _decode(content: Any) -> str:
+    if isinstance(content, bytes):
+        return content.decode('utf-8')
+    return content or ""
+
+
+class IndexEntry(NamedTuple):
+    execution_id: str
+    workflow_id: str
+    status: str
+    created_at: datetime
+    segment: int
+    offset: int  # Byte range of the record in its segment
+    length: int
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'execution_id': self.execution_id,
+            'workflow_id': self.workflow_id,
+            'status': self.status,
+            'created_at': self.created_at.isoformat(),
+        }
+
+
+class SegmentSummary:
+    """Record count, creation time span and per-workflow counts of one log segment"""
+
+    def __init__(self, segment: int):
+        self.segment = segment
+        self.count = 0
+        self.min_created_at: Optional[datetime] = None
+        self.max_created_at: Optional[datetime] = None
+        self.workflows: Dict[str, int] = {}
+
+    def add(self, entry: IndexEntry):
+        self.count += 1
+        self.workflows[entry.workflow_id] = self.workflows.get(entry.workflow_id, 0) + 1
+        if self.min_created_at is None or entry.created_at < self.min_created_at:
+            self.min_created_at = entry.created_at
+        if self.max_created_at is None or entry.created_at > self.max_created_at:
+            self.max_created_at = entry.created_at
+
+    def matching(self, workflow_id: Optional[str]) -> int:
+        return self.workflows.get(workflow_id, 0) if workflow_id else self.count
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'segment': self.segment,
+            'count': self.count,
+            'min_created_at': self.min_created_at.isoformat() if self.min_created_at else None,
+            'max_created_at': self.max_created_at.isoformat() if self.max_created_at else None,
+            'workflows': self.workflows,
+        })
+
+    @classmethod
+    def from_json(cls, line: str) -> "SegmentSummary":
+        data = json.loads(line)
+        summary = cls(data['segment'])
+        summary.count = data['count']
+        summary.min_created_at = datetime.fromisoformat(data['min_created_at']) if data['min_created_at'] else None
+        summary.max_created_at = datetime.fromisoformat(data['max_created_at']) if data['max_created_at'] else None
+        summary.workflows = data['workflows']
+        return summary
+
+
+def _parse_index(content: str) -> "OrderedDict[str, IndexEntry]":
+    entries: "OrderedDict[str, IndexEntry]" = OrderedDict()
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+            entry = IndexEntry(
+                data['execution_id'], data['workflow_id'], data['status'],
+                datetime.fromisoformat(data['created_at']), data['segment'], data['offset'], data['length']
+            )
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Skipping malformed execution index line: {e}")
+            continue
+        entries[entry.execution_id] = entry
+    return entries
+
+
+def _summarize(execution: WorkflowExecution) -> Dict[str, Any]:
+    return {
+        'execution_id': execution.execution_id,
+        'workflow_id': execution.workflow_id,
+        'status': execution.status,
+        'created_at': execution.created_at.isoformat(),
+    }
+
+
+class ExecutionStore:
+    """Bounded in-memory tier over an append-only, segmented and indexed execution log"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, segment_max_records: int,
+                 index_cache_segments: int = 8, max_write_retries: int = 3):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.segment_max_records = segment_max_records
+        self.index_cache_segments = index_cache_segments
+        self.max_write_retries = max_write_retries
+
+        # execution_id -> (execution, last access time)
+        self._memory: "OrderedDict[str, Tuple[WorkflowExecution, float]]" = OrderedDict()
+        self._persisted = set()  # Execution IDs in memory that are already in the log
+        self._abandoned = set()  # Execution IDs in memory that could not be written to the log
+
+        self._closed: Dict[int, SegmentSummary] = {}  # Summaries of closed segments, from the manifest
+        self._open_index: "OrderedDict[str, IndexEntry]" = OrderedDict()
+        self._open_summary = SegmentSummary(0)
+        self._index_cache: "OrderedDict[int, OrderedDict[str, IndexEntry]]" = OrderedDict()
+        self._index_loaded = False
+        self._segment = 0
+        self._segment_records = 0
+        self._segment_bytes = 0
+        # Records appended to the open segment whose index entry failed to be written
+        self._unindexed: Dict[str, IndexEntry] = {}
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._pending_writes = set()
+        self.failed_writes = 0
+
+    def _get_write_lock(self) -> asyncio.Lock:
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        return self._write_lock
+
+    def add(self, execution: WorkflowExecution):
+        """Track a new (running) execution in memory"""
+        self._memory[execution.execution_id] = (execution, time.monotonic())
+        self._evict()
+
+    def finish(self, execution: WorkflowExecution):
+        """Append a finished execution to the log in the background, retrying failed writes"""
+        task = asyncio.create_task(self._persist_with_retries(execution))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def flush(self):
+        """Wait for background log writes to complete"""
+        if self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
+
+    async def _persist_with_retries(self, execution: WorkflowExecution):
+        for attempt in range(self.max_write_retries + 1):
+            if attempt:
+                await asyncio.sleep(min(2 ** (attempt - 1), 30))
+            try:
+                if await self.persist(execution):
+                    return
+            except Exception as e:
+                logger.error(f"Failed to write execution {execution.execution_id} to the execution log: {e}")
+
+        # Give up, so the record doesn't pin memory forever; it stays readable until evicted
+        logger.error(f"Dropping execution {execution.execution_id} from the execution log "
+                     f"after {self.max_write_retries + 1} failed writes")
+        self.failed_writes += 1
+        self._unindexed.pop(execution.execution_id, None)
+        if execution.execution_id in self._memory:
+            self._abandoned.add(execution.execution_id)
+        self._evict()
+
+    async def persist(self, execution: WorkflowExecution) -> bool:
+        """Append an execution record and its index entry to the log"""
+        storage = await get_storage_backend()
+        async with self._get_write_lock():
+            await self._load_index()
+
+            # A retry after a failed index write only writes the index entry, unless
+            # the segment rolled over since (the earlier record then stays unindexed)
+            entry = self._unindexed.pop(execution.execution_id, None)
+            if entry is None or entry.segment != self._segment:
+                entry = await self._append_record(execution)
+                if entry is None:
+                    return False
+
+            index_line = json.dumps({**entry._asdict(), 'created_at': entry.created_at.isoformat()}) + "\n"
+            if not await storage.append_file(_index_path(entry.segment), index_line):
+                logger.error(f"Failed to index execution {execution.execution_id}")
+                self._unindexed[execution.execution_id] = entry
+                return False
+
+            self._open_index[entry.execution_id] = entry
+            self._open_summary.add(entry)
+            if execution.execution_id in self._memory:
+                self._persisted.add(execution.execution_id)
+            self._evict()
+            return True
+
+    async def _append_record(self, execution: WorkflowExecution) -> Optional[IndexEntry]:
+        """Append an execution record to the open segment. Needs the write lock."""
+        if self._segment_records >= self.segment_max_records:
+            await self._close_segment()
+
+        # Outputs may hold objects without a JSON form, they are recorded as strings
+        record = execution.model_dump_json(fallback=str) + "\n"
+        length = len(record.encode('utf-8'))
+
+        storage = await get_storage_backend()
+        if not await storage.append_file(_segment_path(self._segment), record):
+            logger.error(f"Failed to append execution {execution.execution_id} to the execution log")
+            return None
+
+        entry = IndexEntry(
+            execution.execution_id, execution.workflow_id, execution.status,
+            execution.created_at, self._segment, self._segment_bytes, length
+        )
+        self._segment_records += 1
+        self._segment_bytes += length
+        return entry
+
+    async def _close_segment(self):
+        """Record the open segment in the manifest and start the next one. Needs the write lock."""
+        storage = await get_storage_backend()
+        if not await storage.append_file(EXECUTION_MANIFEST_PATH, self._open_summary.to_json() + "\n"):
+            # Recovered on the next load, which summarizes closed segments missing from the manifest
+            logger.warning(f"Failed to record execution log segment {self._segment} in the manifest")
+
+        self._closed[self._segment] = self._open_summary
+        self._cache_index(self._segment, self._open_index)
+        self._segment += 1
+        self._segment_records = 0
+        self._segment_bytes = 0
+        self._unindexed.clear()
+        self._open_index = OrderedDict()
+        self._open_summary = SegmentSummary(self._segment)
+
+    async def _ensure_index(self):
+        """Load the log index if it hasn't been yet"""
+        if not self._index_loaded:
+            async with self._get_write_lock():
+                await self._load_index()
+
+    async def _load_index(self):
+        """Load the manifest and the open segment's index (once). Must be called with the write lock held."""
+        if self._index_loaded:
+            return
+
+        storage = await get_storage_backend()
+        for line in _decode(await storage.get_file(EXECUTION_MANIFEST_PATH)).splitlines():
+            if not line.strip():
+                continue
+            try:
+                summary = SegmentSummary.from_json(line)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed execution manifest line: {e}")
+                continue
+            self._closed[summary.segment] = summary
+
+        # Segments after the last one in the manifest; all but the last of them
+        # were closed without their manifest line being written
+        segment = max(self._closed) + 1 if self._closed else 0
+        index = _parse_index(_decode(await storage.get_file(_index_path(segment))))
+        while await storage.file_exists(_index_path(segment + 1)):
+            summary = SegmentSummary(segment)
+            for entry in index.values():
+                summary.add(entry)
+            if await storage.append_file(EXECUTION_MANIFEST_PATH, summary.to_json() + "\n"):
+                logger.info(f"Recorded execution log segment {segment} in the manifest")
+            self._closed[segment] = summary
+            segment += 1
+            index = _parse_index(_decode(await storage.get_file(_index_path(segment))))
+
+        self._segment = segment
+        self._open_index = index
+        self._open_summary = SegmentSummary(segment)
+        for entry in index.values():
+            self._open_summary.add(entry)
+
+        # Measure the open segment itself, as a record whose index entry failed
+        # to be written still takes up a line
+        segment_content = await storage.get_file(_segment_path(segment)) or b""
+        if isinstance(segment_content, str):
+            segment_content = segment_content.encode('utf-8')
+        self._segment_records = segment_content.count(b"\n")
+        self._segment_bytes = len(segment_content)
+
+        self._index_loaded = True
+
+    def _cache_index(self, segment: int, index: "OrderedDict[str, IndexEntry]"):
+        self._index_cache[segment] = index
+        self._index_cache.move_to_end(segment)
+        while len(self._index_cache) > self.index_cache_segments:
+            self._index_cache.popitem(last=False)
+
+    async def _get_segment_index(self, segment: int) -> "OrderedDict[str, IndexEntry]":
+        """Get a segment's index, loading closed segments on demand"""
+        if segment == self._segment:
+            return self._open_index
+
+        index = self._index_cache.get(segment)
+        if index is None:
+            storage = await get_storage_backend()
+            index = _parse_index(_decode(await storage.get_file(_index_path(segment))))
+            self._cache_index(segment, index)
+        else:
+            self._index_cache.move_to_end(segment)
+        return index
+
+    def _evict(self):
+        """Drop expired and least recently used entries that are in the log, or were given up on"""
+        now = time.monotonic()
+        for execution_id in list(self._memory):
+            execution, accessed_at = self._memory[execution_id]
+            over_capacity = len(self._memory) > self.max_entries
+            expired = now - accessed_at > self.ttl_seconds
+            if not (over_capacity or expired):
+                break
+            # Running executions and ones still being written stay in memory
+            if execution_id in self._persisted or execution_id in self._abandoned:
+                del self._memory[execution_id]
+                self._persisted.discard(execution_id)
+                self._abandoned.discard(execution_id)
+
+    def _get_cached(self, execution_id: str) -> Optional[WorkflowExecution]:
+        cached = self._memory.get(execution_id)
+        if cached is None:
+            return None
+        self._memory[execution_id] = (cached[0], time.monotonic())
+        self._memory.move_to_end(execution_id)
+        return cached[0]
+
+    async def _find_entry(self, execution_id: str) -> Optional[IndexEntry]:
+        """Find an execution's index entry, searching segments newest first"""
+        await self._ensure_index()
+        for segment in range(self._segment, -1, -1):
+            if segment != self._segment and segment not in self._closed:
+                continue
+            entry = (await self._get_segment_index(segment)).get(execution_id)
+            if entry is not None:
+                return entry
+        return None
+
+    async def get(self, execution_id: str) -> Optional[WorkflowExecution]:
+        """Get an execution by id, from memory or the log"""
+        execution = self._get_cached(execution_id)
+        if execution is not None:
+            return execution
+
+        entry = await self._find_entry(execution_id)
+        if entry is None:
+            return None
+
+        storage = await get_storage_backend()
+        record = await storage.get_file_range(_segment_path(entry.segment), entry.offset, entry.length)
+        if not record:
+            logger.error(f"Execution {execution_id} is indexed but missing from its log segment")
+            return None
+
+        return WorkflowExecution.model_validate_json(record)
+
+    async def get_trace(self, execution_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Get the execution trace of an execution, or None if the execution is unknown"""
+        execution = await self.get(execution_id)
+        if execution is None:
+            return None
+        return (execution.result or {}).get('execution_trace', [])
+
+    async def query(self, workflow_id: Optional[str] = None, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None, offset: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """
+        List execution summaries, newest first, optionally filtered by workflow and
+        by creation time (start inclusive, end exclusive). Includes running executions.
+
+        Segments are visited newest first and loaded only while they can still
+        hold an item of the requested page; counts come from segment summaries
+        unless a segment straddles the time range.
+        """
+        await self._ensure_index()
+
+        def matches(entry_workflow_id: str, created_at: datetime) -> bool:
+            return ((not workflow_id or entry_workflow_id == workflow_id)
+                    and (start is None or created_at >= start) and (end is None or created_at < end))
+
+        # Executions not in the log yet (running, being written, or given up on)
+        found = {
+            execution.execution_id: (execution.created_at, _summarize(execution))
+            for execution, _ in self._memory.values()
+            if execution.execution_id not in self._persisted and matches(execution.workflow_id, execution.created_at)
+        }
+        total = len(found)
+
+        summaries = [self._open_summary] + [self._closed[segment] for segment in self._closed]
+        summaries = [summary for summary in summaries if summary.matching(workflow_id)
+                     and (start is None or summary.max_created_at >= start)
+                     and (end is None or summary.min_created_at < end)]
+
+        straddling = []
+        for summary in summaries:
+            if ((start is None or summary.min_created_at >= start)
+                    and (end is None or summary.max_created_at < end)):
+                total += summary.matching(workflow_id)
+            else:
+                straddling.append(summary.segment)
+        for segment in straddling:
+            index = await self._get_segment_index(segment)
+            total += sum(1 for entry in index.values() if matches(entry.workflow_id, entry.created_at))
+
+        needed = offset + limit
+        newest = []
+        for summary in sorted(summaries, key=lambda summary: summary.max_created_at, reverse=True):
+            if len(newest) >= needed and newest[needed - 1] > summary.max_created_at:
+                # Every remaining entry is older than the last item of the page
+                break
+            for entry in (await self._get_segment_index(summary.segment)).values():
+                if entry.execution_id not in found and matches(entry.workflow_id, entry.created_at):
+                    found[entry.execution_id] = (entry.created_at, entry.summary())
+            newest = sorted((created_at for created_at, _ in found.values()), reverse=True)
+
+        matching = sorted(found.values(), key=lambda item: item[0], reverse=True)
+        return {
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'items': [summary for _, summary in matching[offset:offset + limit]],
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        return {
+            'memory_entries': len(self._memory),
+            'max_memory_entries': self.max_entries,
+            'indexed_executions': sum(summary.count for summary in self._closed.values()) + self._open_summary.count,
+            'segments': self._segment + 1 if self._open_summary.count or self._closed else 0,
+            'cached_segment_indexes': len(self._index_cache),
+            'pending_writes': len(self._pending_writes),
+            'failed_writes': self.failed_writes,
+        }
+
+
+# Global execution store instance
+execution_store = ExecutionStore(
+    max_entries=settings.execution_store_max_entries,
+    ttl_seconds=settings.execution_store_ttl_seconds,
+    segment_max_records=settings.execution_log_segment_max_records,
+    index_cache_segments=settings.execution_log_index_cache_segments,
+    max_write_retries=settings.execution_log_max_write_retries,
+)
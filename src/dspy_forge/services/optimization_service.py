@@ -14,9 +14,11 @@ from dspy import GEPA, BootstrapFewShotWithRandomSearch, MIPROv2
 from dspy_forge.core.config import settings
 from dspy_forge.core.logging import get_logger
 from dspy_forge.core.lm_config import create_lm
+from dspy_forge.core.metrics import SERVICE_METRICS
 from dspy_forge.models.workflow import Workflow
 from dspy_forge.core.dspy_runtime import CompoundProgram
-from dspy_forge.services.execution_service import ExecutionContext
+from dspy_forge.core.execution_context import ExecutionContext
+from dspy_forge.core.program_cache import program_cache
 from dspy_forge.storage.factory import get_storage_backend
 
 logger = get_logger(__name__)
@@ -278,6 +280,43 @@ class OptimizationService:
         else:
             raise ValueError(f"Unknown optimizer: {optimizer_name}")
 
+    async def _save_optimized_program(self, workflow_id: str, optimized_program: CompoundProgram) -> str:
+        """Save an optimized program as the workflow's program.json and drop programs cached from the old one"""
+        storage = await get_storage_backend()
+
+        # Create temp directory for optimized program
+        # Note: DSPy's save with save_program=True requires a directory, not a file
+        temp_dir = tempfile.mkdtemp()
+        state_file = os.path.join(temp_dir, "program.json")
+        try:
+            # Save optimized program to temp directory
+            optimized_program.save(state_file, save_program=False)
+
+            with open(state_file, 'r') as f:
+                optimized_content = f.read()
+
+            logger.debug(f"Saved file size: {len(optimized_content)} bytes")
+
+            # Save to storage backend
+            optimized_path = f"workflows/{workflow_id}/program.json"
+            success = await storage.save_file(optimized_path, optimized_content)
+
+            if not success:
+                raise RuntimeError("Failed to save optimized program")
+
+            logger.info(f"Saved optimized program to {optimized_path}")
+            await storage.set_workflow_optimized(workflow_id)
+
+            # Cached programs were built from the previous program.json
+            program_cache.invalidate(workflow_id)
+
+        finally:
+            # Clean up temp directory
+            if os.path.exists(temp_dir):
+                shutil.rmtree(temp_dir)
+
+        return optimized_path
+
     async def optimize_workflow_async(
         self,
         workflow: Workflow,
@@ -289,6 +328,8 @@ class OptimizationService:
         optimization_id: str
     ):
         """Execute workflow optimization asynchronously"""
+        metrics_started_at = SERVICE_METRICS.start("optimization")
+        error = None
         try:
             status = {
                 "status": "initializing",
@@ -374,35 +415,7 @@ class OptimizationService:
 
             logger.info(f"Saving optimized program for workflow {workflow.id}")
 
-            # Save optimized program to storage
-            storage = await get_storage_backend()
-
-            # Create temp directory for optimized program
-            # Note: DSPy's save with save_program=True requires a directory, not a file
-            temp_dir = tempfile.mkdtemp()
-            state_file = os.path.join(temp_dir, "program.json")
-            try:
-                # Save optimized program to temp directory
-                optimized_program.save(state_file, save_program=False)
-
-                with open(state_file, 'r') as f:
-                    optimized_content = f.read()
-
-                logger.debug(f"Saved file size: {len(optimized_content)} bytes")
-
-                # Save to storage backend
-                optimized_path = f"workflows/{workflow.id}/program.json"
-                success = await storage.save_file(optimized_path, optimized_content)
-
-                if not success:
-                    raise RuntimeError("Failed to save optimized program")
-
-                logger.info(f"Saved optimized program to {optimized_path}")
-
-            finally:
-                # Clean up temp directory
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
+            optimized_path = await self._save_optimized_program(workflow.id, optimized_program)
 
             # Success - update status
             status.update({
@@ -416,6 +429,7 @@ class OptimizationService:
             logger.info(f"Successfully optimized workflow {workflow.id} with {optimizer_name}")
 
         except Exception as e:
+            error = e
             error_msg = f"Optimization failed: {str(e)}"
             logger.error(f"Optimization failed for {optimization_id}: {error_msg}", exc_info=True)
 
@@ -426,6 +440,9 @@ class OptimizationService:
             })
             await self._save_optimization_status(optimization_id, status)
 
+        finally:
+            SERVICE_METRICS.finish(metrics_started_at, "optimization", error=error)
+
     async def get_optimization_status(self, optimization_id: str) -> Optional[Dict[str, Any]]:
         """Get optimization status by ID"""
         return await self._load_optimization_status(optimization_id)
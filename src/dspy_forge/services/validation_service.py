@@ -1,9 +1,17 @@
+import hashlib
+import json
+import threading
+
+from collections import OrderedDict
 from typing import Dict, List, Any, Tuple, Optional
 import networkx as nx
 
 from dspy_forge.models.workflow import Workflow, NodeType
+from dspy_forge.core.config import settings
+from dspy_forge.core.execution_plan import ExecutionPlan
 from dspy_forge.core.dspy_types import DSPyModuleType, DSPyLogicType
 from dspy_forge.core.logging import get_logger
+from dspy_forge.core.tracing import start_span
 
 logger = get_logger(__name__)
 
@@ -13,11 +21,111 @@ class WorkflowValidationError(Exception):
     pass
 
 
+# Cached results are tuples of error lists, e.g. (errors before node errors, errors after)
+CachedErrors = Tuple[Tuple[str, ...], ...]
+
+# Estimated bytes per cache entry on top of its key and error strings
+_ENTRY_OVERHEAD_BYTES = 256
+
+
+def _content_hash(content: Any) -> str:
+    """Stable hash of JSON-serializable content (unlike hash(), not salted per process)"""
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def node_content_hash(node: Any) -> str:
+    """Hash of everything node validation looks at: the node's ID, type and data"""
+    return _content_hash([node.id, node.type.value, node.data])
+
+
+def topology_hash(workflow: Workflow) -> str:
+    """
+    Hash of everything the graph-wide checks look at: node IDs, types and
+    start/end flags, and edge IDs and endpoints, in workflow order
+    """
+    nodes = [
+        (node.id, node.type.value,
+         bool(node.data.get('is_start') or node.data.get('isStart')),
+         bool(node.data.get('is_end') or node.data.get('isEnd')))
+        for node in workflow.nodes
+    ]
+    edges = [(edge.id, edge.source, edge.target) for edge in workflow.edges]
+    return _content_hash([nodes, edges])
+
+
+class ValidationResultCache:
+    """LRU cache of validation errors, capped by the estimated memory of its entries"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[CachedErrors, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[CachedErrors]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple[str, str, str], value: CachedErrors):
+        size = _ENTRY_OVERHEAD_BYTES + sum(map(len, key)) + sum(len(error) for part in value for error in part)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self, workflow_id: Optional[str] = None):
+        """Drop the entries of one workflow, or all entries"""
+        with self._lock:
+            if workflow_id is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+
+            for key in [key for key in self._entries if key[0] == workflow_id]:
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: Tuple[str, str, str]):
+        _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
 class WorkflowValidationService:
     """Service for validating workflow structure and integrity"""
     
     def __init__(self):
-        self.validation_cache: Dict[str, Tuple[bool, List[str]]] = {}
+        # Per-node results keyed by node content hash, and graph-wide results keyed
+        # by topology hash, so an edit only re-validates what it changed
+        self.validation_cache = ValidationResultCache(settings.validation_cache_max_bytes)
     
     def validate_workflow(self, workflow: Workflow) -> List[str]:
         """
@@ -29,32 +137,28 @@ class WorkflowValidationService:
         Returns:
             List of validation error messages
         """
-        # Check cache first
-        cache_key = self._get_cache_key(workflow)
-        if cache_key in self.validation_cache:
-            is_valid, errors = self.validation_cache[cache_key]
-            return errors
-        
-        errors = []
-        
         try:
-            # Structural validation
-            errors.extend(self._validate_structure(workflow))
-            
-            # Connectivity validation  
-            errors.extend(self._validate_connectivity(workflow))
-            
-            # Node-specific validation
-            errors.extend(self._validate_nodes(workflow))
-            
-            # Execution flow validation
-            errors.extend(self._validate_execution_flow(workflow))
-            
-            # Cache the result
-            is_valid = len(errors) == 0
-            self.validation_cache[cache_key] = (is_valid, errors)
-            
-            return errors
+            # Graph-wide checks only depend on the topology, so node data edits reuse them
+            topology_key = (workflow.id, 'graph', topology_hash(workflow))
+            graph_errors = self.validation_cache.get(topology_key)
+            if graph_errors is None:
+                # Index the workflow once for all graph checks
+                plan = ExecutionPlan(workflow)
+
+                # Structural and connectivity validation
+                errors_before_nodes = self._validate_structure(workflow, plan)
+                errors_before_nodes.extend(self._validate_connectivity(workflow, plan))
+
+                # Execution flow validation
+                errors_after_nodes = self._validate_execution_flow(workflow, plan)
+
+                graph_errors = (tuple(errors_before_nodes), tuple(errors_after_nodes))
+                self.validation_cache.put(topology_key, graph_errors)
+
+            # Node-specific validation, re-run only for nodes whose content changed
+            node_errors = self._validate_nodes(workflow)
+
+            return list(graph_errors[0]) + node_errors + list(graph_errors[1])
             
         except Exception as e:
             logger.error(f"Validation failed for workflow {workflow.id}: {e}")
@@ -71,13 +175,21 @@ class WorkflowValidationService:
             List of execution-specific validation errors
         """
         errors = []
-        
-        # First run standard validation
-        errors.extend(self.validate_workflow(workflow))
-        
-        # Execution-specific checks
-        errors.extend(self._validate_execution_readiness(workflow))
-        
+
+        with start_span("workflow.validate", {'workflow.id': workflow.id}) as span:
+            # First run standard validation
+            errors.extend(self.validate_workflow(workflow))
+
+            # Execution-specific checks, which also only depend on the topology
+            readiness_key = (workflow.id, 'readiness', topology_hash(workflow))
+            readiness_errors = self.validation_cache.get(readiness_key)
+            if readiness_errors is None:
+                readiness_errors = (tuple(self._validate_execution_readiness(workflow, ExecutionPlan(workflow))),)
+                self.validation_cache.put(readiness_key, readiness_errors)
+            errors.extend(readiness_errors[0])
+
+            span.set_attribute('workflow.validation_errors', len(errors))
+
         return errors
     
     def is_workflow_valid(self, workflow: Workflow) -> bool:
@@ -87,47 +199,22 @@ class WorkflowValidationService:
     
     def clear_cache(self, workflow_id: str = None):
         """Clear validation cache for specific workflow or all workflows"""
-        if workflow_id:
-            # Remove specific workflow from cache
-            keys_to_remove = [k for k in self.validation_cache.keys() if workflow_id in k]
-            for key in keys_to_remove:
-                del self.validation_cache[key]
-        else:
-            # Clear entire cache
-            self.validation_cache.clear()
+        self.validation_cache.clear(workflow_id)
     
-    def _get_cache_key(self, workflow: Workflow) -> str:
-        """Generate cache key for workflow validation"""
-        # Create a simple hash based on workflow structure
-        node_data = [(n.id, n.type.value, str(n.data)) for n in workflow.nodes]
-        edge_data = [(e.source, e.target) for e in workflow.edges]
-        return f"{workflow.id}_{hash(str(node_data + edge_data))}"
-    
-    def _validate_structure(self, workflow: Workflow) -> List[str]:
+    def _validate_structure(self, workflow: Workflow, plan: ExecutionPlan) -> List[str]:
         """Validate basic workflow structure"""
         errors = []
         
         # Check for at least one start node
-        start_nodes = [
-            node for node in workflow.nodes 
-            if node.type == NodeType.SIGNATURE_FIELD and (node.data.get('is_start', False) or node.data.get('isStart', False))
-        ]
-        
-        if not start_nodes:
+        if not plan.start_nodes:
             errors.append("Workflow must have at least one start node")
         
         # Check for at least one end node
-        end_nodes = [
-            node for node in workflow.nodes 
-            if node.type == NodeType.SIGNATURE_FIELD and (node.data.get('is_end', False) or node.data.get('isEnd', False))
-        ]
-        
-        if not end_nodes:
+        if not plan.end_nodes:
             errors.append("Workflow must have at least one end node")
         
         # Check for duplicate node IDs
-        node_ids = [node.id for node in workflow.nodes]
-        if len(node_ids) != len(set(node_ids)):
+        if len(plan.node_ids) != len(plan.nodes):
             errors.append("Workflow contains duplicate node IDs")
         
         # Check for duplicate edge IDs
@@ -137,20 +224,17 @@ class WorkflowValidationService:
         
         return errors
     
-    def _validate_connectivity(self, workflow: Workflow) -> List[str]:
+    def _validate_connectivity(self, workflow: Workflow, plan: ExecutionPlan) -> List[str]:
         """Validate workflow connectivity and graph properties"""
         errors = []
         
         try:
-            # Build graph for connectivity check
-            graph = self._build_workflow_graph(workflow)
-            
             # Check if workflow is connected
-            if not nx.is_weakly_connected(graph):
+            if not nx.is_weakly_connected(plan.graph):
                 errors.append("Workflow must be connected (no isolated nodes)")
             
             # Check for cycles (DSPy workflows should be DAGs)
-            if not nx.is_directed_acyclic_graph(graph):
+            if not plan.is_acyclic:
                 errors.append("Workflow cannot contain cycles")
             
             # Check for orphaned nodes
@@ -159,28 +243,22 @@ class WorkflowValidationService:
                     continue
                     
                 # Start nodes shouldn't have incoming edges (except from other start nodes)
-                if node.data.get('is_start', False) or node.data.get('isStart', False):
-                    incoming = [e for e in workflow.edges if e.target == node.id]
-                    if incoming:
-                        non_start_incoming = []
-                        for edge in incoming:
-                            source_node = next((n for n in workflow.nodes if n.id == edge.source), None)
-                            if source_node and not (source_node.data.get('is_start', False) or source_node.data.get('isStart', False)):
-                                non_start_incoming.append(edge)
-                        if non_start_incoming:
-                            errors.append(f"Start node {node.id} has incoming edges from non-start nodes")
+                if node.id in plan.start_node_set:
+                    non_start_incoming = [
+                        edge for edge in plan.get_incoming_edges(node.id)
+                        if edge.source in plan.nodes and edge.source not in plan.start_node_set
+                    ]
+                    if non_start_incoming:
+                        errors.append(f"Start node {node.id} has incoming edges from non-start nodes")
                 
                 # End nodes shouldn't have outgoing edges (except to other end nodes)
-                if node.data.get('is_end', False) or node.data.get('isEnd', False):
-                    outgoing = [e for e in workflow.edges if e.source == node.id]
-                    if outgoing:
-                        non_end_outgoing = []
-                        for edge in outgoing:
-                            target_node = next((n for n in workflow.nodes if n.id == edge.target), None)
-                            if target_node and not (target_node.data.get('is_end', False) or target_node.data.get('isEnd', False)):
-                                non_end_outgoing.append(edge)
-                        if non_end_outgoing:
-                            errors.append(f"End node {node.id} has outgoing edges to non-end nodes")
+                if node.id in plan.end_node_set:
+                    non_end_outgoing = [
+                        edge for edge in plan.get_outgoing_edges(node.id)
+                        if edge.target in plan.nodes and edge.target not in plan.end_node_set
+                    ]
+                    if non_end_outgoing:
+                        errors.append(f"End node {node.id} has outgoing edges to non-end nodes")
             
         except Exception as e:
             errors.append(f"Graph validation failed: {str(e)}")
@@ -188,12 +266,16 @@ class WorkflowValidationService:
         return errors
     
     def _validate_nodes(self, workflow: Workflow) -> List[str]:
-        """Validate individual nodes"""
+        """Validate individual nodes, reusing cached results for unchanged nodes"""
         errors = []
         
         for node in workflow.nodes:
-            node_errors = self._validate_node(node, workflow)
-            errors.extend([f"Node {node.id}: {error}" for error in node_errors])
+            cache_key = (workflow.id, 'node', node_content_hash(node))
+            node_errors = self.validation_cache.get(cache_key)
+            if node_errors is None:
+                node_errors = (tuple(f"Node {node.id}: {error}" for error in self._validate_node(node, workflow)),)
+                self.validation_cache.put(cache_key, node_errors)
+            errors.extend(node_errors[0])
         
         return errors
     
@@ -296,44 +378,36 @@ class WorkflowValidationService:
         
         return errors
     
-    def _validate_execution_flow(self, workflow: Workflow) -> List[str]:
+    def _validate_execution_flow(self, workflow: Workflow, plan: ExecutionPlan) -> List[str]:
         """Validate execution flow and dependencies"""
         errors = []
         
         try:
             # Check if execution order can be determined
-            graph = self._build_workflow_graph(workflow)
-            
-            try:
-                execution_order = list(nx.topological_sort(graph))
-                
-                # Validate that all nodes can be reached from start nodes
-                start_nodes = [
-                    node.id for node in workflow.nodes 
-                    if node.type == NodeType.SIGNATURE_FIELD and (node.data.get('is_start', False) or node.data.get('isStart', False))
-                ]
-                
-                reachable_nodes = set()
-                for start_node in start_nodes:
-                    descendants = nx.descendants(graph, start_node)
-                    reachable_nodes.update(descendants)
-                    reachable_nodes.add(start_node)
+            if not plan.is_acyclic:
+                errors.append("Cannot determine execution order: workflow contains a cycle")
+            else:
+                # Validate that all nodes can be reached from start nodes, with a
+                # single traversal seeded from every start node
+                reachable_nodes = set(plan.start_nodes)
+                stack = list(plan.start_nodes)
+                while stack:
+                    for successor in plan.successors.get(stack.pop(), ()):
+                        if successor not in reachable_nodes:
+                            reachable_nodes.add(successor)
+                            stack.append(successor)
                 
-                all_nodes = set(node.id for node in workflow.nodes)
-                unreachable_nodes = all_nodes - reachable_nodes
+                unreachable_nodes = set(plan.nodes) - reachable_nodes
                 
                 if unreachable_nodes:
                     errors.append(f"Unreachable nodes: {', '.join(unreachable_nodes)}")
                 
-            except nx.NetworkXError as e:
-                errors.append(f"Cannot determine execution order: {e}")
-                
         except Exception as e:
             errors.append(f"Execution flow validation failed: {str(e)}")
         
         return errors
     
-    def _validate_execution_readiness(self, workflow: Workflow) -> List[str]:
+    def _validate_execution_readiness(self, workflow: Workflow, plan: ExecutionPlan) -> List[str]:
         """Additional validation for execution readiness"""
         errors = []
         
@@ -341,30 +415,14 @@ class WorkflowValidationService:
         for node in workflow.nodes:
             if node.type == NodeType.MODULE:
                 # Check for input connections
-                incoming_edges = [e for e in workflow.edges if e.target == node.id]
-                if not incoming_edges:
+                if not plan.get_incoming_edges(node.id):
                     errors.append(f"Module node {node.id} has no input connections")
                 
                 # Check for output connections
-                outgoing_edges = [e for e in workflow.edges if e.source == node.id]
-                if not outgoing_edges:
+                if not plan.get_outgoing_edges(node.id):
                     errors.append(f"Module node {node.id} has no output connections")
         
         return errors
-    
-    def _build_workflow_graph(self, workflow: Workflow) -> nx.DiGraph:
-        """Build NetworkX graph from workflow"""
-        graph = nx.DiGraph()
-        
-        # Add nodes
-        for node in workflow.nodes:
-            graph.add_node(node.id, data=node.data, type=node.type)
-        
-        # Add edges
-        for edge in workflow.edges:
-            graph.add_edge(edge.source, edge.target)
-        
-        return graph
 
 
 class OptimizationValidationError(Exception):
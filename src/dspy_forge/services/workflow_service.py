@@ -1,14 +1,18 @@
+import asyncio
 import uuid
 import time
 import random
 import string
 import json
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 from dspy_forge.models.workflow import Workflow
 from dspy_forge.storage.factory import get_storage_backend
 from dspy_forge.services.validation_service import validation_service, WorkflowValidationError
+from dspy_forge.core.program_cache import program_cache
+from dspy_forge.core.lm_cache import get_lm_response_cache
+from dspy_forge.core.semantic_cache import get_semantic_cache
 from dspy_forge.core.logging import get_logger
 
 
@@ -154,6 +158,12 @@ class WorkflowService:
             self.logger.error(f"Failed to list workflows: {e}")
             return []
 
+    async def list_workflow_summaries(self, offset: int = 0, limit: int = 50, sort_by: str = "updated_at",
+                                      descending: bool = True) -> Dict[str, Any]:
+        """List workflow summaries from the storage catalog, without loading workflows"""
+        storage = await get_storage_backend()
+        return await storage.list_workflow_summaries(offset, limit, sort_by, descending)
+
     async def update_workflow(self, workflow_id: str, workflow_data: dict) -> Optional[Workflow]:
         """Update an existing workflow"""
         try:
@@ -200,6 +210,14 @@ class WorkflowService:
             success = await storage.delete_workflow(workflow_id)
             
             if success:
+                program_cache.invalidate(workflow_id)
+                lm_cache = get_lm_response_cache()
+                if lm_cache is not None:
+                    # Deletes from the SQLite tier block, so they run in a worker thread
+                    await asyncio.to_thread(lm_cache.clear, workflow_id)
+                semantic_cache = get_semantic_cache()
+                if semantic_cache is not None:
+                    semantic_cache.invalidate(workflow_id)
                 self.logger.info(f"Successfully deleted workflow: {workflow_id}")
             
             return success
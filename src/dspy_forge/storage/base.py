@@ -1,11 +1,33 @@
+import functools
+import inspect
+
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 
+from dspy_forge.core.metrics import STORAGE_METRICS
+from dspy_forge.core.tracing import start_span
 from dspy_forge.models.workflow import Workflow
 
 
+def _track_storage_operation(backend: str, method):
+    """Wrap a backend coroutine method so each call is recorded in the storage metrics and as a span"""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        with STORAGE_METRICS.track(backend, method.__name__), \
+                start_span(f"storage.{method.__name__}", {"storage.backend": backend}):
+            return await method(*args, **kwargs)
+    return wrapper
+
+
 class StorageBackend(ABC):
     """Abstract base class for unified storage backends (workflows, deployments, artifacts)"""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Instrument the public async methods each backend implements
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith('_') and inspect.iscoroutinefunction(attr):
+                setattr(cls, name, _track_storage_operation(cls.__name__, attr))
     
     @abstractmethod
     async def save_workflow(self, workflow: Workflow) -> bool:
@@ -42,7 +64,38 @@ class StorageBackend(ABC):
             List of all workflows
         """
         pass
-    
+
+    @abstractmethod
+    async def list_workflow_summaries(self, offset: int = 0, limit: int = 50, sort_by: str = "updated_at",
+                                      descending: bool = True) -> Dict[str, Any]:
+        """
+        List workflow summaries from the workflow catalog, without loading workflows
+
+        Args:
+            offset: Number of summaries to skip
+            limit: Maximum number of summaries to return
+            sort_by: Summary field to sort by (see catalog.SORT_FIELDS)
+            descending: Sort in descending order
+
+        Returns:
+            Dictionary with the total workflow count, offset, limit and summary items
+        """
+        pass
+
+    @abstractmethod
+    async def set_workflow_optimized(self, workflow_id: str, has_optimization: bool = True) -> bool:
+        """
+        Record in the workflow catalog whether a workflow has an optimized program
+
+        Args:
+            workflow_id: The workflow ID
+            has_optimization: Whether workflows/<id>/program.json exists
+
+        Returns:
+            True if successful, False otherwise
+        """
+        pass
+
     @abstractmethod
     async def delete_workflow(self, workflow_id: str) -> bool:
         """
@@ -160,6 +213,20 @@ class StorageBackend(ABC):
         """
         pass
 
+    @abstractmethod
+    async def append_file(self, path: str, content: str) -> bool:
+        """
+        Append content to a file, creating it if needed
+
+        Args:
+            path: Relative path within storage
+            content: Content to append
+
+        Returns:
+            True if successful, False otherwise
+        """
+        pass
+
     @abstractmethod
     async def get_file(self, path: str) -> Optional[str]:
         """
@@ -173,6 +240,21 @@ class StorageBackend(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_file_range(self, path: str, offset: int, length: int) -> Optional[str]:
+        """
+        Get part of a file's content
+
+        Args:
+            path: Relative path within storage
+            offset: Byte offset to start reading at
+            length: Number of bytes to read
+
+        Returns:
+            The content of the range if the file is found, None otherwise
+        """
+        pass
+
     @abstractmethod
     async def copy_file(self, src_path: str, dest_path: str) -> bool:
         """
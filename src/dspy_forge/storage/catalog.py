@@ -0,0 +1,218 @@
+"""
+Workflow catalog index.
+
+Keeps a summary of every stored workflow (id, name, description, timestamps,
+node and edge counts, whether it has an optimized program.json, and the size of
+its stored JSON) so workflows can be listed, sorted and paginated without
+loading their graphs. Storage backends update the catalog when they save or
+delete a workflow.
+
+The catalog is an append-only JSONL log of upsert and delete records on the
+storage backend, replayed into memory on first use and rewritten with only the
+live summaries once superseded records outnumber them. If the log does not
+exist yet, or an update could not be recorded, it is rebuilt once from the
+stored workflows.
+
+Log layout:
+    catalog/workflows.jsonl
+"""
+import asyncio
+import json
+
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple, get_args
+
+from dspy_forge.core.logging import get_logger
+from dspy_forge.models.workflow import Workflow
+
+if TYPE_CHECKING:
+    from dspy_forge.storage.base import StorageBackend
+
+logger = get_logger(__name__)
+
+CATALOG_PATH = "catalog/workflows.jsonl"
+SortField = Literal["updated_at", "created_at", "name", "node_count", "edge_count", "size"]
+SORT_FIELDS: Tuple[str, ...] = get_args(SortField)
+
+# Log records kept before a compaction is considered
+_COMPACTION_MIN_RECORDS = 64
+
+
+def serialize_workflow(workflow: Workflow) -> str:
+    """Serialize a workflow as stored by the storage backends"""
+    # Convert datetime objects to strings for JSON serialization
+    return json.dumps(workflow.model_dump(), indent=2, default=str)
+
+
+def optimized_program_path(workflow_id: str) -> str:
+    return f"workflows/{workflow_id}/program.json"
+
+
+def workflow_summary(workflow: Workflow, size: int, has_optimization: bool) -> Dict[str, Any]:
+    return {
+        'id': workflow.id,
+        'name': workflow.name,
+        'description': workflow.description,
+        'created_at': workflow.created_at.isoformat(),
+        'updated_at': workflow.updated_at.isoformat(),
+        'node_count': len(workflow.nodes),
+        'edge_count': len(workflow.edges),
+        'has_optimization': has_optimization,
+        'size': size,
+    }
+
+
+class WorkflowCatalog:
+    """In-memory workflow summaries over an append-only catalog log"""
+
+    def __init__(self, storage: "StorageBackend"):
+        self.storage = storage
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._sorted: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}  # (sort field, descending) -> summaries
+        self._loaded = False
+        self._needs_rebuild = False
+        self._log_records = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def put(self, workflow: Workflow, size: int):
+        """Record a saved workflow"""
+        async with self._get_lock():
+            try:
+                await self._load()
+                previous = self._entries.get(workflow.id)
+                if previous is not None:
+                    has_optimization = previous['has_optimization']
+                else:
+                    has_optimization = await self.storage.file_exists(optimized_program_path(workflow.id))
+
+                summary = workflow_summary(workflow, size, has_optimization)
+                self._set(workflow.id, summary)
+                await self._append({'op': 'put', 'summary': summary})
+            except Exception as e:
+                self._invalidate(f"Failed to record workflow {workflow.id} in the catalog: {e}")
+
+    async def remove(self, workflow_id: str):
+        """Record a deleted workflow"""
+        async with self._get_lock():
+            try:
+                await self._load()
+                if workflow_id in self._entries:
+                    self._set(workflow_id, None)
+                    await self._append({'op': 'delete', 'id': workflow_id})
+            except Exception as e:
+                self._invalidate(f"Failed to remove workflow {workflow_id} from the catalog: {e}")
+
+    async def set_optimized(self, workflow_id: str, has_optimization: bool = True):
+        """Record whether a workflow has an optimized program"""
+        async with self._get_lock():
+            try:
+                await self._load()
+                summary = self._entries.get(workflow_id)
+                if summary is not None and summary['has_optimization'] != has_optimization:
+                    summary = {**summary, 'has_optimization': has_optimization}
+                    self._set(workflow_id, summary)
+                    await self._append({'op': 'put', 'summary': summary})
+            except Exception as e:
+                self._invalidate(f"Failed to update workflow {workflow_id} in the catalog: {e}")
+
+    async def list_summaries(self, offset: int = 0, limit: int = 50, sort_by: str = "updated_at",
+                             descending: bool = True) -> Dict[str, Any]:
+        """List workflow summaries sorted by one of SORT_FIELDS, with pagination"""
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort workflows by {sort_by}, expected one of {', '.join(SORT_FIELDS)}")
+
+        async with self._get_lock():
+            await self._load()
+            ordered = self._sorted.get((sort_by, descending))
+            if ordered is None:
+                ordered = sorted(self._entries.values(), key=lambda summary: (_sort_value(summary, sort_by),
+                                                                              summary['id']), reverse=descending)
+                self._sorted[(sort_by, descending)] = ordered
+
+        return {
+            'total': len(ordered),
+            'offset': offset,
+            'limit': limit,
+            'items': ordered[offset:offset + limit],
+        }
+
+    def _set(self, workflow_id: str, summary: Optional[Dict[str, Any]]):
+        if summary is None:
+            self._entries.pop(workflow_id, None)
+        else:
+            self._entries[workflow_id] = summary
+        self._sorted.clear()
+
+    def _invalidate(self, message: str):
+        """Rebuild the catalog on next use, as the log may have missed an update"""
+        logger.warning(f"{message}, the catalog will be rebuilt")
+        self._loaded = False
+        self._needs_rebuild = True
+
+    async def _load(self):
+        if self._loaded:
+            return
+
+        content = None if self._needs_rebuild else await self.storage.get_file(CATALOG_PATH)
+        if content is None:
+            await self._rebuild()
+        else:
+            entries = {}
+            records = 0
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping malformed workflow catalog record")
+                    continue
+                if record.get('op') == 'put':
+                    entries[record['summary']['id']] = record['summary']
+                elif record.get('op') == 'delete':
+                    entries.pop(record.get('id'), None)
+                records += 1
+            self._entries = entries
+            self._log_records = records
+
+        self._sorted.clear()
+        self._loaded = True
+        self._needs_rebuild = False
+
+    async def _rebuild(self):
+        """Build the catalog from the stored workflows"""
+        entries = {}
+        for workflow in await self.storage.list_workflows():
+            has_optimization = await self.storage.file_exists(optimized_program_path(workflow.id))
+            size = len(serialize_workflow(workflow).encode('utf-8'))
+            entries[workflow.id] = workflow_summary(workflow, size, has_optimization)
+
+        self._entries = entries
+        await self._compact()
+        logger.info(f"Built workflow catalog with {len(entries)} workflows")
+
+    async def _append(self, record: Dict[str, Any]):
+        if not await self.storage.append_file(CATALOG_PATH, json.dumps(record) + "\n"):
+            raise RuntimeError("Failed to append to the workflow catalog")
+        self._log_records += 1
+
+        if self._log_records > max(2 * len(self._entries), _COMPACTION_MIN_RECORDS):
+            await self._compact()
+
+    async def _compact(self):
+        """Rewrite the log with one record per live workflow"""
+        content = "".join(json.dumps({'op': 'put', 'summary': summary}) + "\n" for summary in self._entries.values())
+        if not await self.storage.save_file(CATALOG_PATH, content):
+            raise RuntimeError("Failed to write the workflow catalog")
+        self._log_records = len(self._entries)
+
+
+def _sort_value(summary: Dict[str, Any], sort_by: str) -> Any:
+    value = summary.get(sort_by)
+    if sort_by == 'name':
+        return (value or '').lower()
+    return value if value is not None else ''
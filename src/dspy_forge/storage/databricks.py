@@ -1,11 +1,15 @@
 import json
 import asyncio
 import os
+import urllib.parse
+import weakref
 from typing import List, Optional, Dict, Any
 
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import NotFound
 
 from dspy_forge.storage.base import StorageBackend
+from dspy_forge.storage.catalog import WorkflowCatalog, serialize_workflow
 from dspy_forge.models.workflow import Workflow
 from dspy_forge.core.logging import get_logger
 
@@ -24,6 +28,9 @@ class DatabricksVolumeStorage(StorageBackend):
         """
         self.volume_path = volume_path.rstrip('/')
         self.logger = get_logger(__name__)
+        self.catalog = WorkflowCatalog(self)
+        # Appends rewrite the whole file, so appends to one path are serialized
+        self._append_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
             
         try:
             self.client = WorkspaceClient()
@@ -68,10 +75,7 @@ class DatabricksVolumeStorage(StorageBackend):
         """Save a workflow to Databricks volume"""
         try:
             file_path = self._get_workflow_file_path(workflow.id)
-            workflow_data = workflow.model_dump()
-            
-            # Convert datetime objects to strings for JSON serialization
-            workflow_json = json.dumps(workflow_data, indent=2, default=str)
+            workflow_json = serialize_workflow(workflow)
             
             # Run in thread pool since databricks SDK is synchronous
             loop = asyncio.get_event_loop()
@@ -86,6 +90,7 @@ class DatabricksVolumeStorage(StorageBackend):
                 return True
             
             await loop.run_in_executor(None, _save_file)
+            await self.catalog.put(workflow, len(workflow_json.encode('utf-8')))
             
             self.logger.debug(f"Saved workflow {workflow.id} to volume: {file_path}")
             return True
@@ -163,6 +168,16 @@ class DatabricksVolumeStorage(StorageBackend):
             self.logger.error(f"Failed to list workflows from volume: {e}")
         
         return workflows
+
+    async def list_workflow_summaries(self, offset: int = 0, limit: int = 50, sort_by: str = "updated_at",
+                                      descending: bool = True) -> Dict[str, Any]:
+        """List workflow summaries from the catalog"""
+        return await self.catalog.list_summaries(offset, limit, sort_by, descending)
+
+    async def set_workflow_optimized(self, workflow_id: str, has_optimization: bool = True) -> bool:
+        """Record whether a workflow has an optimized program in the catalog"""
+        await self.catalog.set_optimized(workflow_id, has_optimization)
+        return True
     
     async def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow from Databricks volume"""
@@ -183,6 +198,7 @@ class DatabricksVolumeStorage(StorageBackend):
             result = await loop.run_in_executor(None, _delete_file)
             
             if result:
+                await self.catalog.remove(workflow_id)
                 self.logger.debug(f"Deleted workflow {workflow_id} from volume: {file_path}")
             
             return result
@@ -365,6 +381,45 @@ class DatabricksVolumeStorage(StorageBackend):
             self.logger.error(f"Failed to save file {path} to volume: {e}")
             return False
 
+    async def append_file(self, path: str, content: str) -> bool:
+        """
+        Append content to a file in volume. Volumes have no append, so the file is
+        downloaded and rewritten; appends to the same path from this process are
+        serialized so none of them is lost.
+        """
+        lock = self._append_locks.get(path)
+        if lock is None:
+            lock = self._append_locks[path] = asyncio.Lock()
+
+        async with lock:
+            return await self._append_file(path, content)
+
+    async def _append_file(self, path: str, content: str) -> bool:
+        try:
+            file_path = f"{self.volume_path}/{path}"
+
+            # Run in thread pool since databricks SDK is synchronous
+            loop = asyncio.get_event_loop()
+
+            def _append_file():
+                # Only a missing file starts empty; any other download error must not
+                # lead to the existing content being overwritten
+                try:
+                    existing = self.client.files.download(file_path).contents.read()
+                except NotFound:
+                    existing = b""
+                self.client.files.upload(
+                    file_path=file_path,
+                    contents=existing + content.encode('utf-8'),
+                    overwrite=True
+                )
+                return True
+
+            return await loop.run_in_executor(None, _append_file)
+        except Exception as e:
+            self.logger.error(f"Failed to append to file {path} in volume: {e}")
+            return False
+
     async def get_file(self, path: str) -> Optional[str]:
         """Get arbitrary file content from volume"""
         try:
@@ -385,6 +440,34 @@ class DatabricksVolumeStorage(StorageBackend):
             self.logger.error(f"Failed to get file {path} from volume: {e}")
             return None
 
+    async def get_file_range(self, path: str, offset: int, length: int) -> Optional[str]:
+        """Get `length` bytes of a file in volume, starting at byte `offset`"""
+        try:
+            file_path = f"{self.volume_path}/{path}"
+
+            # Run in thread pool since databricks SDK is synchronous
+            loop = asyncio.get_event_loop()
+
+            def _get_file_range():
+                # files.download() takes no Range header, so this makes the same
+                # Files API request with one
+                headers = {
+                    "Accept": "application/octet-stream",
+                    "Range": f"bytes={offset}-{offset + length - 1}",
+                }
+                try:
+                    response = self.client.api_client.do(
+                        "GET", f"/api/2.0/fs/files{urllib.parse.quote(file_path)}", headers=headers, raw=True
+                    )
+                except NotFound:
+                    return None
+                return response["contents"].read().decode('utf-8')
+
+            return await loop.run_in_executor(None, _get_file_range)
+        except Exception as e:
+            self.logger.error(f"Failed to get a range of file {path} from volume: {e}")
+            return None
+
     async def copy_file(self, src_path: str, dest_path: str) -> bool:
         """Copy file to volume (from external source or within volume)"""
         try:
@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 
 from dspy_forge.storage.base import StorageBackend
+from dspy_forge.storage.catalog import WorkflowCatalog, serialize_workflow
 from dspy_forge.models.workflow import Workflow
 from dspy_forge.core.logging import get_logger
 
@@ -23,6 +24,7 @@ class LocalDirectoryStorage(StorageBackend):
         """
         self.storage_path = Path(storage_path)
         self.logger = get_logger(__name__)
+        self.catalog = WorkflowCatalog(self)
         
     async def initialize(self) -> bool:
         """Initialize the storage directory"""
@@ -44,14 +46,13 @@ class LocalDirectoryStorage(StorageBackend):
             file_path = self._get_workflow_file_path(workflow.id)
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
-            workflow_data = workflow.model_dump()
-
-            # Convert datetime objects to strings for JSON serialization
-            workflow_json = json.dumps(workflow_data, indent=2, default=str)
+            workflow_json = serialize_workflow(workflow)
 
             async with aiofiles.open(file_path, 'w') as f:
                 await f.write(workflow_json)
 
+            await self.catalog.put(workflow, len(workflow_json.encode('utf-8')))
+
             self.logger.debug(f"Saved workflow {workflow.id} to {file_path}")
             return True
         except Exception as e:
@@ -101,6 +102,16 @@ class LocalDirectoryStorage(StorageBackend):
             self.logger.error(f"Failed to list workflows: {e}")
 
         return workflows
+
+    async def list_workflow_summaries(self, offset: int = 0, limit: int = 50, sort_by: str = "updated_at",
+                                      descending: bool = True) -> Dict[str, Any]:
+        """List workflow summaries from the catalog"""
+        return await self.catalog.list_summaries(offset, limit, sort_by, descending)
+
+    async def set_workflow_optimized(self, workflow_id: str, has_optimization: bool = True) -> bool:
+        """Record whether a workflow has an optimized program in the catalog"""
+        await self.catalog.set_optimized(workflow_id, has_optimization)
+        return True
     
     async def delete_workflow(self, workflow_id: str) -> bool:
         """Delete a workflow from local directory"""
@@ -111,6 +122,7 @@ class LocalDirectoryStorage(StorageBackend):
                 return False
             
             file_path.unlink()
+            await self.catalog.remove(workflow_id)
             self.logger.debug(f"Deleted workflow {workflow_id} from {file_path}")
             return True
         except Exception as e:
@@ -241,6 +253,20 @@ class LocalDirectoryStorage(StorageBackend):
             self.logger.error(f"Failed to save file {path}: {e}")
             return False
 
+    async def append_file(self, path: str, content: str) -> bool:
+        """Append content to a file"""
+        try:
+            file_path = self.storage_path / path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            async with aiofiles.open(file_path, 'a') as f:
+                await f.write(content)
+
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to append to file {path}: {e}")
+            return False
+
     async def get_file(self, path: str) -> Optional[str]:
         """Get arbitrary file content"""
         try:
@@ -255,6 +281,21 @@ class LocalDirectoryStorage(StorageBackend):
             self.logger.error(f"Failed to get file {path}: {e}")
             return None
 
+    async def get_file_range(self, path: str, offset: int, length: int) -> Optional[str]:
+        """Get `length` bytes of a file, starting at byte `offset`"""
+        try:
+            file_path = self.storage_path / path
+
+            if not file_path.exists():
+                return None
+
+            async with aiofiles.open(file_path, 'rb') as f:
+                await f.seek(offset)
+                return (await f.read(length)).decode('utf-8')
+        except Exception as e:
+            self.logger.error(f"Failed to get a range of file {path}: {e}")
+            return None
+
     async def copy_file(self, src_path: str, dest_path: str) -> bool:
         """Copy file within storage or from external source"""
         try:
@@ -1,7 +1,8 @@
-from typing import Dict, List
+from collections import deque
+from typing import Any, Dict, List, Optional, Set
 import networkx as nx
 
-from dspy_forge.models.workflow import Workflow, NodeType
+from dspy_forge.models.workflow import Edge, Workflow, NodeType
 from dspy_forge.core.dspy_types import (
     SignatureFieldDefinition, 
     ModuleDefinition, 
@@ -43,16 +44,39 @@ def get_execution_order(workflow: Workflow) -> List[str]:
         raise WorkflowValidationError(f"Cannot determine execution order: {e}")
 
 
-def get_node_dependencies(workflow: Workflow, node_id: str) -> List[str]:
+class WorkflowAdjacency:
+    """
+    Node lookup and per-node incoming/outgoing edge lists, built in one pass.
+    Edge lists keep the workflow's edge order. Build one and pass it to the
+    dependency and branch helpers when analysing several nodes or routers.
+    """
+
+    def __init__(self, workflow: Workflow):
+        self.nodes: Dict[str, Any] = {}
+        self.incoming: Dict[str, List[Edge]] = {}
+        self.outgoing: Dict[str, List[Edge]] = {}
+
+        for node in workflow.nodes:
+            self.nodes.setdefault(node.id, node)  # First node wins for duplicate IDs
+        for edge in workflow.edges:
+            self.incoming.setdefault(edge.target, []).append(edge)
+            self.outgoing.setdefault(edge.source, []).append(edge)
+
+
+def get_node_dependencies(workflow: Workflow, node_id: str,
+                          adjacency: Optional[WorkflowAdjacency] = None) -> List[str]:
     """Get list of node IDs that this node depends on"""
-    graph = build_workflow_graph(workflow)
-    return list(graph.predecessors(node_id))
+    if adjacency is None:
+        adjacency = WorkflowAdjacency(workflow)
+    return list(dict.fromkeys(edge.source for edge in adjacency.incoming.get(node_id, [])))
 
 
-def get_node_dependents(workflow: Workflow, node_id: str) -> List[str]:
+def get_node_dependents(workflow: Workflow, node_id: str,
+                        adjacency: Optional[WorkflowAdjacency] = None) -> List[str]:
     """Get list of node IDs that depend on this node"""
-    graph = build_workflow_graph(workflow)
-    return list(graph.successors(node_id))
+    if adjacency is None:
+        adjacency = WorkflowAdjacency(workflow)
+    return list(dict.fromkeys(edge.target for edge in adjacency.outgoing.get(node_id, [])))
 
 
 def extract_signature_fields(workflow: Workflow) -> Dict[str, SignatureFieldDefinition]:
@@ -204,7 +228,15 @@ def identify_router_nodes(workflow: Workflow) -> List[str]:
     return router_nodes
 
 
-def get_nodes_in_branch(workflow: Workflow, router_node_id: str, branch_id: str) -> List[str]:
+def _router_branch_ids(router_node: Any) -> List[str]:
+    """Branch IDs of a router node, in configuration order"""
+    # Support both snake_case and camelCase for router config
+    router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
+    return [b.get('branchId') or b.get('branch_id') for b in router_config.get('branches', [])]
+
+
+def get_nodes_in_branch(workflow: Workflow, router_node_id: str, branch_id: str,
+                        adjacency: Optional[WorkflowAdjacency] = None) -> List[str]:
     """
     Get all nodes reachable from a specific branch of a router node.
 
@@ -212,139 +244,112 @@ def get_nodes_in_branch(workflow: Workflow, router_node_id: str, branch_id: str)
         workflow: The workflow
         router_node_id: ID of the router node
         branch_id: ID of the branch to trace
+        adjacency: Prebuilt adjacency index of the workflow, built if not given
 
     Returns:
         List of node IDs in this branch path (excluding the router itself)
     """
-    # Find edges from router with this branch_id as sourceHandle
-    branch_edges = [
-        edge for edge in workflow.edges
-        if edge.source == router_node_id and edge.sourceHandle == branch_id
-    ]
+    if adjacency is None:
+        adjacency = WorkflowAdjacency(workflow)
+
+    # Targets of edges from router with this branch_id as sourceHandle
+    router_edges = adjacency.outgoing.get(router_node_id, [])
+    queue = deque(dict.fromkeys(edge.target for edge in router_edges if edge.sourceHandle == branch_id))
 
-    if not branch_edges:
+    if not queue:
         return []
 
-    # Build a set of all nodes directly connected to router branches (for merge detection)
-    router_node = next((n for n in workflow.nodes if n.id == router_node_id), None)
-    if router_node:
-        router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
-        all_branch_ids = {b.get('branchId') or b.get('branch_id') for b in router_config.get('branches', [])}
-    else:
-        all_branch_ids = set()
+    # A node fed directly by multiple branches of the router is a merge point, where the branch stops
+    router_node = adjacency.nodes.get(router_node_id)
+    all_branch_ids = set(_router_branch_ids(router_node)) if router_node else set()
+    entry_branches: Dict[str, Set[str]] = {}
+    for edge in router_edges:
+        if edge.sourceHandle in all_branch_ids:
+            entry_branches.setdefault(edge.target, set()).add(edge.sourceHandle)
+    merge_points = {node_id for node_id, branch_ids in entry_branches.items() if len(branch_ids) > 1}
 
     # Collect all nodes reachable from this branch using BFS
     visited = set()
-    queue = [edge.target for edge in branch_edges]
+    queued = set(queue)
     branch_nodes = []
 
     while queue:
-        node_id = queue.pop(0)
-
-        if node_id in visited:
-            continue
-
-        # Check if this node is a merge point before adding it
-        # A merge point receives edges from multiple branches
-        incoming_to_node = [e for e in workflow.edges if e.target == node_id]
-        source_branch_ids = set()
+        node_id = queue.popleft()
+        queued.discard(node_id)
 
-        for inc_edge in incoming_to_node:
-            # Check if edge comes directly from router with a branch handle
-            if inc_edge.source == router_node_id and inc_edge.sourceHandle in all_branch_ids:
-                source_branch_ids.add(inc_edge.sourceHandle)
-
-        # If node receives from multiple branches directly, it's a merge point - stop here
-        if len(source_branch_ids) > 1:
+        if node_id in visited or node_id in merge_points:
             continue
 
         visited.add(node_id)
         branch_nodes.append(node_id)
 
-        # Find outgoing edges from this node
-        outgoing_edges = [edge for edge in workflow.edges if edge.source == node_id]
-
-        for edge in outgoing_edges:
+        for edge in adjacency.outgoing.get(node_id, []):
             target = edge.target
-
-            if target not in visited and target not in queue:
-                # Before adding to queue, check if it's a potential merge point
-                incoming_to_target = [e for e in workflow.edges if e.target == target]
-                target_source_branches = set()
-
-                for inc_edge in incoming_to_target:
-                    if inc_edge.source == router_node_id and inc_edge.sourceHandle in all_branch_ids:
-                        target_source_branches.add(inc_edge.sourceHandle)
-
-                # If target receives from multiple branches, don't add it
-                if len(target_source_branches) <= 1:
-                    queue.append(target)
+            if target not in visited and target not in queued and target not in merge_points:
+                queue.append(target)
+                queued.add(target)
 
     return branch_nodes
 
 
-def get_branch_paths(workflow: Workflow, router_node_id: str) -> Dict[str, List[str]]:
+def get_branch_paths(workflow: Workflow, router_node_id: str,
+                     adjacency: Optional[WorkflowAdjacency] = None) -> Dict[str, List[str]]:
     """
     Get all branch paths from a router node.
 
     Args:
         workflow: The workflow
         router_node_id: ID of the router node
+        adjacency: Prebuilt adjacency index of the workflow, built if not given
 
     Returns:
         Dict mapping branch_id to list of node IDs in that branch
     """
-    router_node = next((n for n in workflow.nodes if n.id == router_node_id), None)
+    if adjacency is None:
+        adjacency = WorkflowAdjacency(workflow)
+
+    router_node = adjacency.nodes.get(router_node_id)
 
     if not router_node:
         return {}
 
-    # Get router configuration (support both snake_case and camelCase)
-    router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
-    branches = router_config.get('branches', [])
-
     branch_paths = {}
 
-    for branch in branches:
-        branch_id = branch.get('branchId') or branch.get('branch_id')
+    for branch_id in _router_branch_ids(router_node):
         if branch_id:
-            branch_paths[branch_id] = get_nodes_in_branch(workflow, router_node_id, branch_id)
+            branch_paths[branch_id] = get_nodes_in_branch(workflow, router_node_id, branch_id, adjacency)
 
     return branch_paths
 
 
-def find_branch_merge_point(workflow: Workflow, router_node_id: str) -> str:
+def find_branch_merge_point(workflow: Workflow, router_node_id: str,
+                            adjacency: Optional[WorkflowAdjacency] = None) -> str:
     """
     Find the merge point where branches from a router converge.
 
     Args:
         workflow: The workflow
         router_node_id: ID of the router node
+        adjacency: Prebuilt adjacency index of the workflow, built if not given
 
     Returns:
         Node ID of the merge point, or None if branches don't merge
     """
-    branch_paths = get_branch_paths(workflow, router_node_id)
+    if adjacency is None:
+        adjacency = WorkflowAdjacency(workflow)
 
-    if len(branch_paths) < 2:
-        return None
+    branch_paths = get_branch_paths(workflow, router_node_id, adjacency)
 
-    # Get all branch node sets
-    branch_node_sets = [set(nodes) for nodes in branch_paths.values()]
-
-    # Find nodes that appear in multiple branch paths
-    # Or find nodes that have incoming edges from multiple branches
-    router_node = next((n for n in workflow.nodes if n.id == router_node_id), None)
-    if not router_node:
+    if len(branch_paths) < 2:
         return None
 
-    router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
-    all_branch_ids = [b.get('branchId') or b.get('branch_id') for b in router_config.get('branches', [])]
+    all_branch_ids = set(_router_branch_ids(adjacency.nodes[router_node_id]))
 
-    # Check all nodes to find merge point
-    all_nodes_in_branches = set()
-    for nodes in branch_paths.values():
-        all_nodes_in_branches.update(nodes)
+    # First branch (in configuration order) whose path contains each node
+    node_branches: Dict[str, str] = {}
+    for branch_id, branch_nodes in branch_paths.items():
+        for node_id in branch_nodes:
+            node_branches.setdefault(node_id, branch_id)
 
     # Find first node (in topological order) that has incoming edges from multiple branches
     graph = build_workflow_graph(workflow)
@@ -357,22 +362,16 @@ def find_branch_merge_point(workflow: Workflow, router_node_id: str) -> str:
         if node_id == router_node_id:
             continue
 
-        # Check if this node receives edges from multiple branches
-        incoming_edges = [e for e in workflow.edges if e.target == node_id]
         source_branches = set()
-
-        for edge in incoming_edges:
+        for edge in adjacency.incoming.get(node_id, []):
             # Direct edge from router
             if edge.source == router_node_id and edge.sourceHandle in all_branch_ids:
                 source_branches.add(edge.sourceHandle)
             # Edge from node in a branch
-            else:
-                for branch_id, branch_nodes in branch_paths.items():
-                    if edge.source in branch_nodes:
-                        source_branches.add(branch_id)
-                        break
+            elif edge.source in node_branches:
+                source_branches.add(node_branches[edge.source])
 
         if len(source_branches) > 1:
             return node_id
 
-    return None
\ No newline at end of file
+    return None
@@ -0,0 +1,42 @@
+import asyncio
+import sys
+
+from pathlib import Path
+
+import pytest
+
+# The runtime tests reuse the deterministic stand-ins and workflow shapes of the benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from stub_lm import StubLM  # noqa: E402
+
+from dspy_forge.core.program_cache import program_cache  # noqa: E402
+from dspy_forge.services import execution_store as execution_store_module  # noqa: E402
+from dspy_forge.storage import factory  # noqa: E402
+from dspy_forge.storage.local import LocalDirectoryStorage  # noqa: E402
+
+
+@pytest.fixture
+def stub_lm(monkeypatch):
+    """Route every LM the runtime creates to one StubLM"""
+    from dspy_forge.core import dspy_runtime
+
+    lm = StubLM()
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    # Cached programs hold the LMs they were built with
+    program_cache.clear()
+    yield lm
+    program_cache.clear()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Local storage backend in a temporary directory, with a fresh execution store on top"""
+    backend = LocalDirectoryStorage(str(tmp_path / "artifacts"))
+    asyncio.run(backend.initialize())
+    monkeypatch.setattr(factory, "_storage_backend", backend)
+
+    store = execution_store_module.ExecutionStore(max_entries=64, ttl_seconds=3600, segment_max_records=100)
+    for module in ("dspy_forge.services.execution_service", "dspy_forge.api.endpoints.execution"):
+        monkeypatch.setattr(f"{module}.execution_store", store)
+    return backend
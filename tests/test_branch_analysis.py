@@ -0,0 +1,271 @@
+"""
+Router branch analysis in workflow_utils, checked against the implementation it
+replaced (a BFS with list queues that rescanned the edge list for every visited
+node) on random graphs with routers, shared targets, unknown branch handles,
+duplicate edges and cycles.
+"""
+import random
+
+from typing import Dict, List
+
+import networkx as nx
+import pytest
+
+from dspy_forge.models.workflow import Workflow
+from dspy_forge.utils.workflow_utils import (
+    WorkflowAdjacency,
+    build_workflow_graph,
+    find_branch_merge_point,
+    get_branch_paths,
+    get_node_dependencies,
+    get_node_dependents,
+    get_nodes_in_branch,
+    identify_router_nodes,
+)
+
+POSITION = {"x": 0, "y": 0}
+
+
+# Implementation before the adjacency index, kept as the reference
+
+def legacy_get_nodes_in_branch(workflow: Workflow, router_node_id: str, branch_id: str) -> List[str]:
+    """
+    Get all nodes reachable from a specific branch of a router node.
+
+    Args:
+        workflow: The workflow
+        router_node_id: ID of the router node
+        branch_id: ID of the branch to trace
+
+    Returns:
+        List of node IDs in this branch path (excluding the router itself)
+    """
+    # Find edges from router with this branch_id as sourceHandle
+    branch_edges = [
+        edge for edge in workflow.edges
+        if edge.source == router_node_id and edge.sourceHandle == branch_id
+    ]
+
+    if not branch_edges:
+        return []
+
+    # Build a set of all nodes directly connected to router branches (for merge detection)
+    router_node = next((n for n in workflow.nodes if n.id == router_node_id), None)
+    if router_node:
+        router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
+        all_branch_ids = {b.get('branchId') or b.get('branch_id') for b in router_config.get('branches', [])}
+    else:
+        all_branch_ids = set()
+
+    # Collect all nodes reachable from this branch using BFS
+    visited = set()
+    queue = [edge.target for edge in branch_edges]
+    branch_nodes = []
+
+    while queue:
+        node_id = queue.pop(0)
+
+        if node_id in visited:
+            continue
+
+        # Check if this node is a merge point before adding it
+        # A merge point receives edges from multiple branches
+        incoming_to_node = [e for e in workflow.edges if e.target == node_id]
+        source_branch_ids = set()
+
+        for inc_edge in incoming_to_node:
+            # Check if edge comes directly from router with a branch handle
+            if inc_edge.source == router_node_id and inc_edge.sourceHandle in all_branch_ids:
+                source_branch_ids.add(inc_edge.sourceHandle)
+
+        # If node receives from multiple branches directly, it's a merge point - stop here
+        if len(source_branch_ids) > 1:
+            continue
+
+        visited.add(node_id)
+        branch_nodes.append(node_id)
+
+        # Find outgoing edges from this node
+        outgoing_edges = [edge for edge in workflow.edges if edge.source == node_id]
+
+        for edge in outgoing_edges:
+            target = edge.target
+
+            if target not in visited and target not in queue:
+                # Before adding to queue, check if it's a potential merge point
+                incoming_to_target = [e for e in workflow.edges if e.target == target]
+                target_source_branches = set()
+
+                for inc_edge in incoming_to_target:
+                    if inc_edge.source == router_node_id and inc_edge.sourceHandle in all_branch_ids:
+                        target_source_branches.add(inc_edge.sourceHandle)
+
+                # If target receives from multiple branches, don't add it
+                if len(target_source_branches) <= 1:
+                    queue.append(target)
+
+    return branch_nodes
+
+
+def legacy_get_branch_paths(workflow: Workflow, router_node_id: str) -> Dict[str, List[str]]:
+    """
+    Get all branch paths from a router node.
+
+    Args:
+        workflow: The workflow
+        router_node_id: ID of the router node
+
+    Returns:
+        Dict mapping branch_id to list of node IDs in that branch
+    """
+    router_node = next((n for n in workflow.nodes if n.id == router_node_id), None)
+
+    if not router_node:
+        return {}
+
+    # Get router configuration (support both snake_case and camelCase)
+    router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
+    branches = router_config.get('branches', [])
+
+    branch_paths = {}
+
+    for branch in branches:
+        branch_id = branch.get('branchId') or branch.get('branch_id')
+        if branch_id:
+            branch_paths[branch_id] = legacy_get_nodes_in_branch(workflow, router_node_id, branch_id)
+
+    return branch_paths
+
+
+def legacy_find_branch_merge_point(workflow: Workflow, router_node_id: str) -> str:
+    """
+    Find the merge point where branches from a router converge.
+
+    Args:
+        workflow: The workflow
+        router_node_id: ID of the router node
+
+    Returns:
+        Node ID of the merge point, or None if branches don't merge
+    """
+    branch_paths = legacy_get_branch_paths(workflow, router_node_id)
+
+    if len(branch_paths) < 2:
+        return None
+
+    # Get all branch node sets
+    branch_node_sets = [set(nodes) for nodes in branch_paths.values()]
+
+    # Find nodes that appear in multiple branch paths
+    # Or find nodes that have incoming edges from multiple branches
+    router_node = next((n for n in workflow.nodes if n.id == router_node_id), None)
+    if not router_node:
+        return None
+
+    router_config = router_node.data.get('router_config') or router_node.data.get('routerConfig', {})
+    all_branch_ids = [b.get('branchId') or b.get('branch_id') for b in router_config.get('branches', [])]
+
+    # Check all nodes to find merge point
+    all_nodes_in_branches = set()
+    for nodes in branch_paths.values():
+        all_nodes_in_branches.update(nodes)
+
+    # Find first node (in topological order) that has incoming edges from multiple branches
+    graph = build_workflow_graph(workflow)
+    try:
+        topo_order = list(nx.topological_sort(graph))
+    except nx.NetworkXError:
+        return None
+
+    for node_id in topo_order:
+        if node_id == router_node_id:
+            continue
+
+        # Check if this node receives edges from multiple branches
+        incoming_edges = [e for e in workflow.edges if e.target == node_id]
+        source_branches = set()
+
+        for edge in incoming_edges:
+            # Direct edge from router
+            if edge.source == router_node_id and edge.sourceHandle in all_branch_ids:
+                source_branches.add(edge.sourceHandle)
+            # Edge from node in a branch
+            else:
+                for branch_id, branch_nodes in branch_paths.items():
+                    if edge.source in branch_nodes:
+                        source_branches.add(branch_id)
+                        break
+
+        if len(source_branches) > 1:
+            return node_id
+
+    return None
+
+
+def random_workflow(rng: random.Random, index: int) -> Workflow:
+    """Random graph of modules, Merges and Routers, acyclic unless a back edge is drawn"""
+    num_nodes = rng.randint(2, 30)
+    nodes = []
+    for i in range(num_nodes):
+        if rng.random() < 0.25:
+            branches = [{"branch_id": f"n{i}-b{b}", "label": f"b{b}"} for b in range(rng.randint(1, 4))]
+            nodes.append({"id": f"n{i}", "type": "logic", "position": POSITION,
+                          "data": {"logic_type": "Router", "router_config": {"branches": branches}}})
+        elif rng.random() < 0.3:
+            nodes.append({"id": f"n{i}", "type": "logic", "position": POSITION, "data": {"logic_type": "Merge"}})
+        else:
+            nodes.append({"id": f"n{i}", "type": "module", "position": POSITION,
+                          "data": {"module_type": "Predict", "model": "databricks/stub"}})
+
+    edges = []
+    for i in range(rng.randint(1, num_nodes * 2)):
+        source, target = sorted(rng.sample(range(num_nodes), 2))
+        if rng.random() < 0.05:
+            source, target = target, source
+        handle = None
+        branches = nodes[source]["data"].get("router_config", {}).get("branches")
+        if branches:
+            handle = rng.choice(branches)["branch_id"] if rng.random() < 0.9 else "unknown"
+        edges.append({"id": f"e{i}", "source": f"n{source}", "target": f"n{target}", "sourceHandle": handle})
+    return Workflow(id=f"random-{index}", name="random", nodes=nodes, edges=edges)
+
+
+def outcome(fn, *args):
+    """Result of the call, or the type of the exception it raised"""
+    try:
+        return fn(*args)
+    except Exception as e:
+        return f"raises {type(e).__name__}"
+
+
+@pytest.fixture(params=range(100), ids=lambda seed: f"seed{seed}")
+def workflow(request) -> Workflow:
+    return random_workflow(random.Random(request.param), request.param)
+
+
+def test_node_dependencies_match_graph(workflow):
+    adjacency = WorkflowAdjacency(workflow)
+    graph = build_workflow_graph(workflow)
+
+    for node in workflow.nodes:
+        assert get_node_dependencies(workflow, node.id, adjacency) == list(graph.predecessors(node.id))
+        assert get_node_dependents(workflow, node.id, adjacency) == list(graph.successors(node.id))
+
+
+def test_branch_paths_match_legacy(workflow):
+    adjacency = WorkflowAdjacency(workflow)
+
+    for router_id in identify_router_nodes(workflow):
+        expected = legacy_get_branch_paths(workflow, router_id)
+        assert get_branch_paths(workflow, router_id) == expected
+        assert get_branch_paths(workflow, router_id, adjacency) == expected
+        assert (get_nodes_in_branch(workflow, router_id, "unknown", adjacency)
+                == legacy_get_nodes_in_branch(workflow, router_id, "unknown"))
+
+
+def test_branch_merge_point_matches_legacy(workflow):
+    adjacency = WorkflowAdjacency(workflow)
+
+    for router_id in identify_router_nodes(workflow):
+        assert (outcome(find_branch_merge_point, workflow, router_id, adjacency)
+                == outcome(legacy_find_branch_merge_point, workflow, router_id))
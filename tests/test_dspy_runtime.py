@@ -0,0 +1,238 @@
+"""
+CompoundProgram.aforward (concurrent DAG scheduling) checked against forward
+(one node at a time) on linear, fan-out, router, nested router and merge topologies.
+"""
+import asyncio
+
+import dspy
+import pytest
+
+from stub_lm import StubLM
+from workflows import edge, linear_chain, logic, module, router_branch, router_fanout, signature
+
+from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.core.execution_context import ExecutionContext, bind_execution_context
+from dspy_forge.models.workflow import Workflow
+
+
+def fan_out(width: int = 4) -> Workflow:
+    """start -> `width` independent modules -> Merge -> end"""
+    nodes = [signature("start", ["question"], is_start=True),
+             logic("merge", "Merge"),
+             module("answer"),
+             signature("end", ["answer"], is_end=True)]
+    edges = [edge("merge", "answer"), edge("answer", "end")]
+    for i in range(width):
+        nodes += [module(f"module-{i}"), signature(f"sig-{i}", [f"field_{i}"])]
+        edges += [edge("start", f"module-{i}"), edge(f"module-{i}", f"sig-{i}"), edge(f"sig-{i}", "merge")]
+    return Workflow(id="test-fan-out", name="fan-out", nodes=nodes, edges=edges)
+
+
+def nested_router() -> Workflow:
+    """
+    start -> outer Router: "inner" -> FieldSelector -> inner Router (-> "deep" / "shallow"
+    modules), or "direct" -> module. The FieldSelector passes on the question only, as
+    routers pass their inputs through along with the branch they selected.
+
+    Every branch meets in one Merge, which also gets a path that runs outside any
+    router, so it is reached through skipped and active branches.
+    """
+    outer = [router_branch("inner", "nested"), router_branch("direct")]
+    inner = [router_branch("deep", "deep"), router_branch("shallow")]
+    nodes = [signature("start", ["question"], is_start=True),
+             logic("outer", "Router", router_config={"branches": outer}),
+             logic("select", "FieldSelector", selected_fields=["question"], field_mappings={}),
+             logic("inner-router", "Router", router_config={"branches": inner}),
+             module("side"), signature("sig-side", ["note"]),
+             logic("merge", "Merge"),
+             signature("end", ["answer", "note"], is_end=True)]
+    edges = [edge("start", "outer"), edge("outer", "select", "inner"), edge("select", "inner-router"),
+             edge("start", "side"), edge("side", "sig-side"), edge("sig-side", "merge"),
+             edge("merge", "end")]
+    for source, handle, branch_id in (("inner-router", "deep", "deep"), ("inner-router", "shallow", "shallow"),
+                                      ("outer", "direct", "direct")):
+        nodes += [module(f"module-{branch_id}"), signature(f"sig-{branch_id}", ["answer"])]
+        edges += [edge(source, f"module-{branch_id}", handle), edge(f"module-{branch_id}", f"sig-{branch_id}"),
+                  edge(f"sig-{branch_id}", "merge")]
+    return Workflow(id="test-nested-router", name="nested router", nodes=nodes, edges=edges)
+
+
+def run_forward(program: CompoundProgram, workflow: Workflow, inputs: dict) -> ExecutionContext:
+    context = ExecutionContext(workflow, inputs)
+    with bind_execution_context(context):
+        program(**inputs)
+    return context
+
+
+def run_aforward(program: CompoundProgram, workflow: Workflow, inputs: dict) -> ExecutionContext:
+    context = ExecutionContext(workflow, inputs)
+
+    async def run():
+        with bind_execution_context(context):
+            await program.aforward(**inputs)
+
+    asyncio.run(run())
+    return context
+
+
+CASES = [
+    ("linear", lambda: linear_chain(4), "what is dspy?", None),
+    ("fan-out", fan_out, "what is dspy?", None),
+    ("router-match", lambda: router_fanout(3), "tell me about topic1", "module-branch-1"),
+    ("router-default", lambda: router_fanout(3), "something else", "module-default"),
+    ("nested-deep", nested_router, "nested and deep", "module-deep"),
+    ("nested-shallow", nested_router, "nested only", "module-shallow"),
+    ("nested-direct", nested_router, "plain question", "module-direct"),
+]
+
+
+@pytest.mark.parametrize("make_workflow, question, expected_branch_module",
+                         [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_aforward_matches_forward(stub_lm, make_workflow, question, expected_branch_module):
+    workflow = make_workflow()
+    program = CompoundProgram(workflow)
+    inputs = {"question": question}
+
+    sequential = run_forward(program, workflow, inputs)
+    concurrent = run_aforward(program, workflow, inputs)
+
+    executed = {entry.node_id for entry in concurrent.execution_trace}
+    assert executed == {entry.node_id for entry in sequential.execution_trace}
+    assert concurrent.node_outputs == sequential.node_outputs
+    assert not concurrent.has_node_errors()
+    assert len(executed) == len(concurrent.execution_trace), "a node ran twice"
+
+    # Exactly one branch module of each router ran, and everything downstream of the merge did
+    branch_modules = {node.id for node in workflow.nodes
+                      if node.id.startswith("module-") and node.id.replace("module-", "") in
+                      {branch["branch_id"] for other in workflow.nodes
+                       for branch in other.data.get("router_config", {}).get("branches", [])}}
+    if expected_branch_module is not None:
+        assert executed & branch_modules == {expected_branch_module}
+    assert "end" in executed
+    assert concurrent.node_outputs["end"]
+
+
+class ConcurrencyLM(StubLM):
+    """StubLM that records how many calls were in flight at once"""
+
+    def __init__(self, delay: float):
+        super().__init__(delay=delay)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = 0
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        self.started += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().aforward(prompt, messages, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+def test_independent_nodes_run_concurrently(stub_lm, monkeypatch):
+    from dspy_forge.core import dspy_runtime
+
+    lm = ConcurrencyLM(delay=0.05)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    workflow = fan_out(4)
+    program = CompoundProgram(workflow)
+
+    run_aforward(program, workflow, {"question": "what is dspy?"})
+
+    assert lm.max_in_flight == 4
+    # The four branches, then the module after the merge
+    assert lm.calls == 5
+
+
+def test_cancellation_stops_running_nodes(stub_lm, monkeypatch):
+    from dspy_forge.core import dspy_runtime
+
+    lm = ConcurrencyLM(delay=10)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    workflow = fan_out(3)
+    program = CompoundProgram(workflow)
+    context = ExecutionContext(workflow, {"question": "what is dspy?"})
+
+    async def run():
+        with bind_execution_context(context):
+            task = asyncio.create_task(program.aforward(question="what is dspy?"))
+            while lm.in_flight < 3:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            # The node tasks were cancelled along with the run
+            await asyncio.sleep(0)
+            assert lm.in_flight == 0
+
+    asyncio.run(run())
+    assert "merge" not in context.node_outputs
+
+
+def slow_lm(monkeypatch, delay: float) -> StubLM:
+    from dspy_forge.core import dspy_runtime
+
+    lm = ConcurrencyLM(delay=delay)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    return lm
+
+
+def test_node_timeout_fails_only_that_node(stub_lm, monkeypatch):
+    slow_lm(monkeypatch, delay=0.2)
+    workflow = fan_out(2)
+    next(node for node in workflow.nodes if node.id == "module-0").data["timeout_seconds"] = 0.05
+    program = CompoundProgram(workflow)
+
+    context = run_aforward(program, workflow, {"question": "what is dspy?"})
+
+    assert context.node_outputs["module-0"] == {"error": "Node module-0 timed out after 0.05s"}
+    assert context.node_outputs["module-1"] == {"field_1": "field_1-value"}
+    # Downstream nodes still run on what the other branch produced
+    assert context.node_outputs["end"] == {"answer": "answer-value"}
+
+
+def test_execution_deadline_cancels_remaining_nodes(stub_lm, monkeypatch):
+    lm = slow_lm(monkeypatch, delay=0.1)
+    workflow = linear_chain(4)
+    program = CompoundProgram(workflow)
+    inputs = {"question": "what is dspy?"}
+    context = ExecutionContext(workflow, inputs, timeout_seconds=0.15)
+
+    async def run():
+        with bind_execution_context(context):
+            await program.aforward(**inputs)
+
+    asyncio.run(run())
+
+    assert context.node_outputs["module-0"] == {"field_0": "field_0-value"}
+    assert context.node_outputs["module-1"] == {"error": "Node module-1 cancelled: execution deadline exceeded"}
+    for node_id in ("module-2", "module-3"):
+        assert context.node_outputs[node_id] == {"error": f"Node {node_id} cancelled: execution deadline exceeded"}
+    # module-1 was cut off mid-call, the nodes after it never reached the LM
+    assert lm.started == 2
+    assert lm.calls == 1
+
+
+def test_prediction_outputs_keep_the_node_output_fields(stub_lm):
+    workflow = linear_chain(2)
+    program = CompoundProgram(workflow)
+    node = program.plan.get_node("module-1")
+    prediction = dspy.Prediction(answer="an answer", reasoning="because", unrelated="dropped")
+
+    assert program._extract_outputs_from_call(prediction, node) == {"answer": "an answer"}
+    assert program._extract_outputs_from_call({"answer": "as is"}, node) == {"answer": "as is"}
+
+
+def test_node_metrics_are_not_labelled_by_workflow(stub_lm):
+    from dspy_forge.core.metrics import NODE_METRICS
+
+    for workflow_id in ("metrics-a", "metrics-b"):
+        workflow = linear_chain(1).model_copy(update={"id": workflow_id})
+        run_aforward(CompoundProgram(workflow), workflow, {"question": "what is dspy?"})
+
+    label_sets = set(NODE_METRICS.duration._children)
+    assert ("module", "Predict") in label_sets
+    assert not [labels for labels in label_sets if {"metrics-a", "metrics-b"} & set(labels)]
@@ -0,0 +1,234 @@
+import asyncio
+import json
+
+import pytest
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from stub_lm import StubLM
+from workflows import linear_chain
+
+from dspy_forge.api.endpoints import execution as execution_api
+from dspy_forge.api.routes import router as api_router
+from dspy_forge.core.config import settings
+from dspy_forge.services.execution_service import WorkflowExecutionEngine
+
+
+class DisconnectingRequest:
+    """Stands in for the Starlette request, reporting a disconnect once `disconnected` is set"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+@pytest.fixture
+def slow_lm(stub_lm, monkeypatch):
+    from dspy_forge.core import dspy_runtime
+
+    lm = StubLM(delay=10)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    return lm
+
+
+def test_playground_execution_cancelled_on_disconnect(storage, slow_lm, monkeypatch):
+    monkeypatch.setattr(execution_api, "DISCONNECT_POLL_INTERVAL", 0.01)
+    request = DisconnectingRequest()
+
+    async def run():
+        async def disconnect():
+            await asyncio.sleep(0.1)
+            request.disconnected = True
+
+        asyncio.create_task(disconnect())
+        with pytest.raises(HTTPException) as raised:
+            await asyncio.wait_for(execution_api._execute_until_disconnected(
+                request, linear_chain(2), {"question": "what is dspy?"}, bypass_lm_cache=False
+            ), timeout=5)
+        assert raised.value.status_code == 499
+
+        await asyncio.sleep(0)
+        await execution_api.execution_store.flush()
+        return await execution_api.execution_store.query()
+
+    listing = asyncio.run(run())
+    assert [item["status"] for item in listing["items"]] == ["cancelled"]
+    # The LM call in flight was cancelled with the run
+    assert slow_lm.calls == 0
+
+
+@pytest.mark.parametrize("header, coalesce", [(None, True), ("on", True), ("off", False), (" False ", False),
+                                              ("0", False), ("no", False)])
+def test_coalesce_header(header, coalesce):
+    assert execution_api._should_coalesce(header) is coalesce
+
+
+@pytest.mark.parametrize("header, runs", [(None, 1), ("off", 2)])
+def test_playground_coalesce_opt_out(storage, stub_lm, monkeypatch, header, runs):
+    from dspy_forge.core import dspy_runtime
+
+    lm = StubLM(delay=0.1)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    engine = WorkflowExecutionEngine()
+    monkeypatch.setattr(execution_api, "execution_engine", engine)
+
+    async def run():
+        return await asyncio.gather(*(execution_api._execute_until_disconnected(
+            DisconnectingRequest(), linear_chain(1), {"question": "what is dspy?"}, bypass_lm_cache=False,
+            coalesce=execution_api._should_coalesce(header)
+        ) for _ in range(2)))
+
+    executions = asyncio.run(run())
+
+    assert lm.calls == runs
+    assert len({execution.execution_id for execution in executions}) == runs
+    assert all(execution.result["final_outputs"] == {"end": {"answer": "answer-value"}} for execution in executions)
+
+
+class ConcurrencyLM(StubLM):
+    """StubLM that records the most calls it had in flight at once"""
+
+    def __init__(self, delay: float):
+        super().__init__(delay=delay)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aforward(self, *args, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().aforward(*args, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def client(storage, stub_lm):
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    asyncio.run(storage.save_workflow(linear_chain(1)))
+    with TestClient(app) as client:
+        yield client
+
+
+def result_lines(response):
+    return sorted((json.loads(line) for line in response.text.splitlines()), key=lambda item: item["index"])
+
+
+@pytest.mark.parametrize("concurrency, limit", [(2, 2), (None, 3), (50, 4)])
+def test_batch_runs_at_most_concurrency_items_at_once(client, monkeypatch, concurrency, limit):
+    from dspy_forge.core import dspy_runtime
+
+    lm = ConcurrencyLM(delay=0.05)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    monkeypatch.setattr(settings, "batch_default_concurrency", 3)
+    monkeypatch.setattr(settings, "batch_max_concurrency", 4)
+    inputs = [{"question": f"question {i}"} for i in range(10)]
+
+    response = client.post("/api/v1/execution/bench-linear/batch", json={"inputs": inputs, "concurrency": concurrency})
+
+    assert response.status_code == 200
+    items = result_lines(response)
+    assert [item["index"] for item in items] == list(range(10))
+    assert all(item["status"] == "completed" for item in items)
+    assert items[0]["result"] == {"end": {"answer": "answer-value"}}
+    assert lm.calls == 10
+    assert lm.max_in_flight == limit
+
+
+def test_jsonl_batch_reports_errors_per_item(client):
+    body = "\n".join(['{"question": "first"}', '{"question": ', '', '["not", "an", "object"]',
+                      '{"question": "last"}']) + "\n"
+
+    response = client.post("/api/v1/execution/bench-linear/batch/jsonl", params={"concurrency": 2}, content=body)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    items = result_lines(response)
+    assert [(item["index"], item["status"]) for item in items] == [
+        (0, "completed"), (1, "failed"), (2, "failed"), (3, "completed")
+    ]
+    assert items[1]["error"].startswith("Invalid JSON on line 2")
+    assert items[2]["error"] == "Batch input must be a JSON object, got list"
+    assert items[1]["result"] is None and items[2]["result"] is None
+    assert items[3]["result"] == {"end": {"answer": "answer-value"}}
+
+
+def test_batch_of_unknown_workflow_is_not_found(client):
+    assert client.post("/api/v1/execution/missing/batch", json={"inputs": [{}]}).status_code == 404
+    assert client.post("/api/v1/execution/missing/batch/jsonl", content="{}\n").status_code == 404
+
+
+class FailingLM(StubLM):
+    """StubLM whose calls fail like an unreachable provider"""
+
+    async def aforward(self, *args, **kwargs):
+        self.calls += 1
+        raise ConnectionError("provider unavailable")
+
+
+def sse_events(response):
+    """Parse a server-sent event stream into (event, data) pairs"""
+    events = []
+    for message in response.text.split("\n\n"):
+        if message:
+            fields = dict(line.split(": ", 1) for line in message.splitlines())
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def stream_playground(client, workflow):
+    request = {"workflow_id": workflow.id, "workflow_ir": workflow.model_dump(mode="json"), "question": "what is dspy?"}
+    with client.stream("POST", "/api/v1/execution/playground/stream", json=request) as response:
+        response.read()
+    return response
+
+
+def test_playground_stream_emits_nodes_in_order_then_final(client):
+    response = stream_playground(client, linear_chain(2))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.endswith("\n\n")
+    events = sse_events(response)
+    assert [(event, data.get("node_id")) for event, data in events] == [
+        ("node", "start"), ("node", "module-0"), ("node", "sig-0"), ("node", "module-1"), ("node", "end"),
+        ("final", None)
+    ]
+    assert all(data["status"] == "completed" for _, data in events)
+    assert events[3][1]["outputs"] == {"answer": "answer-value"}
+
+    final = events[-1][1]
+    assert final["result"] == {"end": {"answer": "answer-value"}}
+    assert final["error"] is None
+    assert client.get(f"/api/v1/execution/records/{final['execution_id']}").json()["status"] == "completed"
+
+
+def test_playground_stream_ends_with_final_after_a_node_error(client, monkeypatch):
+    from dspy_forge.core import dspy_runtime
+
+    lm = FailingLM()
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+
+    events = sse_events(stream_playground(client, linear_chain(2)))
+
+    # Node errors are reported as they happen and don't cut the stream short
+    assert [(event, data.get("node_id"), data.get("status")) for event, data in events] == [
+        ("node", "start", "completed"), ("node", "module-0", "failed"), ("node", "sig-0", "completed"),
+        ("node", "module-1", "failed"), ("node", "end", "completed"), ("final", None, "completed")
+    ]
+    assert events[1][1]["outputs"] == {"error": "provider unavailable"}
+    assert events[-1][1]["result"] == {"end": {"error": "provider unavailable"}}
+    assert lm.calls == 2
+
+
+def test_invalid_playground_stream_fails_before_streaming(client):
+    workflow = linear_chain(1)
+    workflow.edges = []
+
+    response = stream_playground(client, workflow)
+
+    assert response.status_code == 400
+    assert not response.headers["content-type"].startswith("text/event-stream")
@@ -0,0 +1,260 @@
+import asyncio
+import threading
+
+import dspy
+import pytest
+
+from stub_lm import StubLM
+from workflows import linear_chain
+
+from dspy_forge.core import semantic_cache
+from dspy_forge.core.config import settings
+from dspy_forge.core.dspy_runtime import CompoundProgram
+from dspy_forge.core.metrics import COALESCED_EXECUTIONS, COALESCING_IN_FLIGHT
+from dspy_forge.services.execution_service import WorkflowExecutionEngine
+
+
+class FlakyLM(StubLM):
+    """StubLM that fails every call while `failing` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.failing = False
+
+    def _response(self, messages):
+        if self.failing:
+            self.calls += 1
+            raise RuntimeError("provider down")
+        return super()._response(messages)
+
+
+@pytest.fixture
+def flaky_lm(stub_lm, monkeypatch):
+    from dspy_forge.core import dspy_runtime
+
+    lm = FlakyLM()
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    return lm
+
+
+@pytest.fixture
+def semantic(monkeypatch):
+    monkeypatch.setattr(settings, "semantic_cache_enabled", True)
+    monkeypatch.setattr(semantic_cache, "_semantic_cache", None)
+    yield semantic_cache.get_semantic_cache()
+
+
+def test_semantic_cache_skips_runs_with_node_errors(storage, flaky_lm, semantic):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(1)
+
+    async def run():
+        return await engine.execute_workflow(workflow, {"question": "what is dspy?"}, coalesce=False)
+
+    flaky_lm.failing = True
+    failed = asyncio.run(run())
+    assert failed.status == "completed"
+    assert "error" in failed.result["node_outputs"]["module-0"]
+
+    flaky_lm.failing = False
+    calls = flaky_lm.calls
+    retried = asyncio.run(run())
+    assert "semantic_cache" not in retried.result
+    assert flaky_lm.calls > calls
+    assert retried.result["final_outputs"] == {"end": {"answer": "answer-value"}}
+
+    # The successful answer is reused
+    calls = flaky_lm.calls
+    cached = asyncio.run(run())
+    assert cached.result["semantic_cache"]["hit"] is True
+    assert flaky_lm.calls == calls
+
+
+def test_batch_semantic_cache_skips_items_with_node_errors(storage, flaky_lm, semantic):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(1)
+
+    async def run():
+        return [item async for item in engine.execute_batch(workflow, [{"question": "what is dspy?"}])]
+
+    flaky_lm.failing = True
+    assert asyncio.run(run())[0]["result"] == {"end": {"error": "provider down"}}
+
+    flaky_lm.failing = False
+    assert asyncio.run(run())[0]["result"] == {"end": {"answer": "answer-value"}}
+
+
+@pytest.fixture
+def slow_lm(stub_lm, monkeypatch):
+    from dspy_forge.core import dspy_runtime
+
+    lm = StubLM(delay=0.2)
+    monkeypatch.setattr(dspy_runtime, "create_lm", lambda *args, **kwargs: lm)
+    return lm
+
+
+def coalescing_metrics():
+    return (COALESCED_EXECUTIONS.labels("leader").value, COALESCED_EXECUTIONS.labels("joined").value,
+            COALESCING_IN_FLIGHT.labels().value)
+
+
+async def wait_for_waiters(engine: WorkflowExecutionEngine, waiters: int):
+    while sum(shared.waiters for shared in engine._in_flight.values()) < waiters:
+        await asyncio.sleep(0.01)
+
+
+def test_identical_concurrent_executions_share_one_run(storage, slow_lm):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(2)
+    leaders, joined, in_flight = coalescing_metrics()
+
+    async def run():
+        return await asyncio.gather(*(engine.execute_workflow(workflow, {"question": "what is dspy?"})
+                                      for _ in range(3)))
+
+    executions = asyncio.run(run())
+
+    # One run of the two modules served all three callers
+    assert slow_lm.calls == 2
+    assert len({execution.execution_id for execution in executions}) == 1
+    assert executions[0].result["final_outputs"] == {"end": {"answer": "answer-value"}}
+    assert engine.get_coalescing_stats() == {"in_flight": 0, "leader_executions": 1, "coalesced_executions": 2}
+    assert coalescing_metrics() == (leaders + 1, joined + 2, in_flight)
+
+
+def test_different_or_opted_out_executions_are_not_coalesced(storage, slow_lm):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(1)
+
+    async def run():
+        return await asyncio.gather(
+            engine.execute_workflow(workflow, {"question": "what is dspy?"}),
+            engine.execute_workflow(workflow, {"question": "what is a signature?"}),
+            engine.execute_workflow(workflow, {"question": "what is dspy?"}, coalesce=False),
+        )
+
+    executions = asyncio.run(run())
+
+    assert slow_lm.calls == 3
+    assert len({execution.execution_id for execution in executions}) == 3
+    assert engine.get_coalescing_stats()["coalesced_executions"] == 0
+
+
+def test_cancelling_one_waiter_keeps_the_shared_run(storage, slow_lm):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(2)
+
+    async def run():
+        first = asyncio.create_task(engine.execute_workflow(workflow, {"question": "what is dspy?"}))
+        second = asyncio.create_task(engine.execute_workflow(workflow, {"question": "what is dspy?"}))
+        await wait_for_waiters(engine, 2)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    execution = asyncio.run(run())
+
+    assert execution.status == "completed"
+    assert execution.result["final_outputs"] == {"end": {"answer": "answer-value"}}
+    assert slow_lm.calls == 2
+
+
+def test_shared_run_cancelled_when_every_waiter_leaves(storage, slow_lm):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(2)
+    in_flight = COALESCING_IN_FLIGHT.labels().value
+
+    async def run():
+        waiters = [asyncio.create_task(engine.execute_workflow(workflow, {"question": "what is dspy?"}))
+                   for _ in range(2)]
+        await wait_for_waiters(engine, 2)
+        shared = next(iter(engine._in_flight.values())).task
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        with pytest.raises(asyncio.CancelledError):
+            await shared
+        return shared
+
+    shared = asyncio.run(run())
+
+    assert shared.cancelled()
+    assert slow_lm.calls == 0
+    assert engine.get_coalescing_stats()["in_flight"] == 0
+    assert COALESCING_IN_FLIGHT.labels().value == in_flight
+
+
+def test_concurrent_program_cache_misses_build_once(storage, stub_lm, monkeypatch):
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(2)
+    build_program = engine._build_program
+    builds = []
+
+    async def slow_build(workflow):
+        builds.append(workflow.id)
+        await asyncio.sleep(0.05)
+        return await build_program(workflow)
+
+    monkeypatch.setattr(engine, "_build_program", slow_build)
+
+    async def run():
+        return await asyncio.gather(*(engine._get_program(workflow) for _ in range(3)))
+
+    programs = asyncio.run(run())
+
+    assert builds == [workflow.id]
+    assert programs[0] is programs[1] is programs[2]
+    assert not engine._building
+    assert asyncio.run(engine._get_program(workflow)) is programs[0]
+
+
+def test_saving_an_optimized_program_invalidates_cached_programs(storage, stub_lm):
+    from dspy_forge.services.optimization_service import optimization_service
+
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(1)
+    asyncio.run(storage.save_workflow(workflow))
+    cached = asyncio.run(engine._get_program(workflow))
+    assert all(not predictor.demos for _, predictor in cached.named_predictors())
+
+    optimized = CompoundProgram(workflow)
+    for _, predictor in optimized.named_predictors():
+        predictor.demos = [dspy.Example(question="what is dspy?", answer="a framework")]
+    asyncio.run(optimization_service._save_optimized_program(workflow.id, optimized))
+
+    rebuilt = asyncio.run(engine._get_program(workflow))
+    assert rebuilt is not cached
+    assert all(len(predictor.demos) == 1 for _, predictor in rebuilt.named_predictors())
+
+
+def test_deleting_a_workflow_invalidates_cached_programs(storage, stub_lm):
+    from dspy_forge.services.workflow_service import workflow_service
+
+    engine = WorkflowExecutionEngine()
+    workflow = linear_chain(1)
+    asyncio.run(storage.save_workflow(workflow))
+    cached = asyncio.run(engine._get_program(workflow))
+    assert asyncio.run(engine._get_program(workflow)) is cached
+
+    assert asyncio.run(workflow_service.delete_workflow(workflow.id))
+
+    assert asyncio.run(engine._get_program(workflow)) is not cached
+
+
+def test_deleting_a_workflow_clears_its_lm_cache_off_the_event_loop(storage, monkeypatch):
+    from dspy_forge.services import workflow_service as workflow_service_module
+
+    cleared = []
+
+    class RecordingCache:
+        def clear(self, namespace=None):
+            cleared.append((namespace, threading.current_thread() is threading.main_thread()))
+
+    monkeypatch.setattr(workflow_service_module, "get_lm_response_cache", lambda: RecordingCache())
+    workflow = linear_chain(1)
+    asyncio.run(storage.save_workflow(workflow))
+
+    assert asyncio.run(workflow_service_module.workflow_service.delete_workflow(workflow.id))
+
+    assert cleared == [(workflow.id, False)]
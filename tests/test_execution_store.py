@@ -0,0 +1,171 @@
+import asyncio
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from dspy_forge.models.workflow import WorkflowExecution
+from dspy_forge.services import execution_store as execution_store_module
+from dspy_forge.services.execution_store import EXECUTION_MANIFEST_PATH, ExecutionStore
+
+BASE = datetime(2026, 1, 1)
+
+
+def make_execution(i: int, workflow_id: str = "wf-a") -> WorkflowExecution:
+    return WorkflowExecution(workflow_id=workflow_id, input_data={"i": i}, execution_id=f"exec-{i}",
+                             status="completed", created_at=BASE + timedelta(seconds=i))
+
+
+def make_store(**kwargs) -> ExecutionStore:
+    options = dict(max_entries=4, ttl_seconds=3600, segment_max_records=5)
+    options.update(kwargs)
+    return ExecutionStore(**options)
+
+
+async def record(store: ExecutionStore, executions):
+    for execution in executions:
+        store.add(execution)
+        store.finish(execution)
+        await store.flush()
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Skip the waits between write retries"""
+    sleep = asyncio.sleep
+    monkeypatch.setattr(execution_store_module.asyncio, "sleep", lambda *args: sleep(0))
+
+
+@pytest.fixture
+def executions():
+    return [make_execution(i, "wf-a" if i % 3 else "wf-b") for i in range(23)]
+
+
+@pytest.mark.parametrize("workflow_id", [None, "wf-a", "wf-b"])
+@pytest.mark.parametrize("window", [(None, None), (3, 17)])
+def test_query_pages_across_segments(storage, executions, workflow_id, window):
+    store = make_store(index_cache_segments=2)
+    start, end = (BASE + timedelta(seconds=bound) if bound is not None else None for bound in window)
+
+    async def run():
+        await record(store, executions)
+        return [await store.query(workflow_id=workflow_id, start=start, end=end, offset=offset, limit=4)
+                for offset in (0, 3, 7, 20)]
+
+    pages = asyncio.run(run())
+
+    expected = [execution.execution_id for execution in reversed(executions)
+                if (workflow_id is None or execution.workflow_id == workflow_id)
+                and (start is None or execution.created_at >= start)
+                and (end is None or execution.created_at < end)]
+    for offset, page in zip((0, 3, 7, 20), pages):
+        assert page["total"] == len(expected)
+        assert [item["execution_id"] for item in page["items"]] == expected[offset:offset + 4]
+    assert len(store._index_cache) <= 2
+
+
+def test_memory_is_bounded_to_written_records(storage, executions):
+    store = make_store()
+
+    async def run():
+        running = make_execution(100)
+        store.add(running)
+        await record(store, executions)
+        return running
+
+    running = asyncio.run(run())
+
+    # The running execution isn't in the log yet, so it is kept past the cap
+    assert running.execution_id in store._memory
+    assert len(store._memory) <= store.max_entries + 1
+    assert store.stats()["memory_entries"] == len(store._memory)
+
+
+def test_get_reads_evicted_records_from_the_log(storage, executions):
+    store = make_store()
+
+    async def run():
+        await record(store, executions)
+        assert "exec-1" not in store._memory
+        return await store.get("exec-1"), await store.get("exec-22"), await store.get("missing")
+
+    old, latest, missing = asyncio.run(run())
+    assert old.input_data == {"i": 1}
+    assert latest.execution_id == "exec-22"
+    assert missing is None
+
+
+def test_reloads_manifest_and_index_after_restart(storage, executions):
+    asyncio.run(record(make_store(), executions))
+
+    async def reload():
+        store = make_store()
+        listing = await store.query(limit=50)
+        return store, listing, await store.get("exec-7")
+
+    store, listing, execution = asyncio.run(reload())
+    assert listing["total"] == 23
+    assert listing["items"][0]["execution_id"] == "exec-22"
+    assert execution.input_data == {"i": 7}
+    # The open segment continues where the last process left off
+    assert store._segment == 4 and store._segment_records == 3
+
+    asyncio.run(record(store, [make_execution(23)]))
+    assert asyncio.run(make_store().get("exec-23")).input_data == {"i": 23}
+
+
+def test_recovers_segments_missing_from_the_manifest(storage, executions):
+    asyncio.run(record(make_store(), executions))
+    manifest = storage.storage_path / EXECUTION_MANIFEST_PATH
+    manifest.write_text("\n".join(manifest.read_text().splitlines()[:2]) + "\n")
+
+    listing = asyncio.run(make_store().query())
+
+    assert listing["total"] == 23
+    assert len(manifest.read_text().splitlines()) == 4
+
+
+def test_failed_writes_are_retried_then_evicted(storage, no_backoff, monkeypatch):
+    store = make_store(max_entries=1, max_write_retries=2)
+    attempts = []
+
+    async def failing_append(path, content):
+        attempts.append(path)
+        return False
+
+    async def run():
+        with monkeypatch.context() as patch:
+            patch.setattr(storage, "append_file", failing_append)
+            await record(store, [make_execution(0)])
+        store.add(make_execution(1))
+
+    asyncio.run(run())
+
+    assert len(attempts) == 3
+    assert store.stats()["failed_writes"] == 1
+    assert "exec-0" not in store._memory
+
+
+def test_index_failure_retry_does_not_duplicate_the_record(storage, no_backoff, monkeypatch):
+    store = make_store()
+    append_file = storage.append_file
+    failed = []
+
+    async def flaky_append(path, content):
+        if "/index/" in path and not failed:
+            failed.append(path)
+            return False
+        return await append_file(path, content)
+
+    async def run():
+        with monkeypatch.context() as patch:
+            patch.setattr(storage, "append_file", flaky_append)
+            await record(store, [make_execution(0), make_execution(1)])
+        return await make_store().get("exec-1")
+
+    reloaded = asyncio.run(run())
+
+    assert failed
+    segment = (storage.storage_path / "executions" / "segments" / "000000.jsonl").read_text().splitlines()
+    assert [WorkflowExecution.model_validate_json(line).execution_id for line in segment] == ["exec-0", "exec-1"]
+    assert reloaded.input_data == {"i": 1}
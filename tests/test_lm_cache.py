@@ -0,0 +1,90 @@
+import asyncio
+
+from types import SimpleNamespace
+
+import pytest
+
+from dspy_forge.core import lm_cache
+from dspy_forge.core.lm_cache import CachedLM, LMResponseCache, lm_cache_scope
+
+
+class ProviderLM(CachedLM):
+    """CachedLM whose provider call is counted, with a request cache standing in for dspy.LM's"""
+
+    def __init__(self):
+        super().__init__("openai/test-model", api_key="test", cache=True)
+        self.provider_calls = 0
+        self.request_cache = {}
+
+    def _complete(self, prompt, messages, kwargs):
+        key = repr((prompt, messages))
+        if kwargs.get("cache", self.cache) and key in self.request_cache:
+            return self.request_cache[key]
+
+        self.provider_calls += 1
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"answer {self.provider_calls}"),
+                                     finish_reason="stop")],
+            usage={"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            model=self.model,
+        )
+        if kwargs.get("cache", self.cache):
+            self.request_cache[key] = response
+        return response
+
+    def forward(self, prompt=None, messages=None, **kwargs):
+        return self._complete(prompt, messages, kwargs)
+
+    async def aforward(self, prompt=None, messages=None, **kwargs):
+        return self._complete(prompt, messages, kwargs)
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    cache = LMResponseCache(max_memory_entries=16, db_path=str(tmp_path / "lm.sqlite3"), max_disk_bytes=1024 * 1024)
+    monkeypatch.setattr(lm_cache, "get_lm_response_cache", lambda: cache)
+    return cache
+
+
+def test_repeated_call_is_served_from_cache(response_cache):
+    lm = ProviderLM()
+
+    assert lm("hello") == ["answer 1"]
+    assert lm("hello") == ["answer 1"]
+    assert lm.provider_calls == 1
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_bypass_reaches_provider(response_cache):
+    lm = ProviderLM()
+    lm("hello")
+
+    with lm_cache_scope("workflow", bypass=True):
+        assert lm("hello") == ["answer 2"]
+        assert lm("hello") == ["answer 3"]
+    assert lm.provider_calls == 3
+
+
+def test_async_bypass_reaches_provider(response_cache):
+    lm = ProviderLM()
+
+    async def run():
+        await lm.acall("hello")
+        with lm_cache_scope("workflow", bypass=True):
+            return await lm.acall("hello")
+
+    assert asyncio.run(run()) == ["answer 2"]
+    assert lm.provider_calls == 2
+
+
+def test_async_disk_hit_after_memory_eviction(response_cache):
+    lm = ProviderLM()
+
+    async def run():
+        await lm.acall("hello")
+        response_cache._memory.clear()
+        return await lm.acall("hello")
+
+    assert asyncio.run(run()) == ["answer 1"]
+    assert lm.provider_calls == 1
+    assert response_cache.stats()["disk_hits"] == 1
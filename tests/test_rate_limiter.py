@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import time
+import warnings
+
+import dspy
+import pytest
+
+from dspy_forge.core import rate_limiter
+from dspy_forge.core.config import settings
+from dspy_forge.core.rate_limiter import ProviderLimiter, RateLimitedLM, TokenBucket
+
+
+class ThrottleError(Exception):
+    """Provider error carrying an HTTP status, as raised by litellm"""
+
+    def __init__(self, status_code: int = 429):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Enable rate limiting with fresh limiters, and record throttle backoffs instead of sleeping"""
+    monkeypatch.setattr(settings, "lm_rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "lm_max_concurrency", 8)
+    monkeypatch.setattr(settings, "lm_throttle_max_retries", 2)
+    monkeypatch.setattr(settings, "lm_throttle_backoff_seconds", 0.5)
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+
+    backoffs = []
+    sleep = asyncio.sleep
+    monkeypatch.setattr(rate_limiter.time, "sleep", backoffs.append)
+
+    async def record_sleep(seconds):
+        backoffs.append(seconds)
+        await sleep(0)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", record_sleep)
+    return backoffs
+
+
+def failing_call(failures: int, error=ThrottleError):
+    """A provider call that raises `error` `failures` times, then answers"""
+    attempts = []
+
+    def call():
+        attempts.append(len(attempts))
+        if len(attempts) <= failures:
+            raise error()
+        return ["answer"]
+
+    return call, attempts
+
+
+def test_throttling_halves_the_concurrency_limit_down_to_the_minimum():
+    limiter = ProviderLimiter("test/model", max_concurrency=8, min_concurrency=2)
+
+    limits = []
+    for _ in range(3):
+        limiter.acquire(0)
+        limiter.release(throttled=True)
+        limits.append(limiter.limit)
+
+    assert limits == [4.0, 2.0, 2.0]
+    assert limiter.stats()["throttled"] == 3
+
+
+def test_successes_raise_the_concurrency_limit_additively():
+    limiter = ProviderLimiter("test/model", max_concurrency=4)
+    limiter.limit = 2.0
+
+    for expected in (2.5, 2.9, 3.2448275862068965):
+        limiter.acquire(0)
+        limiter.release()
+        assert limiter.limit == pytest.approx(expected)
+
+    for _ in range(20):
+        limiter.acquire(0)
+        limiter.release()
+    assert limiter.limit == 4.0
+
+
+def test_refused_token_budget_refunds_the_request_budget():
+    limiter = ProviderLimiter("test/model", rpm=60, tpm=100)
+    with limiter._lock:
+        assert limiter._try_acquire(80) == 0
+        requests_left = limiter.requests.tokens
+
+        # 20 tokens are left of the 100, so the next call waits and takes no request
+        wait = limiter._try_acquire(60)
+
+    assert wait == pytest.approx((60 - 20) / (100 / 60), rel=0.01)
+    assert limiter.requests.tokens == pytest.approx(requests_left, abs=0.01)
+    assert limiter.in_flight == 1
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(60)
+    assert bucket.try_take(60, bucket.updated_at) == 0
+    assert bucket.try_take(1, bucket.updated_at) == pytest.approx(1.0)
+    assert bucket.try_take(1, bucket.updated_at + 1.0) == 0
+
+
+def test_async_waiter_woken_by_release():
+    limiter = ProviderLimiter("test/model", max_concurrency=1)
+
+    async def run():
+        await limiter.aacquire(0)
+        waiter = asyncio.create_task(limiter.aacquire(0))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        assert limiter.stats()["waiting"] == 1
+
+        released_at = time.monotonic()
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        return time.monotonic() - released_at
+
+    woken_after = asyncio.run(run())
+    assert woken_after < 0.05
+    assert limiter.in_flight == 1
+    assert not limiter._async_waiters
+
+
+def test_thread_waiter_woken_by_release():
+    limiter = ProviderLimiter("test/model", max_concurrency=1)
+    limiter.acquire(0)
+    acquired = threading.Event()
+
+    def wait_for_slot():
+        limiter.acquire(0)
+        acquired.set()
+
+    thread = threading.Thread(target=wait_for_slot)
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    limiter.release()
+    assert acquired.wait(1)
+    thread.join()
+    assert limiter.in_flight == 1
+
+
+def test_cancelled_async_waiter_leaves_the_queue():
+    limiter = ProviderLimiter("test/model", max_concurrency=1)
+
+    async def run():
+        await limiter.aacquire(0)
+        waiter = asyncio.create_task(limiter.aacquire(0))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
+    assert not limiter._async_waiters
+    assert limiter.stats()["waiting"] == 0
+    assert limiter.in_flight == 1
+
+
+def test_throttled_calls_retried_with_backoff(limited):
+    lm = RateLimitedLM("openai/test-model", api_key="test")
+    call, attempts = failing_call(failures=2)
+
+    assert lm._limited_call(call, tokens=10) == ["answer"]
+
+    assert len(attempts) == 3
+    assert limited == [0.5, 1.0]
+    stats = rate_limiter.get_limiter_stats()["openai/test-model"]
+    assert stats["throttled"] == 2 and stats["calls"] == 3 and stats["in_flight"] == 0
+    # Halved twice, then raised by one success
+    assert stats["concurrency_limit"] == 2
+
+
+def test_async_throttled_calls_retried_with_backoff(limited):
+    lm = RateLimitedLM("openai/test-model", api_key="test")
+    call, attempts = failing_call(failures=1)
+
+    async def acall():
+        return call()
+
+    assert asyncio.run(lm._alimited_call(acall, tokens=10)) == ["answer"]
+
+    assert len(attempts) == 2
+    assert limited == [0.5]
+
+
+def test_throttling_gives_up_after_the_retry_limit(limited):
+    lm = RateLimitedLM("openai/test-model", api_key="test")
+    call, attempts = failing_call(failures=10)
+
+    with pytest.raises(ThrottleError):
+        lm._limited_call(call, tokens=10)
+
+    assert len(attempts) == 3
+    assert rate_limiter.get_limiter_stats()["openai/test-model"]["in_flight"] == 0
+
+
+def test_other_errors_are_not_retried(limited):
+    lm = RateLimitedLM("openai/test-model", api_key="test")
+    call, attempts = failing_call(failures=1, error=lambda: ThrottleError(500))
+
+    with pytest.raises(ThrottleError):
+        lm._limited_call(call, tokens=10)
+
+    assert len(attempts) == 1
+    assert limited == []
+    assert rate_limiter.get_limiter_stats()["openai/test-model"]["concurrency_limit"] == 8
+
+
+def test_calls_use_the_supported_lm_interface(limited):
+    """Calls go through dspy.LM's public entry points, not the deprecated forward() plugin path"""
+    lm15 = pytest.importorskip("dspy.lm15", reason="dspy without LM engines has no deprecated LM interface")
+
+    class Engine:
+        def complete(self, request):
+            content = "[[ ## answer ## ]]\nanswer-value\n\n[[ ## completed ## ]]"
+            return lm15.Response(id=None, model="test-model", message=lm15.Message.assistant([lm15.TextPart(content)]),
+                                 finish_reason="stop", usage=lm15.Usage(input_tokens=1, output_tokens=1,
+                                                                        total_tokens=2))
+
+        def stream(self, request):
+            return lm15.response_to_events(self.complete(request))
+
+        def close(self):
+            pass
+
+    class AsyncEngine:
+        async def complete(self, request):
+            return Engine().complete(request)
+
+        async def stream(self, request):
+            for event in Engine().stream(request):
+                yield event
+
+        async def aclose(self):
+            pass
+
+    lm = RateLimitedLM("openai/test-model", engine=Engine(), async_engine=AsyncEngine(), cache=False)
+    predict = dspy.Predict("question -> answer")
+
+    with warnings.catch_warnings(record=True) as caught, dspy.context(lm=lm):
+        warnings.simplefilter("always", DeprecationWarning)
+        assert predict(question="what is dspy?").answer == "answer-value"
+        assert asyncio.run(predict.acall(question="what is dspy?")).answer == "answer-value"
+
+    assert [str(warning.message) for warning in caught
+            if issubclass(warning.category, DeprecationWarning) and "LM" in str(warning.message)] == []
+    assert rate_limiter.get_limiter_stats()["openai/test-model"]["calls"] == 2
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dspy_forge.components import retriever_templates
+from dspy_forge.components.retriever_cache import RetrieverResultCache, make_cache_key, normalize_query
+from dspy_forge.components.retriever_templates import UnstructuredRetrieveTemplate
+from dspy_forge.core.config import settings
+
+
+def test_queries_normalized_for_whitespace_only():
+    assert normalize_query("  What is\tDSPy?\n") == "What is DSPy?"
+    assert make_cache_key("index", "what  is dspy", "ann", 3) == make_cache_key("index", "what is dspy ", "ann", 3)
+    assert make_cache_key("index", "Apple stock", "ann", 3) != make_cache_key("index", "apple stock", "ann", 3)
+
+
+def test_case_folding_is_opt_in():
+    assert normalize_query("Straße  Apple", case_insensitive=True) == "strasse apple"
+    assert (make_cache_key("index", "Apple stock", "ann", 3, case_insensitive=True)
+            == make_cache_key("index", "apple STOCK", "ann", 3, case_insensitive=True))
+
+
+def test_keys_differ_by_source_query_type_and_k():
+    keys = {make_cache_key("index", "q", "ann", 3), make_cache_key("other", "q", "ann", 3),
+            make_cache_key("index", "q", "hybrid", 3), make_cache_key("index", "q", "ann", 5)}
+    assert len(keys) == 4
+
+
+class CountingRetriever(UnstructuredRetrieveTemplate):
+    """UnstructuredRetrieve node whose backend answers with the query it was sent"""
+
+    def __init__(self):
+        node = SimpleNamespace(id="retriever", type="RetrieverNode", data={"retriever_type": "UnstructuredRetrieve"})
+        super().__init__(node, workflow=None)
+        self.index_name = "main.docs.index"
+        self.query_type = "ann"
+        self.num_results = 3
+        self.queries = []
+
+    def _retrieve(self, query):
+        self.queries.append(query)
+        return {"context": [f"passage for {query}"], "citations": []}
+
+
+@pytest.fixture
+def retriever(monkeypatch):
+    cache = RetrieverResultCache(ttl_seconds=60, max_entries=16, max_bytes=1024 * 1024)
+    monkeypatch.setattr(retriever_templates, "get_retriever_cache", lambda: cache)
+    return CountingRetriever()
+
+
+def test_case_variants_reach_the_backend(retriever):
+    first = retriever.call(query="Apple stock")
+    second = retriever.call(query="apple stock")
+    retriever.call(query=" Apple   stock ")
+
+    assert retriever.queries == ["Apple stock", "apple stock"]
+    assert first.context == ["passage for Apple stock"]
+    assert second.context == ["passage for apple stock"]
+
+
+def test_case_variants_share_results_when_opted_in(retriever, monkeypatch):
+    monkeypatch.setattr(settings, "retriever_cache_case_insensitive_types", ["UnstructuredRetrieve"])
+
+    retriever.call(query="Apple stock")
+    cached = retriever.call(query="apple stock")
+
+    assert retriever.queries == ["Apple stock"]
+    assert cached.query == "apple stock"
@@ -0,0 +1,105 @@
+import pytest
+
+from workflows import linear_chain, router_fanout
+
+from dspy_forge.models.workflow import Workflow
+from dspy_forge.services.validation_service import ValidationResultCache, WorkflowValidationService
+
+
+def edited(workflow: Workflow, edit) -> Workflow:
+    copy = workflow.model_copy(deep=True)
+    edit(copy)
+    return copy
+
+
+def node(workflow: Workflow, node_id: str):
+    return next(node for node in workflow.nodes if node.id == node_id)
+
+
+def set_module_type(module_type: str):
+    def edit(workflow):
+        node(workflow, "module-0").data["module_type"] = module_type
+    return edit
+
+
+def drop_field_name(workflow):
+    node(workflow, "sig-0").data["fields"][0]["name"] = ""
+
+
+def retarget_edge(workflow):
+    edge = next(edge for edge in workflow.edges if edge.target == "end")
+    edge.target = "sig-0"
+
+
+def drop_edge(workflow):
+    workflow.edges = [edge for edge in workflow.edges if edge.target != "end"]
+
+
+EDITS = {
+    "module type": set_module_type("NotAModule"),
+    "signature field": drop_field_name,
+    "edge target": retarget_edge,
+    "removed edge": drop_edge,
+}
+
+
+@pytest.mark.parametrize("edit", EDITS.values(), ids=EDITS.keys())
+def test_edits_invalidate_cached_results(edit):
+    service = WorkflowValidationService()
+    workflow = linear_chain(3)
+    assert service.validate_for_execution(workflow) == []
+
+    changed = edited(workflow, edit)
+    errors = service.validate_for_execution(changed)
+
+    assert errors
+    assert errors == WorkflowValidationService().validate_for_execution(changed)
+    # Reverting the edit is served from the cache again
+    assert service.validate_for_execution(workflow) == []
+
+
+def test_node_data_edit_reuses_graph_results():
+    service = WorkflowValidationService()
+    workflow = router_fanout(3)
+    service.validate_workflow(workflow)
+    misses = service.validation_cache.stats()["misses"]
+
+    service.validate_workflow(edited(workflow, lambda w: node(w, "module-default").data.update(instruction="New")))
+
+    # Only the edited node was validated again
+    assert service.validation_cache.stats()["misses"] == misses + 1
+
+
+def test_cache_is_scoped_per_workflow():
+    service = WorkflowValidationService()
+    broken = edited(linear_chain(2), set_module_type("NotAModule"))
+    assert service.validate_workflow(broken)
+
+    service.clear_cache(broken.id)
+    assert service.validation_cache.stats()["entries"] == 0
+    assert service.validate_workflow(broken) == WorkflowValidationService().validate_workflow(broken)
+
+
+def test_byte_cap_evicts_least_recently_used_entries():
+    cache = ValidationResultCache(max_bytes=1000)
+    errors = (("x" * 50,),)
+    keys = [("workflow", "node", f"hash-{i}") for i in range(4)]
+
+    for key in keys[:3]:
+        cache.put(key, errors)
+    assert cache.get(keys[0]) == errors  # Now the most recently used
+    cache.put(keys[3], errors)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 1000
+    assert stats["evictions"] == 1
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(key) == errors for key in (keys[0], keys[2], keys[3]))
+
+
+def test_entries_over_the_byte_cap_are_not_cached():
+    cache = ValidationResultCache(max_bytes=300)
+    cache.put(("workflow", "node", "hash"), (("x" * 500,),))
+
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
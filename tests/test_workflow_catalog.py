@@ -0,0 +1,154 @@
+import asyncio
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from workflows import linear_chain
+
+from dspy_forge.api.routes import router as api_router
+from dspy_forge.models.workflow import Workflow
+from dspy_forge.storage.catalog import CATALOG_PATH
+from dspy_forge.storage.local import LocalDirectoryStorage
+
+BASE = datetime(2026, 1, 1)
+NAMES = ["delta", "Alpha", "echo", "charlie", "bravo"]
+
+
+def make_workflow(i: int) -> Workflow:
+    return linear_chain(i + 1).model_copy(update={
+        "id": f"wf-{i}", "name": NAMES[i], "created_at": BASE + timedelta(hours=i),
+        "updated_at": BASE + timedelta(hours=10 - i),
+    })
+
+
+def reopen(storage: LocalDirectoryStorage) -> LocalDirectoryStorage:
+    """A backend on the same directory, as after a restart"""
+    backend = LocalDirectoryStorage(str(storage.storage_path))
+    asyncio.run(backend.initialize())
+    return backend
+
+
+def list_ids(storage: LocalDirectoryStorage, **kwargs):
+    return [summary["id"] for summary in asyncio.run(storage.list_workflow_summaries(**kwargs))["items"]]
+
+
+@pytest.fixture
+def saved(storage):
+    async def save():
+        for i in range(len(NAMES)):
+            assert await storage.save_workflow(make_workflow(i))
+
+    asyncio.run(save())
+    return storage
+
+
+def log_lines(storage: LocalDirectoryStorage):
+    return (storage.storage_path / CATALOG_PATH).read_text().splitlines()
+
+
+@pytest.mark.parametrize("sort_by, descending, expected", [
+    ("updated_at", True, ["wf-0", "wf-1", "wf-2", "wf-3", "wf-4"]),
+    ("created_at", True, ["wf-4", "wf-3", "wf-2", "wf-1", "wf-0"]),
+    ("name", False, ["wf-1", "wf-4", "wf-3", "wf-0", "wf-2"]),
+    ("node_count", False, ["wf-0", "wf-1", "wf-2", "wf-3", "wf-4"]),
+])
+def test_summaries_sorted(saved, sort_by, descending, expected):
+    assert list_ids(saved, sort_by=sort_by, descending=descending) == expected
+
+
+def test_summaries_describe_workflows(saved):
+    summary = asyncio.run(saved.list_workflow_summaries(sort_by="created_at", descending=False))["items"][2]
+    assert summary["id"] == "wf-2"
+    assert summary["name"] == "echo"
+    assert summary["node_count"] == 7 and summary["edge_count"] == 6
+    assert summary["has_optimization"] is False
+    assert summary["size"] > 0
+
+
+def test_log_replayed_after_restart(saved):
+    records = len(log_lines(saved))
+
+    async def update():
+        assert await saved.delete_workflow("wf-3")
+        await saved.set_workflow_optimized("wf-1")
+        assert await saved.save_workflow(make_workflow(0).model_copy(update={"name": "zulu"}))
+
+    asyncio.run(update())
+    expected = asyncio.run(saved.list_workflow_summaries(sort_by="name", descending=False))
+
+    # The delete, the optimization and the save were appended
+    assert len(log_lines(saved)) == records + 3
+    reopened = reopen(saved)
+    assert asyncio.run(reopened.list_workflow_summaries(sort_by="name", descending=False)) == expected
+    assert [summary["id"] for summary in expected["items"]] == ["wf-1", "wf-4", "wf-2", "wf-0"]
+    assert expected["items"][0]["has_optimization"] is True
+
+
+def test_log_compacted_once_superseded_records_pile_up(saved):
+    async def resave():
+        for i in range(70):
+            assert await saved.save_workflow(make_workflow(i % 2).model_copy(update={"description": f"v{i}"}))
+
+    asyncio.run(resave())
+
+    assert len(log_lines(saved)) < 70
+    summaries = asyncio.run(reopen(saved).list_workflow_summaries(sort_by="created_at", descending=False))
+    assert summaries["total"] == 5
+    assert [summary["description"] for summary in summaries["items"][:2]] == ["v68", "v69"]
+
+
+def test_catalog_rebuilt_from_stored_workflows(saved):
+    asyncio.run(saved.save_file("workflows/wf-2/program.json", "{}"))
+    (saved.storage_path / CATALOG_PATH).unlink()
+
+    reopened = reopen(saved)
+    summaries = asyncio.run(reopened.list_workflow_summaries(sort_by="created_at", descending=False))
+
+    assert [summary["id"] for summary in summaries["items"]] == ["wf-0", "wf-1", "wf-2", "wf-3", "wf-4"]
+    assert [summary["has_optimization"] for summary in summaries["items"]] == [False, False, True, False, False]
+    # The rebuilt catalog is written back as one record per workflow
+    assert len(log_lines(reopened)) == 5
+
+
+def test_catalog_rebuilt_after_a_failed_update(saved, monkeypatch):
+    async def failing_append(path, content):
+        return False
+
+    with monkeypatch.context() as patch:
+        patch.setattr(saved, "append_file", failing_append)
+        assert asyncio.run(saved.save_workflow(make_workflow(0).model_copy(update={"id": "wf-new"})))
+
+    assert "wf-new" in list_ids(saved)
+    assert "wf-new" in list_ids(reopen(saved))
+
+
+@pytest.fixture
+def client(saved):
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    with TestClient(app) as client:
+        yield client
+
+
+def test_list_workflows_endpoint_pages(client):
+    response = client.get("/api/v1/workflows/", params={"offset": 1, "limit": 2, "sort_by": "name", "order": "asc"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert {key: body[key] for key in ("total", "offset", "limit")} == {"total": 5, "offset": 1, "limit": 2}
+    assert [item["id"] for item in body["items"]] == ["wf-4", "wf-3"]
+
+
+def test_list_workflows_endpoint_defaults_to_recently_updated(client):
+    body = client.get("/api/v1/workflows/").json()
+
+    assert body["limit"] == 50
+    assert [item["id"] for item in body["items"]] == ["wf-0", "wf-1", "wf-2", "wf-3", "wf-4"]
+
+
+@pytest.mark.parametrize("params", [{"sort_by": "nodes"}, {"order": "up"}, {"limit": 0}, {"offset": -1}])
+def test_list_workflows_endpoint_rejects_bad_params(client, params):
+    assert client.get("/api/v1/workflows/", params=params).status_code == 422
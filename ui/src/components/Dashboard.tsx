@@ -10,11 +10,11 @@ import { useToast } from '../hooks/useToast';
 
 const Dashboard: React.FC = () => {
   const navigate = useNavigate();
-  const { workflows, loading, refreshWorkflows } = useWorkflowData();
+  const { workflows, total, loading, loadingMore, refreshWorkflows, loadMoreWorkflows } = useWorkflowData();
   const { toasts, removeToast, showSuccess, showError } = useToast();
 
   const [searchQuery, setSearchQuery] = useState('');
-  const [filterStatus, setFilterStatus] = useState<'all' | 'optimized' | 'deployed' | 'none'>('all');
+  const [filterStatus, setFilterStatus] = useState<'all' | 'optimized' | 'none'>('all');
   const [selectedWorkflow, setSelectedWorkflow] = useState<WorkflowCardData | null>(null);
   const [deleteConfirm, setDeleteConfirm] = useState<{ id: string; name: string } | null>(null);
 
@@ -28,9 +28,8 @@ const Dashboard: React.FC = () => {
 
     // Status filter
     if (filterStatus === 'all') return true;
-    if (filterStatus === 'optimized') return workflow.latestOptimization?.status === 'completed';
-    if (filterStatus === 'deployed') return workflow.latestDeployment?.status === 'completed';
-    if (filterStatus === 'none') return !workflow.latestOptimization && !workflow.latestDeployment;
+    if (filterStatus === 'optimized') return workflow.has_optimization;
+    if (filterStatus === 'none') return !workflow.has_optimization;
 
     return true;
   });
@@ -125,7 +124,6 @@ const Dashboard: React.FC = () => {
               >
                 <option value="all">All</option>
                 <option value="optimized">Optimized</option>
-                <option value="deployed">Deployed</option>
                 <option value="none">Unprocessed</option>
               </select>
             </div>
@@ -170,6 +168,18 @@ const Dashboard: React.FC = () => {
               ))}
             </div>
 
+            {workflows.length < total && (
+              <div className="flex justify-center mt-8">
+                <button
+                  onClick={loadMoreWorkflows}
+                  disabled={loadingMore}
+                  className="px-4 py-2 text-sm font-medium text-slate-300 bg-slate-800/50 border border-slate-700 rounded-lg hover:border-slate-600 hover:text-brand-400 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : `Load more (${total - workflows.length} remaining)`}
+                </button>
+              </div>
+            )}
+
             {/* Empty State for Search */}
             {filteredWorkflows.length === 0 && workflows.length > 0 && (
               <div className="text-center py-16">
@@ -1375,7 +1375,7 @@ const WorkflowBuilderContent: React.FC = () => {
                   </div>
                   <div className="bg-gray-50 rounded-lg p-3">
                     <pre className="text-sm text-gray-700 whitespace-pre-wrap">
-                      {JSON.stringify(selectedNodeExecution.execution.outputs, null, 2)}
+                      {JSON.stringify(selectedNodeExecution.nodeOutput, null, 2)}
                     </pre>
                   </div>
                 </div>
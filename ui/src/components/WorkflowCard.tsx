@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { Edit3, Copy, Trash2, MoreVertical, Clock, Calendar, Zap, Cloud, Hash } from 'lucide-react';
+import { Edit3, Copy, Trash2, MoreVertical, Clock, Calendar, Zap, Hash, GitBranch } from 'lucide-react';
 import { WorkflowCardData } from '../types/dashboard';
 
 interface WorkflowCardProps {
@@ -29,50 +29,20 @@ const WorkflowCard: React.FC<WorkflowCardProps> = ({ workflow, onDelete, onDupli
     return date.toLocaleDateString();
   };
 
-  const getStatusBadge = (
-    status: string | undefined,
-    type: 'optimization' | 'deployment'
-  ) => {
-    if (!status) {
+  const getOptimizationBadge = (hasOptimization: boolean) => {
+    if (!hasOptimization) {
       return (
         <span className="inline-flex items-center px-2 py-1 rounded-md text-xs font-medium bg-slate-700/50 text-slate-400">
           <span className="w-1.5 h-1.5 rounded-full bg-slate-500 mr-1.5"></span>
-          {type === 'optimization' ? 'Not optimized' : 'Not deployed'}
+          Not optimized
         </span>
       );
     }
 
-    const isOptimizing = ['queued', 'initializing', 'loading_data', 'building_program', 'optimizing', 'saving_results'].includes(status);
-    const isDeploying = ['validating', 'compiling', 'deploying'].includes(status);
-    const isCompleted = status === 'completed';
-    const isFailed = status === 'failed';
-
-    let bgColor = 'bg-slate-700/50';
-    let textColor = 'text-slate-400';
-    let dotColor = 'bg-slate-500';
-    let label = status;
-
-    if (isOptimizing || isDeploying) {
-      bgColor = 'bg-blue-500/20';
-      textColor = 'text-blue-400';
-      dotColor = 'bg-blue-500';
-      label = type === 'optimization' ? 'Optimizing...' : 'Deploying...';
-    } else if (isCompleted) {
-      bgColor = 'bg-emerald-500/20';
-      textColor = 'text-emerald-400';
-      dotColor = 'bg-emerald-500';
-      label = type === 'optimization' ? 'Optimized' : 'Deployed';
-    } else if (isFailed) {
-      bgColor = 'bg-red-500/20';
-      textColor = 'text-red-400';
-      dotColor = 'bg-red-500';
-      label = 'Failed';
-    }
-
     return (
-      <span className={`inline-flex items-center px-2 py-1 rounded-md text-xs font-medium ${bgColor} ${textColor}`}>
-        <span className={`w-1.5 h-1.5 rounded-full ${dotColor} mr-1.5 ${isOptimizing || isDeploying ? 'animate-pulse' : ''}`}></span>
-        {label}
+      <span className="inline-flex items-center px-2 py-1 rounded-md text-xs font-medium bg-emerald-500/20 text-emerald-400">
+        <span className="w-1.5 h-1.5 rounded-full bg-emerald-500 mr-1.5"></span>
+        Optimized
       </span>
     );
   };
@@ -166,11 +136,7 @@ const WorkflowCard: React.FC<WorkflowCardProps> = ({ workflow, onDelete, onDupli
         <div className="flex flex-wrap gap-2 mb-4">
           <div className="flex items-center">
             <Zap size={14} className="text-slate-500 mr-1" />
-            {getStatusBadge(workflow.latestOptimization?.status, 'optimization')}
-          </div>
-          <div className="flex items-center">
-            <Cloud size={14} className="text-slate-500 mr-1" />
-            {getStatusBadge(workflow.latestDeployment?.status, 'deployment')}
+            {getOptimizationBadge(workflow.has_optimization)}
           </div>
         </div>
 
@@ -179,20 +145,12 @@ const WorkflowCard: React.FC<WorkflowCardProps> = ({ workflow, onDelete, onDupli
           <div className="flex items-center space-x-4">
             <span className="flex items-center">
               <Hash size={12} className="mr-1" />
-              {workflow.nodes.length} nodes
+              {workflow.node_count} nodes
+            </span>
+            <span className="flex items-center">
+              <GitBranch size={12} className="mr-1" />
+              {workflow.edge_count} connection{workflow.edge_count !== 1 ? 's' : ''}
             </span>
-            {workflow.optimizationCount > 0 && (
-              <span className="flex items-center">
-                <Zap size={12} className="mr-1" />
-                {workflow.optimizationCount} run{workflow.optimizationCount !== 1 ? 's' : ''}
-              </span>
-            )}
-            {workflow.deploymentCount > 0 && (
-              <span className="flex items-center">
-                <Cloud size={12} className="mr-1" />
-                {workflow.deploymentCount} deploy{workflow.deploymentCount !== 1 ? 's' : ''}
-              </span>
-            )}
           </div>
         </div>
 
@@ -200,11 +158,11 @@ const WorkflowCard: React.FC<WorkflowCardProps> = ({ workflow, onDelete, onDupli
         <div className="mt-3 pt-3 border-t border-slate-700 flex items-center justify-between text-xs text-slate-500">
           <div className="flex items-center">
             <Calendar size={12} className="mr-1" />
-            Created {formatDate(workflow.createdAt)}
+            Created {formatDate(workflow.created_at)}
           </div>
           <div className="flex items-center">
             <Clock size={12} className="mr-1" />
-            Updated {formatDate(workflow.updatedAt)}
+            Updated {formatDate(workflow.updated_at)}
           </div>
         </div>
       </div>
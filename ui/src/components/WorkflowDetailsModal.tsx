@@ -31,6 +31,11 @@ const WorkflowDetailsModal: React.FC<WorkflowDetailsModalProps> = ({ workflow, o
     fetchHistory();
   }, [workflow.id]);
 
+  const latestOptimization = history?.optimizations?.[0];
+  const latestDeployment = history?.deployments?.[0];
+  const optimizationCount = history?.optimizations?.length ?? 0;
+  const deploymentCount = history?.deployments?.length ?? 0;
+
   const formatDate = (dateString: string) => {
     const date = new Date(dateString);
     return date.toLocaleString();
@@ -101,7 +106,7 @@ const WorkflowDetailsModal: React.FC<WorkflowDetailsModalProps> = ({ workflow, o
             }`}
           >
             <Zap size={16} className="mr-1.5" />
-            Optimizations ({workflow.optimizationCount})
+            Optimizations ({optimizationCount})
           </button>
           <button
             onClick={() => setActiveTab('deployments')}
@@ -112,7 +117,7 @@ const WorkflowDetailsModal: React.FC<WorkflowDetailsModalProps> = ({ workflow, o
             }`}
           >
             <Cloud size={16} className="mr-1.5" />
-            Deployments ({workflow.deploymentCount})
+            Deployments ({deploymentCount})
           </button>
         </div>
 
@@ -133,28 +138,28 @@ const WorkflowDetailsModal: React.FC<WorkflowDetailsModalProps> = ({ workflow, o
                         <Hash size={14} className="mr-1" />
                         Nodes
                       </div>
-                      <div className="text-2xl font-bold text-slate-100">{workflow.nodes.length}</div>
+                      <div className="text-2xl font-bold text-slate-100">{workflow.node_count}</div>
                     </div>
                     <div className="bg-slate-700/30 rounded-lg p-4 border border-slate-700">
                       <div className="flex items-center text-sm text-slate-400 mb-1">
                         <FileText size={14} className="mr-1" />
                         Connections
                       </div>
-                      <div className="text-2xl font-bold text-slate-100">{workflow.edges.length}</div>
+                      <div className="text-2xl font-bold text-slate-100">{workflow.edge_count}</div>
                     </div>
                     <div className="bg-slate-700/30 rounded-lg p-4 border border-slate-700">
                       <div className="flex items-center text-sm text-slate-400 mb-1">
                         <Zap size={14} className="mr-1" />
                         Optimizations
                       </div>
-                      <div className="text-2xl font-bold text-slate-100">{workflow.optimizationCount}</div>
+                      <div className="text-2xl font-bold text-slate-100">{optimizationCount}</div>
                     </div>
                     <div className="bg-slate-700/30 rounded-lg p-4 border border-slate-700">
                       <div className="flex items-center text-sm text-slate-400 mb-1">
                         <Cloud size={14} className="mr-1" />
                         Deployments
                       </div>
-                      <div className="text-2xl font-bold text-slate-100">{workflow.deploymentCount}</div>
+                      <div className="text-2xl font-bold text-slate-100">{deploymentCount}</div>
                     </div>
                   </div>
 
@@ -162,39 +167,39 @@ const WorkflowDetailsModal: React.FC<WorkflowDetailsModalProps> = ({ workflow, o
                     <div className="flex items-center text-sm">
                       <Calendar size={14} className="text-slate-500 mr-2" />
                       <span className="text-slate-400">Created:</span>
-                      <span className="ml-2 font-medium text-slate-200">{formatDate(workflow.createdAt)}</span>
+                      <span className="ml-2 font-medium text-slate-200">{formatDate(workflow.created_at)}</span>
                     </div>
                     <div className="flex items-center text-sm">
                       <Clock size={14} className="text-slate-500 mr-2" />
                       <span className="text-slate-400">Last Updated:</span>
-                      <span className="ml-2 font-medium text-slate-200">{formatDate(workflow.updatedAt)}</span>
+                      <span className="ml-2 font-medium text-slate-200">{formatDate(workflow.updated_at)}</span>
                     </div>
                   </div>
 
-                  {workflow.latestOptimization && (
+                  {latestOptimization && (
                     <div className="border border-emerald-500/30 bg-emerald-500/10 rounded-lg p-4">
                       <div className="flex items-center justify-between mb-2">
                         <span className="text-sm font-semibold text-emerald-400">Latest Optimization</span>
-                        {getStatusIcon(workflow.latestOptimization.status)}
+                        {getStatusIcon(latestOptimization.status)}
                       </div>
                       <p className="text-sm text-emerald-300">
-                        {workflow.latestOptimization.optimizer_name} - {workflow.latestOptimization.message}
+                        {latestOptimization.optimizer_name} - {latestOptimization.message}
                       </p>
                     </div>
                   )}
 
-                  {workflow.latestDeployment && (
+                  {latestDeployment && (
                     <div className="border border-blue-500/30 bg-blue-500/10 rounded-lg p-4">
                       <div className="flex items-center justify-between mb-2">
                         <span className="text-sm font-semibold text-blue-400">Latest Deployment</span>
-                        {getStatusIcon(workflow.latestDeployment.status)}
+                        {getStatusIcon(latestDeployment.status)}
                       </div>
                       <p className="text-sm text-blue-300">
-                        {workflow.latestDeployment.catalog_name}.{workflow.latestDeployment.schema_name}.{workflow.latestDeployment.model_name}
+                        {latestDeployment.catalog_name}.{latestDeployment.schema_name}.{latestDeployment.model_name}
                       </p>
-                      {workflow.latestDeployment.endpoint_url && (
+                      {latestDeployment.endpoint_url && (
                         <a
-                          href={workflow.latestDeployment.endpoint_url}
+                          href={latestDeployment.endpoint_url}
                           target="_blank"
                           rel="noopener noreferrer"
                           className="text-xs text-blue-400 hover:text-blue-300 flex items-center mt-1"
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Edit3, Copy, Trash2, Download, Calendar, Clock } from 'lucide-react';
 import { WorkflowNode, WorkflowEdge } from '../types/workflow';
+import { WorkflowSummary, WorkflowSummaryPage } from '../types/dashboard';
 import { useToast } from '../hooks/useToast';
 
 interface SavedWorkflow {
@@ -18,9 +19,13 @@ interface WorkflowListProps {
   onClose: () => void;
 }
 
+const PAGE_SIZE = 50;
+
 const WorkflowList: React.FC<WorkflowListProps> = ({ onLoadWorkflow, onClose }) => {
-  const [workflows, setWorkflows] = useState<SavedWorkflow[]>([]);
+  const [workflows, setWorkflows] = useState<WorkflowSummary[]>([]);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedWorkflow, setSelectedWorkflow] = useState<string | null>(null);
   const [deleteConfirm, setDeleteConfirm] = useState<{workflowId: string, workflowName: string} | null>(null);
   const { showSuccess, showError } = useToast();
@@ -28,11 +33,12 @@ const WorkflowList: React.FC<WorkflowListProps> = ({ onLoadWorkflow, onClose })
   const fetchWorkflows = useCallback(async () => {
     try {
       setLoading(true);
-      const response = await fetch('/api/v1/workflows/');
+      const response = await fetch(`/api/v1/workflows/?limit=${PAGE_SIZE}`);
       
       if (response.ok) {
-        const data = await response.json();
-        setWorkflows(data);
+        const data: WorkflowSummaryPage = await response.json();
+        setWorkflows(data.items);
+        setTotal(data.total);
       } else {
         showError('Failed to Load', 'Could not fetch workflows from server');
       }
@@ -47,10 +53,41 @@ const WorkflowList: React.FC<WorkflowListProps> = ({ onLoadWorkflow, onClose })
     fetchWorkflows();
   }, [fetchWorkflows]);
 
-  const handleLoadWorkflow = (workflow: SavedWorkflow) => {
-    onLoadWorkflow(workflow);
-    onClose();
-    showSuccess('Workflow Loaded', `"${workflow.name}" has been loaded successfully`);
+  const loadMoreWorkflows = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await fetch(`/api/v1/workflows/?offset=${workflows.length}&limit=${PAGE_SIZE}`);
+
+      if (response.ok) {
+        const data: WorkflowSummaryPage = await response.json();
+        setWorkflows(prev => [...prev, ...data.items.filter(item => !prev.some(w => w.id === item.id))]);
+        setTotal(data.total);
+      } else {
+        showError('Failed to Load', 'Could not fetch more workflows from server');
+      }
+    } catch (error) {
+      showError('Network Error', 'Unable to connect to server');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const handleLoadWorkflow = async (summary: WorkflowSummary) => {
+    try {
+      // The list only holds summaries, fetch the full workflow to load it
+      const response = await fetch(`/api/v1/workflows/${summary.id}`);
+
+      if (response.ok) {
+        const workflow: SavedWorkflow = await response.json();
+        onLoadWorkflow(workflow);
+        onClose();
+        showSuccess('Workflow Loaded', `"${workflow.name}" has been loaded successfully`);
+      } else {
+        showError('Failed to Load', `Could not fetch "${summary.name}" from server`);
+      }
+    } catch (error) {
+      showError('Network Error', 'Unable to connect to server');
+    }
   };
 
   const handleDeleteWorkflow = async (workflowId: string, workflowName: string) => {
@@ -67,6 +104,7 @@ const WorkflowList: React.FC<WorkflowListProps> = ({ onLoadWorkflow, onClose })
 
       if (response.ok) {
         setWorkflows(prev => prev.filter(w => w.id !== deleteConfirm.workflowId));
+        setTotal(prev => prev - 1);
         showSuccess('Workflow Deleted', `"${deleteConfirm.workflowName}" has been deleted`);
       } else {
         showError('Delete Failed', 'Could not delete workflow');
@@ -107,10 +145,8 @@ const WorkflowList: React.FC<WorkflowListProps> = ({ onLoadWorkflow, onClose })
     });
   };
 
-  const getWorkflowStats = (workflow: SavedWorkflow) => {
-    const nodeCount = workflow.nodes.length;
-    const edgeCount = workflow.edges.length;
-    return `${nodeCount} nodes, ${edgeCount} connections`;
+  const getWorkflowStats = (workflow: WorkflowSummary) => {
+    return `${workflow.node_count} nodes, ${workflow.edge_count} connections`;
   };
 
   if (loading) {
@@ -231,6 +267,15 @@ const WorkflowList: React.FC<WorkflowListProps> = ({ onLoadWorkflow, onClose })
                   </div>
                 </div>
               ))}
+              {workflows.length < total && (
+                <button
+                  onClick={loadMoreWorkflows}
+                  disabled={loadingMore}
+                  className="py-2 text-sm text-blue-600 hover:bg-blue-50 rounded-md transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : `Load more (${total - workflows.length} remaining)`}
+                </button>
+              )}
             </div>
           )}
         </div>
@@ -1,67 +1,37 @@
 import { useState, useEffect, useCallback } from 'react';
-import { WorkflowCardData, WorkflowHistory } from '../types/dashboard';
+import { WorkflowCardData, WorkflowSummaryPage } from '../types/dashboard';
 import { useToast } from './useToast';
 
+const PAGE_SIZE = 50;
+
 export const useWorkflowData = () => {
   const [workflows, setWorkflows] = useState<WorkflowCardData[]>([]);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const { showError } = useToast();
 
+  // Cards are built from the catalog summaries alone, the optimization and
+  // deployment history of a workflow is fetched when its details are opened
+  const fetchPage = async (offset: number): Promise<WorkflowSummaryPage> => {
+    const response = await fetch(`/api/v1/workflows/?offset=${offset}&limit=${PAGE_SIZE}`);
+
+    if (!response.ok) {
+      throw new Error('Failed to fetch workflows');
+    }
+
+    return response.json();
+  };
+
   const fetchWorkflows = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
 
-      // Fetch all workflows
-      const response = await fetch('/api/v1/workflows/');
-
-      if (!response.ok) {
-        throw new Error('Failed to fetch workflows');
-      }
-
-      const workflowsData = await response.json();
-
-      // Fetch history for each workflow in parallel
-      const workflowsWithHistory = await Promise.all(
-        workflowsData.map(async (workflow: any) => {
-          try {
-            const historyResponse = await fetch(`/api/v1/workflows/${workflow.id}/history`);
-
-            if (!historyResponse.ok) {
-              console.warn(`Failed to fetch history for workflow ${workflow.id}`);
-              return {
-                ...workflow,
-                latestOptimization: undefined,
-                latestDeployment: undefined,
-                optimizationCount: 0,
-                deploymentCount: 0
-              };
-            }
-
-            const history: WorkflowHistory = await historyResponse.json();
-
-            return {
-              ...workflow,
-              latestOptimization: history.optimizations?.[0],
-              latestDeployment: history.deployments?.[0],
-              optimizationCount: history.optimizations?.length || 0,
-              deploymentCount: history.deployments?.length || 0
-            } as WorkflowCardData;
-          } catch (err) {
-            console.error(`Error fetching history for workflow ${workflow.id}:`, err);
-            return {
-              ...workflow,
-              latestOptimization: undefined,
-              latestDeployment: undefined,
-              optimizationCount: 0,
-              deploymentCount: 0
-            };
-          }
-        })
-      );
-
-      setWorkflows(workflowsWithHistory);
+      const page = await fetchPage(0);
+      setWorkflows(page.items);
+      setTotal(page.total);
     } catch (err: any) {
       const errorMessage = err.message || 'Failed to load workflows';
       setError(errorMessage);
@@ -79,10 +49,27 @@ export const useWorkflowData = () => {
     fetchWorkflows();
   }, [fetchWorkflows]);
 
+  const loadMoreWorkflows = useCallback(async () => {
+    try {
+      setLoadingMore(true);
+
+      const page = await fetchPage(workflows.length);
+      setWorkflows(prev => [...prev, ...page.items.filter(item => !prev.some(w => w.id === item.id))]);
+      setTotal(page.total);
+    } catch (err: any) {
+      showError('Load Failed', err.message || 'Failed to load more workflows');
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [workflows.length, showError]);
+
   return {
     workflows,
+    total,
     loading,
+    loadingMore,
     error,
-    refreshWorkflows
+    refreshWorkflows,
+    loadMoreWorkflows
   };
 };
@@ -32,9 +32,24 @@ export interface WorkflowHistory {
   deployments: DeploymentStatus[];
 }
 
-export interface WorkflowCardData extends Workflow {
-  latestOptimization?: OptimizationStatus;
-  latestDeployment?: DeploymentStatus;
-  optimizationCount: number;
-  deploymentCount: number;
+export interface WorkflowSummary {
+  id: string;
+  name: string;
+  description?: string;
+  created_at: string;
+  updated_at: string;
+  node_count: number;
+  edge_count: number;
+  has_optimization: boolean;
+  size: number;
 }
+
+export interface WorkflowSummaryPage {
+  total: number;
+  offset: number;
+  limit: number;
+  items: WorkflowSummary[];
+}
+
+// Workflow cards only use the catalog summary, history is fetched per workflow on demand
+export type WorkflowCardData = WorkflowSummary;